@@ -1,29 +1,9 @@
 import numpy as np
 import pandas as pd
-from statsmodels.tsa.arima.model import ARIMA
 from typing import Dict, Any
 from datetime import datetime, timedelta
 
-
-def _calculate_confidence(closes: list, order: tuple = (5, 1, 0)) -> float:
-    """Backtest ARIMA on last 7 days to compute real confidence score (1 - MAPE)."""
-    if len(closes) < 37:
-        return 0.50  # Not enough data for backtesting
-
-    train = closes[:-7]
-    actual = np.array(closes[-7:])
-
-    try:
-        backtest_model = ARIMA(train, order=order)
-        backtest_fit = backtest_model.fit()
-        predicted = np.array(backtest_fit.forecast(steps=7))
-
-        # Mean Absolute Percentage Error
-        mape = float(np.mean(np.abs((actual - predicted) / actual)))
-        confidence = max(0.0, min(1.0, 1.0 - mape))
-        return round(confidence, 2)
-    except Exception:
-        return 0.50  # Fallback if backtest fails
+from app.ai.training.train_arima import get_or_train_arima
 
 
 def run_prediction(symbol: str, historical_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -36,15 +16,18 @@ def run_prediction(symbol: str, historical_data: Dict[str, Any]) -> Dict[str, An
     if len(closes) < 30:
         return {"error": "Not enough data points for ARIMA. Need at least 30 days."}
         
+    # NepseService history rows carry the date under "time"
+    first_date_str = history[0].get("date") or history[0].get("time")
+    last_date_str = history[-1].get("date") or history[-1].get("time")
+
     try:
-        model = ARIMA(closes, order=(5, 1, 0))
-        model_fit = model.fit()
+        # Reuse the registry's fitted model when the training window hasn't moved
+        model_fit, metadata = get_or_train_arima(symbol, closes, (first_date_str, last_date_str))
         
         forecast_output = model_fit.forecast(steps=7)
         
         forecast = []
         
-        last_date_str = history[-1]["date"]
         last_date = datetime.strptime(last_date_str, "%Y-%m-%d")
         
         days_added = 0
@@ -72,8 +55,8 @@ def run_prediction(symbol: str, historical_data: Dict[str, Any]) -> Dict[str, An
         else:
             risk_level = "Low"
 
-        # Real confidence score from backtesting (not hardcoded)
-        confidence = _calculate_confidence(closes)
+        # Real confidence score from backtesting (not hardcoded), computed at training time
+        confidence = metadata.metrics.get("confidence", 0.50)
 
         return {
             "symbol": symbol.upper(),
@@ -82,6 +65,7 @@ def run_prediction(symbol: str, historical_data: Dict[str, Any]) -> Dict[str, An
             "volatility_percentage": round(volatility, 2),
             "ai_confidence_score": confidence,
             "model_used": "ARIMA(5,1,0)",
+            "model_version": metadata.tag,
             "disclaimer": "AI predictions are for educational purposes only. Not financial advice."
         }
     except Exception as e:
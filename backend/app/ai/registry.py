@@ -0,0 +1,204 @@
+"""
+Model registry — versioned, on-disk storage for fitted models.
+
+Layout on disk (one directory per published version):
+
+    <root>/<SYMBOL>/<model_type>/v0001/model.pkl
+    <root>/<SYMBOL>/<model_type>/v0001/metadata.json
+    <root>/<SYMBOL>/<model_type>/LATEST          -> "v0001"
+
+Artifacts are only read on first use and kept in a bounded LRU. Publishing
+writes the new version to a temp directory, renames it into place and then
+flips the LATEST pointer with os.replace, so readers in this or any other
+worker always see either the old or the new version, never a partial one.
+"""
+
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import logger
+
+_MODEL_FILE = "model.pkl"
+_METADATA_FILE = "metadata.json"
+_LATEST_FILE = "LATEST"
+
+
+@dataclass(frozen=True)
+class ModelMetadata:
+    symbol: str
+    model_type: str
+    version: int
+    trained_from: Optional[str] = None  # first date of the training window
+    trained_to: Optional[str] = None    # last date of the training window
+    metrics: Dict[str, float] = field(default_factory=dict)
+    created_at: str = ""
+
+    @property
+    def tag(self) -> str:
+        return f"v{self.version:04d}"
+
+
+class ModelRegistry:
+    def __init__(self, root: str, max_loaded: int = 32):
+        self.root = root
+        self.max_loaded = max(1, max_loaded)
+        self._loaded: "OrderedDict[Tuple[str, str], Tuple[Any, ModelMetadata]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ─── Paths ──────────────────────────────────────────────
+    def _model_dir(self, symbol: str, model_type: str) -> str:
+        return os.path.join(self.root, symbol.upper(), model_type)
+
+    def _read_latest_tag(self, symbol: str, model_type: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self._model_dir(symbol, model_type), _LATEST_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _read_metadata(self, version_dir: str) -> ModelMetadata:
+        with open(os.path.join(version_dir, _METADATA_FILE)) as f:
+            return ModelMetadata(**json.load(f))
+
+    # ─── Reads ──────────────────────────────────────────────
+    def get(self, symbol: str, model_type: str) -> Optional[Tuple[Any, ModelMetadata]]:
+        """Return ``(model, metadata)`` for the latest version, loading it on first use."""
+        key = (symbol.upper(), model_type)
+        tag = self._read_latest_tag(*key)
+        if tag is None:
+            return None
+
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry and entry[1].tag == tag:
+                self._loaded.move_to_end(key)
+                return entry
+
+        version_dir = os.path.join(self._model_dir(*key), tag)
+        try:
+            metadata = self._read_metadata(version_dir)
+            with open(os.path.join(version_dir, _MODEL_FILE), "rb") as f:
+                model = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError) as e:
+            logger.warning(f"[ModelRegistry] Failed to load {key} {tag}: {e}")
+            return None
+
+        self._remember(key, model, metadata)
+        return model, metadata
+
+    def get_metadata(self, symbol: str, model_type: str) -> Optional[ModelMetadata]:
+        """Metadata of the latest version without unpickling the artifact."""
+        tag = self._read_latest_tag(symbol, model_type)
+        if tag is None:
+            return None
+        try:
+            return self._read_metadata(os.path.join(self._model_dir(symbol, model_type), tag))
+        except (OSError, ValueError):
+            return None
+
+    def list_versions(self, symbol: str, model_type: str) -> List[ModelMetadata]:
+        model_dir = self._model_dir(symbol, model_type)
+        if not os.path.isdir(model_dir):
+            return []
+        versions = []
+        for name in sorted(os.listdir(model_dir)):
+            if not name.startswith("v"):
+                continue
+            try:
+                versions.append(self._read_metadata(os.path.join(model_dir, name)))
+            except (OSError, ValueError):
+                continue
+        return versions
+
+    # ─── Writes ─────────────────────────────────────────────
+    def publish(
+        self,
+        symbol: str,
+        model_type: str,
+        model: Any,
+        training_window: Tuple[Optional[str], Optional[str]] = (None, None),
+        metrics: Optional[Dict[str, float]] = None,
+    ) -> ModelMetadata:
+        """Store a new version and make it the latest, swapping it in atomically."""
+        symbol = symbol.upper()
+        model_dir = self._model_dir(symbol, model_type)
+        os.makedirs(model_dir, exist_ok=True)
+
+        payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        version = self._next_version(model_dir)
+        while True:
+            metadata = ModelMetadata(
+                symbol=symbol,
+                model_type=model_type,
+                version=version,
+                trained_from=training_window[0],
+                trained_to=training_window[1],
+                metrics={k: float(v) for k, v in (metrics or {}).items()},
+                created_at=datetime.now(timezone.utc).isoformat(),
+            )
+            tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=model_dir)
+            with open(os.path.join(tmp_dir, _MODEL_FILE), "wb") as f:
+                f.write(payload)
+            with open(os.path.join(tmp_dir, _METADATA_FILE), "w") as f:
+                json.dump(asdict(metadata), f)
+            try:
+                os.rename(tmp_dir, os.path.join(model_dir, metadata.tag))
+                break
+            except OSError:
+                # Another worker published this version number first — take the next one
+                _remove_tree(tmp_dir)
+                version += 1
+
+        pointer_fd, pointer_tmp = tempfile.mkstemp(prefix=".latest-", dir=model_dir)
+        with os.fdopen(pointer_fd, "w") as f:
+            f.write(metadata.tag)
+        os.replace(pointer_tmp, os.path.join(model_dir, _LATEST_FILE))
+
+        self._remember((symbol, model_type), model, metadata)
+        logger.info(f"[ModelRegistry] Published {symbol}/{model_type} {metadata.tag}")
+        return metadata
+
+    # ─── Internals ──────────────────────────────────────────
+    @staticmethod
+    def _next_version(model_dir: str) -> int:
+        existing = [
+            int(name[1:]) for name in os.listdir(model_dir)
+            if name.startswith("v") and name[1:].isdigit()
+        ]
+        return max(existing, default=0) + 1
+
+    def _remember(self, key: Tuple[str, str], model: Any, metadata: ModelMetadata) -> None:
+        with self._lock:
+            current = self._loaded.get(key)
+            # Never replace a newer in-memory version with an older one
+            if current and current[1].version > metadata.version:
+                return
+            self._loaded[key] = (model, metadata)
+            self._loaded.move_to_end(key)
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+
+
+def _remove_tree(path: str) -> None:
+    for name in os.listdir(path):
+        os.remove(os.path.join(path, name))
+    os.rmdir(path)
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide registry, created on first use so startup never touches the disk."""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry(settings.MODEL_REGISTRY_DIR, settings.MODEL_REGISTRY_MAX_LOADED)
+    return _registry
@@ -0,0 +1,23 @@
+import numpy as np
+from statsmodels.tsa.arima.model import ARIMA
+
+
+def backtest_confidence(closes: list, order: tuple = (5, 1, 0)) -> float:
+    """Backtest ARIMA on last 7 days to compute real confidence score (1 - MAPE)."""
+    if len(closes) < 37:
+        return 0.50  # Not enough data for backtesting
+
+    train = closes[:-7]
+    actual = np.array(closes[-7:])
+
+    try:
+        backtest_model = ARIMA(train, order=order)
+        backtest_fit = backtest_model.fit()
+        predicted = np.array(backtest_fit.forecast(steps=7))
+
+        # Mean Absolute Percentage Error
+        mape = float(np.mean(np.abs((actual - predicted) / actual)))
+        confidence = max(0.0, min(1.0, 1.0 - mape))
+        return round(confidence, 2)
+    except Exception:
+        return 0.50  # Fallback if backtest fails
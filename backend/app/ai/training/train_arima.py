@@ -0,0 +1,46 @@
+from typing import Any, Optional, Tuple
+
+from statsmodels.tsa.arima.model import ARIMA
+
+from app.ai.registry import ModelMetadata, ModelRegistry, get_model_registry
+from app.ai.training.evaluation import backtest_confidence
+
+MODEL_TYPE = "arima"
+ARIMA_ORDER = (5, 1, 0)
+
+
+def train_arima(
+    symbol: str,
+    closes: list,
+    training_window: Tuple[Optional[str], Optional[str]],
+    registry: Optional[ModelRegistry] = None,
+) -> Tuple[Any, ModelMetadata]:
+    """Fit ARIMA on the closing prices and publish the fitted model to the registry."""
+    model_fit = ARIMA(closes, order=ARIMA_ORDER).fit()
+    metrics = {
+        "aic": float(model_fit.aic),
+        "n_obs": len(closes),
+        "confidence": backtest_confidence(closes, order=ARIMA_ORDER),
+    }
+    registry = registry or get_model_registry()
+    metadata = registry.publish(symbol, MODEL_TYPE, model_fit, training_window=training_window, metrics=metrics)
+    return model_fit, metadata
+
+
+def get_or_train_arima(
+    symbol: str,
+    closes: list,
+    training_window: Tuple[Optional[str], Optional[str]],
+    registry: Optional[ModelRegistry] = None,
+) -> Tuple[Any, ModelMetadata]:
+    """Reuse the published model if it was fitted on this exact window, otherwise refit."""
+    registry = registry or get_model_registry()
+    entry = registry.get(symbol, MODEL_TYPE)
+    if entry:
+        model_fit, metadata = entry
+        if (
+            (metadata.trained_from, metadata.trained_to) == tuple(training_window)
+            and metadata.metrics.get("n_obs") == len(closes)
+        ):
+            return model_fit, metadata
+    return train_arima(symbol, closes, training_window, registry=registry)
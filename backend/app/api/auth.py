@@ -1,22 +1,23 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
 from app.database.session import get_db
-from app.core.hashing import verify_password, get_password_hash
+from app.core.hashing import password_hasher
 from app.core.jwt_handler import (
     create_access_token, create_refresh_token, decode_refresh_token
 )
 from app.config import settings
-from app.models.user import User
+from app.core.principal_cache import UserPrincipal, principal_cache
+from app.core.token_revocation import token_revocation
 from app.schemas.user_schema import (
     UserCreate, UserResponse, Token, 
     PasswordChange, UserProfileUpdate, PasswordResetRequest
 )
 from app.repositories.user_repo import UserRepository
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_token_claims
 
 router = APIRouter()
 
@@ -27,7 +28,7 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await password_hasher.hash(user_in.password)
     user = await user_repo.create_user(
         email=user_in.email, 
         hashed_password=hashed_password,
@@ -43,12 +44,19 @@ async def login(
     user_repo = UserRepository(db)
     user = await user_repo.get_by_email(form_data.username)
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await password_hasher.verify_and_update(form_data.password, user.password_hash)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS
+        user.password_hash = new_hash
+        await db.commit()
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -69,7 +77,7 @@ async def refresh_token(
 ):
     """Exchange a refresh token for a new access token."""
     payload = decode_refresh_token(refresh_token)
-    if not payload:
+    if not payload or await token_revocation.is_revoked(payload):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token"
@@ -99,7 +107,7 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """Get the current authenticated user's profile."""
     return current_user
@@ -107,36 +115,54 @@ async def get_current_user_profile(
 @router.put("/me", response_model=UserResponse)
 async def update_profile(
     profile_data: UserProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update the current user's profile."""
     user_repo = UserRepository(db)
+    user = await user_repo.get_by_id(current_user.id)
     if profile_data.full_name is not None:
-        current_user.full_name = profile_data.full_name
-    if profile_data.email is not None and profile_data.email != current_user.email:
+        user.full_name = profile_data.full_name
+    if profile_data.email is not None and profile_data.email != user.email:
         existing = await user_repo.get_by_email(profile_data.email)
         if existing:
             raise HTTPException(status_code=400, detail="Email already in use")
-        current_user.email = profile_data.email
+        user.email = profile_data.email
     await db.commit()
-    await db.refresh(current_user)
-    return current_user
+    await principal_cache.invalidate(user.id)
+    return user
 
 @router.post("/change-password")
 async def change_password(
     data: PasswordChange,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Change the current user's password."""
-    if not verify_password(data.current_password, current_user.password_hash):
+    user = await UserRepository(db).get_by_id(current_user.id)
+    if not await password_hasher.verify(data.current_password, user.password_hash):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
-    current_user.password_hash = get_password_hash(data.new_password)
+    user.password_hash = await password_hasher.hash(data.new_password)
     await db.commit()
+    await principal_cache.invalidate(user.id)
+    # Sign out every existing session, including this one
+    await token_revocation.revoke_user(user.id)
     return {"message": "Password changed successfully"}
 
+@router.post("/logout")
+async def logout(
+    claims: dict = Depends(get_token_claims),
+    refresh_token: Optional[str] = Body(default=None, embed=True)
+):
+    """Revoke the current access token and, if given, its refresh token."""
+    await token_revocation.revoke(claims)
+    if refresh_token:
+        payload = decode_refresh_token(refresh_token)
+        if payload and payload.get("sub") == claims.get("sub"):
+            await token_revocation.revoke(payload)
+    return {"message": "Logged out"}
+
 @router.post("/forgot-password")
 async def forgot_password(data: PasswordResetRequest):
     """Request a password reset. In production, sends an email with reset link."""
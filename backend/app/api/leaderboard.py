@@ -0,0 +1,30 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.dependencies import get_current_user_id
+from app.schemas.leaderboard_schema import LeaderboardEntry, LeaderboardRank
+from app.services.leaderboard import get_top, get_user_rank, public_handle
+
+router = APIRouter()
+
+@router.get("", response_model=List[LeaderboardEntry])
+async def get_leaderboard(
+    limit: int = Query(default=50, le=100, ge=1),
+    offset: int = Query(default=0, ge=0)
+):
+    """Top paper-trading accounts by total return, refreshed on every live tick.
+
+    Public, so accounts appear only under an opaque handle, never their name or id.
+    """
+    return [
+        {"rank": e["rank"], "name": public_handle(e["user_id"]), "nav": e["nav"], "return_pct": e["return_pct"]}
+        for e in await get_top(limit, offset)
+    ]
+
+@router.get("/me", response_model=LeaderboardRank)
+async def get_my_rank(user_id: int = Depends(get_current_user_id)):
+    rank = await get_user_rank(user_id)
+    if rank is None:
+        raise HTTPException(status_code=404, detail="Not ranked yet")
+    return {**rank, "name": public_handle(user_id)}
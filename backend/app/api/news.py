@@ -1,5 +1,10 @@
-from typing import Any, Dict
-from fastapi import APIRouter
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.session import get_db
+from app.repositories.news_repo import NewsRepository
+from app.schemas.news_schema import NewsSearchResponse
 from app.services.news_service import NewsService
 
 router = APIRouter()
@@ -12,3 +17,18 @@ async def read_latest_news(category: str = "All") -> Dict[str, Any]:
 async def read_news_categories() -> Dict[str, Any]:
     categories = await NewsService.get_categories()
     return {"categories": categories}
+
+@router.get("/search", response_model=NewsSearchResponse)
+async def search_news(
+    db: AsyncSession = Depends(get_db),
+    q: Optional[str] = Query(default=None, max_length=200, description="Full-text query"),
+    symbol: Optional[str] = Query(default=None, max_length=20, description="Only articles mentioning this symbol"),
+    before: Optional[int] = Query(default=None, ge=1, description="next_before from the previous page"),
+    limit: int = Query(default=20, le=100, ge=1)
+):
+    """Search the news archive, newest first, paged by keyset."""
+    articles = await NewsRepository(db).search(
+        q=q, symbol=symbol.upper() if symbol else None, before=before, limit=limit + 1
+    )
+    next_before = articles[limit - 1].id if len(articles) > limit else None
+    return {"items": articles[:limit], "next_before": next_before}
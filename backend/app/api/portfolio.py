@@ -1,28 +1,57 @@
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user_id
 from app.database.session import get_db
-from app.models.user import User
 from app.schemas.wallet_schema import WalletResponse
+from app.schemas.portfolio_schema import PerformanceResponse, RealizedPnlResponse
 from app.repositories.user_repo import UserRepository
 from app.services.portfolio_service import PortfolioService
+from app.services.performance_service import PerformanceService
+from app.services.trading_service import npt_now
 
 router = APIRouter()
 
 @router.get("/wallet", response_model=WalletResponse)
 async def get_my_wallet(
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     user_repo = UserRepository(db)
-    wallet = await user_repo.get_wallet(current_user.id)
+    wallet = await user_repo.get_wallet(user_id)
     return wallet
 
 @router.get("")
 async def get_my_portfolio(
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     portfolio_service = PortfolioService(db)
-    return await portfolio_service.calculate_portfolio_pnl(current_user.id)
+    return await portfolio_service.calculate_portfolio_pnl(user_id)
+
+@router.get("/realized", response_model=RealizedPnlResponse)
+async def get_my_realized_pnl(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Realized profit/loss and fees paid, per symbol."""
+    portfolio_service = PortfolioService(db)
+    return await portfolio_service.get_realized_pnl(user_id)
+
+@router.get("/performance", response_model=PerformanceResponse)
+async def get_my_performance(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+):
+    """Daily NAV series with time- and money-weighted returns (defaults to the last year)."""
+    end = end or npt_now().date()  # snapshots are keyed by the NPT trading day
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    performance_service = PerformanceService(db)
+    return await performance_service.get_performance(user_id, start, end)
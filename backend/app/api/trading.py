@@ -1,20 +1,22 @@
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_user_id
 from app.database.session import get_db
-from app.models.user import User
-from app.schemas.trade_schema import TradeRequest, TransactionResponse
+from app.core.principal_cache import UserPrincipal
+from app.schemas.trade_schema import TradeRequest, BatchTradeRequest, TransactionResponse
+from app.schemas.order_schema import OrderRequest, OrderResponse
 from app.services.trading_service import TradingService
 from app.repositories.trade_repo import TradeRepository
+from app.repositories.order_repo import OrderRepository
 
 router = APIRouter()
 
 @router.post("/buy", response_model=TransactionResponse)
 async def buy_stock(
     trade_request: TradeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     trading_service = TradingService(db)
@@ -27,7 +29,7 @@ async def buy_stock(
 @router.post("/sell", response_model=TransactionResponse)
 async def sell_stock(
     trade_request: TradeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     trading_service = TradingService(db)
@@ -37,9 +39,22 @@ async def sell_stock(
         quantity=trade_request.quantity
     )
 
+@router.post("/batch", response_model=List[TransactionResponse])
+async def batch_trade(
+    batch_request: BatchTradeRequest,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Execute several buys/sells against one market snapshot, all-or-nothing."""
+    trading_service = TradingService(db)
+    return await trading_service.execute_batch(
+        user_id=current_user.id,
+        orders=[(o.side, o.symbol.upper(), o.quantity) for o in batch_request.orders]
+    )
+
 @router.get("/history", response_model=List[TransactionResponse])
 async def get_transaction_history(
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
     limit: int = Query(default=50, le=200, ge=1),
     offset: int = Query(default=0, ge=0)
@@ -47,6 +62,49 @@ async def get_transaction_history(
     """Get the current user's trade transaction history."""
     trade_repo = TradeRepository(db)
     transactions = await trade_repo.get_user_transactions(
-        user_id=current_user.id, limit=limit, offset=offset
+        user_id=user_id, limit=limit, offset=offset
     )
     return transactions
+
+@router.post("/orders", response_model=OrderResponse)
+async def place_order(
+    order_request: OrderRequest,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Place a limit or stop order that rests until a live tick crosses its price."""
+    trading_service = TradingService(db)
+    return await trading_service.place_order(
+        user_id=current_user.id,
+        symbol=order_request.symbol.upper(),
+        side=order_request.side,
+        order_type=order_request.order_type,
+        quantity=order_request.quantity,
+        price=order_request.price
+    )
+
+@router.get("/orders", response_model=List[OrderResponse])
+async def get_orders(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+    status: Optional[str] = Query(default=None, description="Filter by status: OPEN, FILLED, CANCELLED, REJECTED"),
+    limit: int = Query(default=50, le=200, ge=1),
+    offset: int = Query(default=0, ge=0)
+):
+    """Get the current user's limit and stop orders."""
+    order_repo = OrderRepository(db)
+    return await order_repo.get_user_orders(
+        user_id=user_id,
+        status=status.upper() if status else None,
+        limit=limit,
+        offset=offset
+    )
+
+@router.delete("/orders/{order_id}", response_model=OrderResponse)
+async def cancel_order(
+    order_id: int,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    trading_service = TradingService(db)
+    return await trading_service.cancel_order(user_id=current_user.id, order_id=order_id)
@@ -1,37 +1,61 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_current_user_id
 from app.database.session import get_db
-from app.models.user import User
-from app.schemas.watchlist_schema import WatchlistItemCreate, WatchlistItemUpdate
+from app.core.principal_cache import UserPrincipal
+from app.schemas.watchlist_schema import (
+    WatchlistItemCreate, WatchlistItemUpdate, WatchlistItemResponse,
+    WatchlistBulkCreate, WatchlistBulkRemove
+)
 from app.services.watchlist_service import WatchlistService
 
 router = APIRouter()
 
 @router.get("")
 async def get_watchlist(
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     service = WatchlistService(db)
-    return await service.get_user_watchlist(current_user.id)
+    return await service.get_user_watchlist(user_id)
 
-@router.post("")
+@router.post("", response_model=WatchlistItemResponse)
 async def add_watchlist_item(
     item: WatchlistItemCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     service = WatchlistService(db)
     return await service.add_item(current_user.id, item)
 
-@router.put("/{symbol}")
+@router.post("/bulk", response_model=List[WatchlistItemResponse])
+async def add_watchlist_items(
+    data: WatchlistBulkCreate,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add (or update) several symbols in one transaction."""
+    service = WatchlistService(db)
+    return await service.add_items(current_user.id, data.items)
+
+@router.post("/bulk-remove")
+async def remove_watchlist_items(
+    data: WatchlistBulkRemove,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove several symbols in one transaction."""
+    service = WatchlistService(db)
+    removed = await service.remove_items(current_user.id, data.symbols)
+    return {"message": "Success", "removed": removed}
+
+@router.put("/{symbol}", response_model=WatchlistItemResponse)
 async def update_watchlist_item(
     symbol: str,
     data: WatchlistItemUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     service = WatchlistService(db)
@@ -43,7 +67,7 @@ async def update_watchlist_item(
 @router.delete("/{symbol}")
 async def remove_watchlist_item(
     symbol: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     service = WatchlistService(db)
@@ -0,0 +1,22 @@
+import time
+
+from app.database.session import AsyncSessionLocal
+from app.ingestion import LiveTick
+from app.repositories.snapshot_repo import SnapshotRepository
+from app.services.leaderboard import leaderboard_book, publish_ranks
+from app.utils.logger import logger
+
+POSITIONS_REFRESH_SECONDS = 60  # trades show up in the ranking within a minute
+
+
+async def rank_leaderboard(tick: LiveTick):
+    """Re-value every account against one live tick and republish the ranking."""
+    if time.monotonic() - leaderboard_book.loaded_at >= POSITIONS_REFRESH_SECONDS:
+        async with AsyncSessionLocal() as db:
+            holdings = await SnapshotRepository(db).get_all_holdings()
+        leaderboard_book.load(holdings)
+        logger.debug(f"[Leaderboard] Reloaded positions for {len(leaderboard_book)} accounts")
+
+    prices = tick.prices()
+    nav, returns = leaderboard_book.value(prices)
+    await publish_ranks(leaderboard_book.user_ids, nav, returns)
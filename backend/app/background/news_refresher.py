@@ -0,0 +1,49 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+
+from app.cache.cache_service import set_cached_news
+from app.database.session import AsyncSessionLocal
+from app.repositories.news_repo import NewsRepository
+from app.repositories.stock_repo import StockRepository
+from app.services.market_snapshot import market_snapshot
+from app.services.news_service import NewsService
+from app.utils.logger import logger
+
+REFRESH_INTERVAL_MINUTES = 5
+
+
+async def refresh_news():
+    """
+    Scrape every news source, archive new articles and replace the stored
+    news in Redis.
+    Runs every 5 minutes (and once at startup); /news only ever reads what
+    this job wrote, so no request waits on a scrape. A failed or empty scrape
+    leaves the previous news in place. Archived articles keep their id and
+    first-seen time across refreshes.
+    """
+    try:
+        news = await NewsService.scrape_news()
+    except Exception as e:
+        logger.error(f"[News] Refresh failed: {e}")
+        return
+    if not news:
+        logger.warning("[News] Scrape returned no articles, keeping previous news")
+        return
+
+    try:
+        async with AsyncSessionLocal() as db:
+            known_symbols = set(await StockRepository(db).get_symbols()) | set(market_snapshot.symbols())
+            news = await NewsRepository(db).ingest(news, known_symbols)
+            await db.commit()
+    except Exception as e:
+        logger.error(f"[News] Archiving failed, serving unarchived articles: {e}")
+
+    by_category: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for item in news:
+        by_category[item["category"]].append(item)
+    categories = ["All"] + sorted(c for c in by_category if c)
+    by_category["All"] = news
+
+    await set_cached_news(by_category, categories, datetime.now().isoformat())
+    logger.info(f"[News] Stored {len(news)} articles in {len(categories) - 1} categories")
@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from fastapi import HTTPException
+
+from app.database.session import AsyncSessionLocal
+from app.ingestion import LiveTick
+from app.repositories.order_repo import OrderRepository
+from app.services.order_book import order_book
+from app.services.order_sequencer import order_sequencer
+from app.services.trading_service import TradingService, resting_order
+from app.utils.logger import logger
+
+# A fill only briefly queues behind the user's in-flight order; a busy user is
+# retried on the next tick instead of stalling every other tick handler
+FILL_LOCK_WAIT = 0.2  # seconds
+
+
+async def load_open_orders():
+    """Rebuild the in-memory order book from the orders table (run once at startup)."""
+    async with AsyncSessionLocal() as db:
+        orders = await OrderRepository(db).get_open_orders()
+    order_book.clear()
+    for order in orders:
+        order_book.add(resting_order(order))
+    logger.info(f"[Order Matcher] Loaded {len(orders)} resting orders")
+
+
+async def match_orders(tick: LiveTick):
+    """Match all resting orders against one live tick and fill the crossed ones."""
+    if not len(order_book):
+        return
+
+    prices = tick.prices()
+    fills = order_book.match(prices)
+    if not fills:
+        return
+
+    logger.info(f"[Order Matcher] {len(fills)} orders triggered")
+    for order, price in fills:
+        # fill_order either fills or rejects the order for good; anything that
+        # escapes it left the order OPEN, so it goes back in the book
+        try:
+            async with order_sequencer.serialize(order.user_id, wait=FILL_LOCK_WAIT):
+                async with AsyncSessionLocal() as db:
+                    await TradingService(db).fill_order(order.id, Decimal(str(price)))
+        except HTTPException as e:
+            order_book.add(order)
+            logger.info(f"[Order Matcher] Order {order.id} deferred to the next tick: {e.detail}")
+        except Exception as e:
+            order_book.add(order)
+            logger.error(f"[Order Matcher] Failed to fill order {order.id}, retrying next tick: {e}")
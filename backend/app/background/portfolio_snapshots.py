@@ -0,0 +1,106 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.logger import logger
+
+
+def value_portfolios(
+    holdings: Sequence[Tuple[int, Decimal, Optional[str], Optional[int], Optional[Decimal]]],
+    closes: Mapping[str, float],
+) -> Dict[int, Tuple[Decimal, Decimal]]:
+    """Value every user's cash and positions against one vector of closing prices.
+
+    ``holdings`` are the rows of ``SnapshotRepository.get_all_holdings``. Symbols
+    without a close fall back to the position's average buy price. Returns
+    ``user_id -> (cash, holdings_value)``; arithmetic is in integer paisa.
+    """
+    cash: Dict[int, Decimal] = {}
+    user_index: Dict[int, int] = {}
+    pos_user: List[int] = []
+    pos_qty: List[int] = []
+    pos_price: List[int] = []
+    for user_id, balance, symbol, quantity, average_buy_price in holdings:
+        if user_id not in user_index:
+            user_index[user_id] = len(user_index)
+            cash[user_id] = Decimal(str(balance))
+        if symbol is None or not quantity:
+            continue
+        close = closes.get(symbol)
+        price = Decimal(str(close)) if close and close > 0 else Decimal(str(average_buy_price))
+        pos_user.append(user_index[user_id])
+        pos_qty.append(quantity)
+        pos_price.append(int(price * 100))
+
+    values = np.zeros(len(user_index), dtype=np.int64)
+    if pos_user:
+        np.add.at(
+            values,
+            np.array(pos_user, dtype=np.intp),
+            np.array(pos_qty, dtype=np.int64) * np.array(pos_price, dtype=np.int64),
+        )
+    return {
+        user_id: (cash[user_id], Decimal(int(values[i])).scaleb(-2))
+        for user_id, i in user_index.items()
+    }
+
+
+async def _closing_prices() -> Dict[str, float]:
+    from app.ingestion import LiveTick
+    from app.services.nepse_service import NepseService
+    from app.cache.cache_service import get_backup_live_market
+
+    tick = await NepseService.get_live_tick()
+    if not len(tick):
+        backup = await get_backup_live_market()
+        tick = LiveTick.from_json(backup) if backup else tick
+    return tick.prices()
+
+
+async def snapshot_portfolios(day: Optional[date] = None) -> int:
+    """
+    Write every user's end-of-day NAV to ``portfolio_snapshots``.
+    Runs Sun-Thu at 15:20 NPT, after the EOD market sync. Re-running for the
+    same day replaces that day's rows. Returns the number of snapshots written.
+    """
+    from app.database.session import AsyncSessionLocal
+    from app.repositories.snapshot_repo import SnapshotRepository
+    from app.repositories.trade_repo import TradeRepository
+    from app.services.trading_service import NPT_OFFSET
+
+    taken_at = datetime.now(timezone.utc)
+    day = day or (taken_at + NPT_OFFSET).date()
+    logger.info(f"[NAV Snapshot] Starting for {day}")
+    try:
+        closes = await _closing_prices()
+        async with AsyncSessionLocal() as db:
+            repo = SnapshotRepository(db)
+            valuations = value_portfolios(await repo.get_all_holdings(), closes)
+
+            # External flows = cash change that trades since the last run don't explain
+            prev_taken_at, prev_cash = await repo.get_previous(day)
+            spend = await TradeRepository(db).get_net_trade_spend(prev_taken_at, taken_at) if prev_taken_at else {}
+
+            rows: List[Dict[str, Any]] = []
+            for user_id, (cash, holdings_value) in valuations.items():
+                net_flow = Decimal("0")
+                if user_id in prev_cash:
+                    net_flow = cash - prev_cash[user_id] + spend.get(user_id, Decimal("0"))
+                rows.append({
+                    "user_id": user_id,
+                    "date": day,
+                    "cash": cash,
+                    "holdings_value": holdings_value,
+                    "nav": cash + holdings_value,
+                    "net_flow": net_flow,
+                    "taken_at": taken_at,
+                })
+            await repo.replace_day(day, rows)
+            await db.commit()
+        logger.info(f"[NAV Snapshot] Wrote {len(rows)} snapshots ({len(closes)} closing prices)")
+        return len(rows)
+    except Exception as e:
+        logger.error(f"[NAV Snapshot] Failed: {e}")
+        return 0
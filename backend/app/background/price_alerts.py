@@ -0,0 +1,75 @@
+import asyncio
+
+from app.database.session import AsyncSessionLocal
+from app.ingestion import LiveTick
+from app.repositories.watchlist_repo import WatchlistRepository
+from app.services.alert_engine import PriceAlert, alert_engine
+from app.services.notification_service import NotificationService
+from app.utils.logger import logger
+
+ALERT_QUEUE_SIZE = 1000  # alerts waiting for delivery before new ones are dropped
+
+
+class AlertDispatcher:
+    """Hands fired alerts to the notification service from a bounded queue.
+
+    The tick handler only enqueues, so slow delivery never stalls the tick
+    feed; when the queue is full the alert is dropped and counted.
+    """
+
+    def __init__(self, maxsize: int = ALERT_QUEUE_SIZE):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: asyncio.Task = None
+        self.dropped = 0
+
+    def submit(self, alert: PriceAlert) -> bool:
+        try:
+            self._queue.put_nowait(alert)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"[Price Alerts] Queue full, dropped alert for user={alert.user_id} symbol={alert.symbol}")
+            return False
+
+    async def _run(self):
+        while True:
+            alert = await self._queue.get()
+            try:
+                await NotificationService.notify_price_alert(alert.user_id, alert.symbol, alert.message)
+            except Exception as e:
+                logger.error(f"[Price Alerts] Failed to notify user={alert.user_id} symbol={alert.symbol}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("Started price alert dispatcher")
+
+    def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            logger.info("Stopped price alert dispatcher")
+
+
+alert_dispatcher = AlertDispatcher()
+
+
+async def load_alerts():
+    """Arm every watchlist target/stop-loss in the alert engine (run once at startup)."""
+    async with AsyncSessionLocal() as db:
+        items = await WatchlistRepository(db).get_active_alerts()
+    alert_engine.clear()
+    for item in items:
+        alert_engine.set(item.user_id, item.symbol, item.target_price, item.stop_loss)
+    logger.info(f"[Price Alerts] Armed {len(alert_engine)} alerts")
+
+
+async def check_alerts(tick: LiveTick):
+    """Evaluate one live tick and queue a notification for every crossed threshold."""
+    prices = tick.prices()
+    fired = alert_engine.evaluate(prices)
+    if fired:
+        logger.info(f"[Price Alerts] {len(fired)} alerts triggered")
+    for alert in fired:
+        alert_dispatcher.submit(alert)
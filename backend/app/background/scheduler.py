@@ -1,26 +1,48 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from datetime import datetime
 
 from app.utils.logger import logger
 from app.background.market_sync import sync_eod_market_data
 from app.background.historical_sync import sync_historical_data
+from app.background.portfolio_snapshots import snapshot_portfolios
+from app.background.news_refresher import REFRESH_INTERVAL_MINUTES, refresh_news
 
 scheduler = AsyncIOScheduler()
 
+# NEPSE trades Sun-Thu. APScheduler numbers days from mon=0, so sun=6 and a
+# 'sun-thu' range would run backwards; list the days instead
+TRADING_DAYS = 'sun,mon,tue,wed,thu'
+
 def start_scheduler():
-    # NEPSE trades Sun-Thu. In APScheduler: sun=6, mon=0, tue=1, wed=2, thu=3
     scheduler.add_job(
         sync_eod_market_data,
-        CronTrigger(hour=15, minute=15, day_of_week='sun-thu'),
+        CronTrigger(hour=15, minute=15, day_of_week=TRADING_DAYS),
         id="sync_eod",
         replace_existing=True
     )
+    scheduler.add_job(
+        snapshot_portfolios,
+        CronTrigger(hour=15, minute=20, day_of_week=TRADING_DAYS),
+        id="snapshot_portfolios",
+        replace_existing=True
+    )
     scheduler.add_job(
         sync_historical_data,
         CronTrigger(hour=0, minute=0, day_of_week='0-6'),
         id="sync_historical",
         replace_existing=True
     )
+    scheduler.add_job(
+        refresh_news,
+        IntervalTrigger(minutes=REFRESH_INTERVAL_MINUTES),
+        id="refresh_news",
+        next_run_time=datetime.now(),  # populate news right after startup
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True
+    )
     scheduler.start()
     logger.info("Background scheduler started")
 
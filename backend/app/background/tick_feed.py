@@ -0,0 +1,55 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+from app.ingestion import LiveTick
+from app.services.market_service import MarketService
+from app.utils.logger import logger
+
+TickHandler = Callable[[LiveTick], Awaitable[None]]
+
+TICK_INTERVAL = 5  # seconds — matches the live market cache TTL
+
+
+class TickFeed:
+    """Polls the cached live market and hands every tick to the registered handlers.
+
+    Handlers run one after another on the same :class:`LiveTick`, so a single
+    upstream fetch (already cached for the WebSocket broadcast) serves every
+    consumer, and they share its price map instead of each building one.
+    """
+
+    def __init__(self, interval: float = TICK_INTERVAL):
+        self.interval = interval
+        self._handlers: List[TickHandler] = []
+        self._task: asyncio.Task = None
+
+    def subscribe(self, handler: TickHandler):
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    async def _run(self):
+        while True:
+            try:
+                tick = await MarketService.get_live_tick()
+                if len(tick):
+                    for handler in list(self._handlers):
+                        try:
+                            await handler(tick)
+                        except Exception as e:
+                            logger.error(f"Tick handler {handler.__name__} failed: {e}")
+            except Exception as e:
+                logger.error(f"Error in tick feed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("Started live tick feed")
+
+    def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            logger.info("Stopped live tick feed")
+
+
+tick_feed = TickFeed()
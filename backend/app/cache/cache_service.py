@@ -1,5 +1,5 @@
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from app.cache.redis_client import get_redis
 
 CACHE_TTL = 5  # 5 seconds cache for live data
@@ -23,9 +23,11 @@ async def get_cached_live_market() -> Optional[str]:
     return data
 
 async def set_cached_live_market(data: Dict[str, Any]):
+    """Store a live tick in its compact encoding (``LiveTick.to_compact``)."""
     redis = await get_redis()
-    await redis.setex("nepse:live_market", CACHE_TTL, json.dumps(data))
-    await redis.setex("nepse:live_market:backup", 86400, json.dumps(data))
+    encoded = json.dumps(data, separators=(",", ":"))
+    await redis.setex("nepse:live_market", CACHE_TTL, encoded)
+    await redis.setex("nepse:live_market:backup", 86400, encoded)
     
 async def get_backup_live_market() -> Optional[str]:
     redis = await get_redis()
@@ -48,3 +50,52 @@ async def get_cached_fundamentals(symbol: str) -> Optional[Dict[str, Any]]:
 async def set_cached_fundamentals(symbol: str, data: Dict[str, Any]):
     redis = await get_redis()
     await redis.setex(f"nepse:fundamentals:{symbol}", CACHE_TTL_MEDIUM, json.dumps(data))
+
+def _watchlist_key(user_id: int) -> str:
+    return f"watchlist:user:{user_id}"
+
+async def get_cached_watchlist(user_id: int) -> Optional[List[Dict[str, Any]]]:
+    redis = await get_redis()
+    data = await redis.get(_watchlist_key(user_id))
+    return json.loads(data) if data else None
+
+async def set_cached_watchlist(user_id: int, items: List[Dict[str, Any]]):
+    redis = await get_redis()
+    await redis.setex(_watchlist_key(user_id), CACHE_TTL_LONG, json.dumps(items))
+
+async def invalidate_watchlist(user_id: int):
+    redis = await get_redis()
+    await redis.delete(_watchlist_key(user_id))
+
+NEWS_KEY = "news:latest"  # hash: category -> JSON list of articles
+NEWS_CATEGORIES_KEY = "news:categories"
+NEWS_REFRESHED_AT_KEY = "news:refreshed_at"
+NEWS_TTL = 86400  # kept as the stale fallback if scraping keeps failing
+
+async def get_cached_news(category: str) -> Optional[List[Dict[str, Any]]]:
+    """Articles of one category ('All' for every category), or None if never refreshed."""
+    redis = await get_redis()
+    data = await redis.hget(NEWS_KEY, category)
+    if data is not None:
+        return json.loads(data)
+    return [] if await redis.exists(NEWS_KEY) else None
+
+async def get_cached_news_categories() -> Optional[List[str]]:
+    redis = await get_redis()
+    data = await redis.get(NEWS_CATEGORIES_KEY)
+    return json.loads(data) if data else None
+
+async def get_news_refreshed_at() -> Optional[str]:
+    redis = await get_redis()
+    return await redis.get(NEWS_REFRESHED_AT_KEY)
+
+async def set_cached_news(by_category: Dict[str, List[Dict[str, Any]]], categories: List[str], refreshed_at: str):
+    """Replace the stored news in one transaction, so readers never see a half-written set."""
+    redis = await get_redis()
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.delete(NEWS_KEY)
+        pipe.hset(NEWS_KEY, mapping={c: json.dumps(items) for c, items in by_category.items()})
+        pipe.expire(NEWS_KEY, NEWS_TTL)
+        pipe.setex(NEWS_CATEGORIES_KEY, NEWS_TTL, json.dumps(categories))
+        pipe.setex(NEWS_REFRESHED_AT_KEY, NEWS_TTL, refreshed_at)
+        await pipe.execute()
@@ -30,6 +30,10 @@ async def get_redis() -> redis.Redis:
         await setup_redis()
     return redis_client
 
+def using_fakeredis() -> bool:
+    """True when running on the in-process fakeredis fallback (single worker, dev only)."""
+    return _use_fakeredis
+
 async def close_redis():
     global redis_client
     if redis_client and not _use_fakeredis:
@@ -19,6 +19,11 @@ class Settings(BaseSettings):
     SECRET_KEY: str = _generate_dev_key()
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_CACHE_TTL_SECONDS: int = 30  # cached user principal lifetime
+    JWT_BACKEND: str = "pyjwt"  # 'pyjwt' or 'jose'
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0  # how stale another worker's revocation list may be
+    BCRYPT_ROUNDS: int = 12  # cost factor; existing hashes are upgraded on login
+    BCRYPT_WORKERS: int = 4  # threads reserved for password hashing
 
     # CORS - comma separated origins, or ["*"] for dev
     ALLOWED_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
@@ -38,6 +43,20 @@ class Settings(BaseSettings):
     # Rate limiting
     RATE_LIMIT_PER_MINUTE: int = 60
 
+    # Per-user order serialization (Redis lock TTL, extended while held / max wait)
+    ORDER_LOCK_TIMEOUT_SECONDS: int = 10
+    ORDER_LOCK_WAIT_SECONDS: int = 15
+
+    # Notification channels (unset host/URL disables the channel)
+    SMTP_HOST: str | None = None
+    SMTP_PORT: int = 1025
+    SMTP_FROM: str = "alerts@sharesathi.local"
+    WEB_PUSH_GATEWAY_URL: str | None = None
+
+    # AI model registry
+    MODEL_REGISTRY_DIR: str = "./model_registry"
+    MODEL_REGISTRY_MAX_LOADED: int = 32
+
     @property
     def cors_origins(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
@@ -1,9 +1,71 @@
+"""
+Password hashing.
+
+bcrypt is deliberately slow (~100–300 ms per call at the default cost), so
+the async API runs it on a small dedicated thread pool instead of the event
+loop. bcrypt releases the GIL while hashing, so the pool also gives real
+parallelism up to ``BCRYPT_WORKERS``; beyond that, logins queue for a worker
+while WebSocket broadcasts and other requests keep running.
+
+The cost factor is ``BCRYPT_ROUNDS``. Hashes made with a different cost are
+reported by ``verify_and_update`` on the next successful login, so changing
+the setting migrates users transparently.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.config import settings
+
+BCRYPT_MAX_LENGTH = 72  # bcrypt only looks at the first 72 bytes
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+
+def _truncate(password: str) -> str:
+    return password[:BCRYPT_MAX_LENGTH]
+
+
+class PasswordHasher:
+    def __init__(self, context: CryptContext, max_workers: int):
+        self.context = context
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, _truncate(password))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, _truncate(password), hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; on success also return a new hash if the stored one is outdated."""
+        return await self._run(self.context.verify_and_update, _truncate(password), hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(pwd_context, max_workers=settings.BCRYPT_WORKERS)
+
 
+# ─── Blocking helpers (scripts and tests only) ──────────────
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password[:72], hashed_password)
+    return pwd_context.verify(_truncate(plain_password), hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password[:72])
+    return pwd_context.hash(_truncate(password))
@@ -1,45 +1,151 @@
+"""
+JWT signing and verification.
+
+The signing library sits behind a small backend interface chosen by
+``JWT_BACKEND``: PyJWT (the default, roughly twice as fast at HS256 verify)
+or python-jose. Verified access-token payloads are cached by the SHA-256 of
+the token until the token's own ``exp``, so repeat requests and WebSocket
+connects skip the signature check. Revocation is handled separately by
+``token_revocation``.
+"""
+
+import hashlib
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Union
-from jose import jwt, JWTError
+from typing import Any, Dict, Optional, Union
+
+from cachetools import TLRUCache
 
 from app.config import settings
 from app.core.constants import ALGORITHM
 
+logger = logging.getLogger(__name__)
+
+VERIFIED_CACHE_SIZE = 10_000
+
+
+class TokenError(Exception):
+    """The token is malformed, has a bad signature or has expired."""
+
+
+# ─── Backends ───────────────────────────────────────────────
+class JWTBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """Sign ``claims`` into a compact token."""
+
+    @abstractmethod
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verify ``token`` and return its claims; raise :class:`TokenError` if invalid."""
+
+
+class PyJWTBackend(JWTBackend):
+    name = "pyjwt"
+
+    def __init__(self):
+        import jwt
+        self._jwt = jwt
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return self._jwt.encode(claims, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]}
+            )
+        except self._jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+
+class JoseBackend(JWTBackend):
+    name = "jose"
+
+    def __init__(self):
+        from jose import jwt
+        self._jwt = jwt
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return self._jwt.encode(claims, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        from jose import JWTError
+        try:
+            payload = self._jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError as e:
+            raise TokenError(str(e)) from e
+        if "exp" not in payload or "sub" not in payload:
+            raise TokenError("Token is missing exp or sub")
+        return payload
+
+
+def load_backend(name: str) -> JWTBackend:
+    if name == "pyjwt":
+        try:
+            return PyJWTBackend()
+        except ImportError:
+            logger.warning("PyJWT not installed, falling back to python-jose")
+    elif name != "jose":
+        raise ValueError(f"Unknown JWT_BACKEND {name!r}")
+    return JoseBackend()
+
+
+backend = load_backend(settings.JWT_BACKEND)
+
+_verified: TLRUCache = TLRUCache(
+    maxsize=VERIFIED_CACHE_SIZE, ttu=lambda _key, payload, _now: payload["exp"], timer=time.time
+)
+
+
+# ─── Tokens ─────────────────────────────────────────────────
+def _create_token(subject: Union[str, Any], token_type: str, expires_delta: timedelta) -> str:
+    now = datetime.now(timezone.utc)
+    to_encode = {
+        "exp": int((now + expires_delta).timestamp()),
+        "iat": int(now.timestamp()),
+        "jti": uuid.uuid4().hex,
+        "sub": str(subject),
+        "type": token_type,
+    }
+    return backend.encode(to_encode)
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _create_token(
+        subject, "access", expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
 
 def create_refresh_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-        )
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _create_token(
+        subject, "refresh", expires_delta or timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
 
 def decode_access_token(token: str) -> dict:
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    """Verified payload, from the cache when this exact token was seen before.
+
+    The returned dict is shared with the cache and must not be modified.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _verified.get(key)
+    if payload is None:
+        payload = backend.decode(token)
+        _verified[key] = payload
+    return payload
 
 def decode_refresh_token(token: str) -> Optional[dict]:
     """Decode and validate a refresh token. Returns payload or None."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        payload = backend.decode(token)
         if payload.get("type") != "refresh":
             return None
         return payload
-    except JWTError:
+    except TokenError:
         return None
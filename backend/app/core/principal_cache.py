@@ -0,0 +1,98 @@
+"""
+Short-lived cache of authenticated user principals.
+
+``get_current_user`` resolves the JWT subject to a ``UserPrincipal`` from an
+in-process TTL LRU first, then Redis, and only then the users table. The
+principal is an immutable snapshot of the fields request handlers read; it
+never holds the password hash. Anything that changes those fields calls
+``invalidate`` so the next request reloads them.
+"""
+
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+from cachetools import TTLCache
+
+from app.cache.redis_client import get_redis
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    id: int
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            created_at=user.created_at,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat() if self.created_at else None
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "UserPrincipal":
+        data = json.loads(raw)
+        if data.get("created_at"):
+            data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+
+class PrincipalCache:
+    def __init__(self, ttl: int, maxsize: int = 10_000):
+        self.ttl = ttl
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"auth:principal:{user_id}"
+
+    async def get(self, user_id: int) -> Optional[UserPrincipal]:
+        principal = self._local.get(user_id)
+        if principal is not None:
+            return principal
+        try:
+            redis = await get_redis()
+            raw = await redis.get(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Principal cache read failed: {e}")
+            return None
+        if raw:
+            principal = UserPrincipal.from_json(raw)
+            self._local[user_id] = principal
+        return principal
+
+    async def set(self, principal: UserPrincipal) -> None:
+        self._local[principal.id] = principal
+        try:
+            redis = await get_redis()
+            await redis.setex(self._key(principal.id), self.ttl, principal.to_json())
+        except Exception as e:
+            logger.warning(f"Principal cache write failed: {e}")
+
+    async def invalidate(self, user_id: int) -> None:
+        """Drop a user's cached principal; other workers' local copies expire within the TTL."""
+        self._local.pop(user_id, None)
+        try:
+            redis = await get_redis()
+            await redis.delete(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation failed: {e}")
+
+
+principal_cache = PrincipalCache(ttl=settings.AUTH_CACHE_TTL_SECONDS)
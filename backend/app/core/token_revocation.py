@@ -0,0 +1,126 @@
+"""
+Token revocation list.
+
+Two kinds of revocation are kept in Redis:
+
+- ``auth:revoked``: a sorted set of revoked token ids (``jti``), scored by
+  the token's ``exp`` so expired entries can be trimmed
+- ``auth:revoked_before``: a hash of user id to a cutoff time; every token
+  issued before it is rejected (password change)
+
+Each worker mirrors both in memory and re-reads them only when the
+``auth:revoked:version`` counter has moved, checking it at most once every
+``sync_interval`` seconds. A request is checked against the in-memory set
+and never touches the database. The first request after each
+``sync_interval`` does wait on that version check (one Redis GET, plus a
+reload of both keys when the version moved); every other request skips
+Redis. A revocation applies at once on the worker that made it and within
+``sync_interval`` on every other one.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from app.cache.redis_client import get_redis
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "auth:revoked"
+REVOKED_BEFORE_KEY = "auth:revoked_before"
+VERSION_KEY = "auth:revoked:version"
+
+
+class TokenRevocationList:
+    def __init__(self, sync_interval: float, max_token_age: float):
+        self.sync_interval = sync_interval
+        self.max_token_age = max_token_age  # cutoffs older than any live token are dropped
+        self._revoked: Dict[str, float] = {}  # jti -> exp
+        self._revoked_before: Dict[int, float] = {}  # user_id -> cutoff
+        self._version: Optional[str] = None
+        self._synced_at: Optional[float] = None
+
+    async def revoke(self, claims: Mapping[str, Any]) -> None:
+        """Revoke one token until it would have expired anyway."""
+        jti, exp = claims.get("jti"), claims.get("exp")
+        if not jti or not exp:
+            return
+        self._revoked[jti] = float(exp)
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.zadd(REVOKED_KEY, {jti: exp})
+                pipe.zremrangebyscore(REVOKED_KEY, "-inf", time.time())
+                pipe.incr(VERSION_KEY)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Token revocation write failed: {e}")
+
+    async def revoke_user(self, user_id: int) -> None:
+        """Revoke every token issued to a user up to now."""
+        cutoff = int(time.time())
+        self._revoked_before[user_id] = cutoff
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.hset(REVOKED_BEFORE_KEY, str(user_id), cutoff)
+                pipe.incr(VERSION_KEY)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Token revocation write failed: {e}")
+
+    async def is_revoked(self, claims: Mapping[str, Any]) -> bool:
+        await self._sync()
+        jti = claims.get("jti")
+        if jti and jti in self._revoked:
+            return True
+        try:
+            cutoff = self._revoked_before.get(int(claims.get("sub")))
+        except (TypeError, ValueError):
+            return True
+        # Tokens without iat predate revocation support and count as oldest
+        return cutoff is not None and claims.get("iat", 0) < cutoff
+
+    def clear(self) -> None:
+        self._revoked.clear()
+        self._revoked_before.clear()
+        self._version = None
+        self._synced_at = None
+
+    async def _sync(self) -> None:
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        try:
+            redis = await get_redis()
+            version = await redis.get(VERSION_KEY)
+            if version is not None and version != self._version:
+                wall = time.time()
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.zrangebyscore(REVOKED_KEY, wall, "+inf", withscores=True)
+                    pipe.hgetall(REVOKED_BEFORE_KEY)
+                    revoked, revoked_before = await pipe.execute()
+                # Revocations are never undone, so merging keeps local writes
+                # that may not have reached Redis
+                self._revoked.update(revoked)
+                for user_id, cutoff in revoked_before.items():
+                    user_id, cutoff = int(user_id), float(cutoff)
+                    self._revoked_before[user_id] = max(cutoff, self._revoked_before.get(user_id, 0))
+                self._version = version
+        except Exception as e:
+            logger.warning(f"Token revocation sync failed: {e}")
+        self._prune()
+
+    def _prune(self) -> None:
+        wall = time.time()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > wall}
+        oldest = wall - self.max_token_age
+        self._revoked_before = {u: c for u, c in self._revoked_before.items() if c > oldest}
+
+
+token_revocation = TokenRevocationList(
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    max_token_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+)
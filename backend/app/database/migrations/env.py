@@ -10,7 +10,7 @@ from app.config import settings
 from app.database.base import Base
 
 # Import all models so Alembic sees them
-from app.models import User, Wallet, Stock, Portfolio, Transaction, Watchlist, Ipo, HistoricalPrice  # noqa
+import app.models  # noqa
 
 config = context.config
 
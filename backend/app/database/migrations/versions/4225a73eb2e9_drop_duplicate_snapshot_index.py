@@ -0,0 +1,35 @@
+"""portfolio_snapshots: drop the index duplicating the (user_id, date) unique constraint
+
+Revision ID: 4225a73eb2e9
+Revises: d4d6a65aab07
+Create Date: 2026-10-19 18:05:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4225a73eb2e9'
+down_revision: Union[str, None] = 'd4d6a65aab07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_portfolio_snapshot_user_date"
+
+
+def _indexes() -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("portfolio_snapshots"):
+        return set()
+    return {index["name"] for index in inspector.get_indexes("portfolio_snapshots")}
+
+
+def upgrade() -> None:
+    if INDEX in _indexes():
+        op.drop_index(INDEX, table_name="portfolio_snapshots")
+
+
+def downgrade() -> None:
+    pass  # the unique constraint's own index already serves (user_id, date)
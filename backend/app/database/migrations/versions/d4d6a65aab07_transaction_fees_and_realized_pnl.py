@@ -0,0 +1,51 @@
+"""transactions: fees and realized_pnl
+
+Revision ID: d4d6a65aab07
+Revises:
+Create Date: 2026-10-19 16:31:16
+
+Tables are created by ``Base.metadata.create_all`` at startup, so a database
+created after these columns were added already has them; only the missing
+ones are added.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4d6a65aab07'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns() -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("transactions"):
+        return set()
+    return {column["name"] for column in inspector.get_columns("transactions")}
+
+
+def upgrade() -> None:
+    existing = _columns()
+    if not existing:
+        return  # no transactions table yet; create_all builds it with both columns
+    if "fees" not in existing:
+        op.add_column(
+            "transactions",
+            sa.Column("fees", sa.Numeric(12, 2), nullable=False, server_default=sa.text("0")),
+        )
+    if "realized_pnl" not in existing:
+        op.add_column("transactions", sa.Column("realized_pnl", sa.Numeric(14, 2), nullable=True))
+
+
+def downgrade() -> None:
+    existing = _columns()
+    if not existing:
+        return
+    with op.batch_alter_table("transactions") as batch:
+        if "realized_pnl" in existing:
+            batch.drop_column("realized_pnl")
+        if "fees" in existing:
+            batch.drop_column("fees")
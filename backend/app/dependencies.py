@@ -5,34 +5,56 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.core.jwt_handler import decode_access_token
+from app.core.principal_cache import UserPrincipal, principal_cache
+from app.core.token_revocation import token_revocation
 from app.database.session import get_db
-from app.models.user import User
 from app.repositories.user_repo import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+async def get_token_claims(token: Annotated[str, Depends(oauth2_scheme)]) -> dict:
+    """Claims of a verified, unrevoked access token."""
     try:
         payload = decode_access_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except Exception:
-        raise credentials_exception
-
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(int(user_id))
-    
-    if user is None:
-        raise credentials_exception
-    if not user.is_active:
+        raise _credentials_exception()
+    if payload.get("sub") is None or payload.get("type") == "refresh":
+        raise _credentials_exception()
+    if await token_revocation.is_revoked(payload):
+        raise _credentials_exception()
+    return payload
+
+async def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
+    """User id from the verified access token alone — no database or cache lookup.
+
+    For read-only endpoints that only scope queries by user id.
+    """
+    claims = await get_token_claims(token)
+    try:
+        return int(claims["sub"])
+    except ValueError:
+        raise _credentials_exception()
+
+async def get_current_user(
+    user_id: Annotated[int, Depends(get_current_user_id)],
+    db: AsyncSession = Depends(get_db)
+) -> UserPrincipal:
+    """Active user principal, served from the principal cache when possible."""
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        user = await UserRepository(db).get_by_id(user_id)
+        if user is None:
+            raise _credentials_exception()
+        principal = UserPrincipal.from_user(user)
+        await principal_cache.set(principal)
+
+    if not principal.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return user
+    return principal
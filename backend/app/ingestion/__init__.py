@@ -0,0 +1,12 @@
+"""
+Market ingestion shared by the API and the InsForge sync: fetch from NEPSE
+once, normalize into records, publish to sinks.
+"""
+
+from app.ingestion.parsing import parse_float, parse_int
+from app.ingestion.records import (
+    Company, LiveTick, MarketData, MarketSummary, StockQuote, SubIndex, TopMover,
+    live_market_payload, market_summary_payload,
+)
+from app.ingestion.sinks import DatabaseSink, MarketSink, RedisCacheSink, publish
+from app.ingestion.source import fetch_live_quotes, fetch_market, get_nepse
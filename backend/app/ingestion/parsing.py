@@ -0,0 +1,17 @@
+"""Lenient number parsing for values as NEPSE returns them ("1,234.5", "Rs 12", None)."""
+
+from typing import Any
+
+
+def parse_float(val: Any) -> float:
+    """``val`` as a float, ignoring thousands separators and currency labels; 0.0 if unparseable."""
+    if isinstance(val, (int, float)):
+        return float(val)
+    try:
+        return float(str(val).replace(",", "").replace("Rs", "").replace(":", "").strip())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_int(val: Any) -> int:
+    return int(parse_float(val))
@@ -0,0 +1,190 @@
+"""
+Normalized market records.
+
+NEPSE responses are parsed once into these typed records; every consumer
+(API cache, local DB, InsForge) renders its own wire format from them.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class StockQuote:
+    symbol: str
+    ltp: float
+    previous_close: float
+    percentage_change: float
+    volume: int
+    turnover: float = 0.0
+    high: float = 0.0
+    low: float = 0.0
+    open_price: float = 0.0
+
+    @property
+    def point_change(self) -> float:
+        return round(self.ltp - self.previous_close, 2)
+
+
+@dataclass(frozen=True, slots=True)
+class SubIndex:
+    sector: str
+    value: float
+    change: float
+    percentage_change: float
+
+
+@dataclass(frozen=True, slots=True)
+class TopMover:
+    symbol: str
+    ltp: float = 0.0
+    point_change: float = 0.0
+    percentage_change: float = 0.0
+    turnover: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class Company:
+    symbol: str
+    name: str
+    sector: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class MarketSummary:
+    nepse_index: float
+    point_change: float
+    percentage_change: float
+    total_turnover: float
+    total_traded_shares: float
+    total_transactions: int
+    is_open: bool
+
+
+@dataclass(slots=True)
+class MarketData:
+    """Everything one market fetch returned."""
+    summary: MarketSummary
+    stocks: List[StockQuote] = field(default_factory=list)
+    sub_indices: List[SubIndex] = field(default_factory=list)
+    gainers: List[TopMover] = field(default_factory=list)
+    losers: List[TopMover] = field(default_factory=list)
+    turnovers: List[TopMover] = field(default_factory=list)
+    companies: Dict[str, Company] = field(default_factory=dict)
+
+
+class LiveTick:
+    """One live market poll, shared by every consumer of that tick.
+
+    Quotes stay as slotted records; the by-symbol index, the price map and
+    the JSON wire format are each built at most once, on first use.
+    """
+    __slots__ = ("quotes", "is_stale", "_by_symbol", "_prices", "_payload")
+
+    def __init__(self, quotes: Sequence[StockQuote] = (), is_stale: bool = False):
+        self.quotes = tuple(quotes)
+        self.is_stale = is_stale
+        self._by_symbol: Optional[Dict[str, StockQuote]] = None
+        self._prices: Optional[Dict[str, float]] = None
+        self._payload: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+    def get(self, symbol: str) -> Optional[StockQuote]:
+        if self._by_symbol is None:
+            self._by_symbol = {q.symbol: q for q in self.quotes}
+        return self._by_symbol.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return [q.symbol for q in self.quotes]
+
+    def prices(self) -> Dict[str, float]:
+        """Last traded price by symbol. Shared between consumers — do not mutate."""
+        if self._prices is None:
+            self._prices = {q.symbol: q.ltp for q in self.quotes}
+        return self._prices
+
+    def to_payload(self) -> Dict[str, Any]:
+        """The API / WebSocket wire format."""
+        if self._payload is None:
+            self._payload = live_market_payload(self.quotes)
+            self._payload["is_stale"] = self.is_stale
+        return self._payload
+
+    # ─── Cache encoding ─────────────────────────────────────
+    # Quotes as positional rows in StockQuote field order, not dicts
+
+    def to_compact(self) -> Dict[str, Any]:
+        return {
+            "quotes": [
+                [q.symbol, q.ltp, q.previous_close, q.percentage_change, q.volume,
+                 q.turnover, q.high, q.low, q.open_price]
+                for q in self.quotes
+            ],
+            "is_stale": self.is_stale,
+        }
+
+    @classmethod
+    def from_json(cls, raw: str) -> "LiveTick":
+        """Decode a cached tick; also reads the wire format cached by older versions."""
+        data = json.loads(raw)
+        if "quotes" in data:
+            return cls([StockQuote(*row) for row in data["quotes"]], data.get("is_stale", False))
+        return cls(
+            [
+                StockQuote(
+                    symbol=row["symbol"],
+                    ltp=row.get("lastTradedPrice", 0),
+                    previous_close=round(row.get("lastTradedPrice", 0) - row.get("pointChange", 0), 2),
+                    percentage_change=row.get("percentageChange", 0),
+                    volume=row.get("volume", 0),
+                )
+                for row in data.get("live_market", [])
+                if row.get("symbol")
+            ],
+            data.get("is_stale", False),
+        )
+
+
+# ─── API wire format ────────────────────────────────────────
+
+def live_market_payload(stocks: Sequence[StockQuote]) -> Dict[str, Any]:
+    """The cached / WebSocket live market shape."""
+    return {
+        "live_market": [
+            {
+                "symbol": q.symbol,
+                "lastTradedPrice": q.ltp,
+                "pointChange": q.point_change,
+                "percentageChange": q.percentage_change,
+                "volume": q.volume,
+            }
+            for q in stocks
+        ],
+        "is_stale": False,
+    }
+
+
+def market_summary_payload(data: MarketData) -> Dict[str, Any]:
+    """The cached /market/summary shape."""
+    return {
+        "summary": {
+            "nepseIndex": data.summary.nepse_index,
+            "totalTurnover": data.summary.total_turnover,
+            "totalTradedShares": data.summary.total_traded_shares,
+            "marketStatus": "Open" if data.summary.is_open else "Closed",
+        },
+        "subIndices": [{"sector": s.sector, "value": s.value, "change": s.change} for s in data.sub_indices],
+        "topGainers": [
+            {"symbol": m.symbol, "ltp": m.ltp, "pointChange": m.point_change, "percentageChange": m.percentage_change}
+            for m in data.gainers
+        ],
+        "topLosers": [
+            {"symbol": m.symbol, "ltp": m.ltp, "pointChange": m.point_change, "percentageChange": m.percentage_change}
+            for m in data.losers
+        ],
+        "topTurnovers": [{"symbol": m.symbol, "turnover": m.turnover} for m in data.turnovers],
+        "is_stale": False,
+    }
@@ -0,0 +1,64 @@
+"""
+Where fetched market data goes.
+
+A sink renders :class:`MarketData` into one consumer's format and stores it.
+Sinks import their backends on first use, so the sync script can load this
+package without the API's Redis and database settings.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Iterable, List
+
+from app.ingestion.records import LiveTick, MarketData, market_summary_payload
+from app.utils.logger import logger
+
+
+class MarketSink(ABC):
+    name = "sink"
+
+    @abstractmethod
+    async def publish(self, data: MarketData) -> None:
+        """Render ``data`` for this consumer and store it."""
+
+
+class RedisCacheSink(MarketSink):
+    """The API's cached market summary and live market."""
+    name = "redis"
+
+    async def publish(self, data: MarketData) -> None:
+        from app.cache.cache_service import set_cached_live_market, set_cached_market_summary
+
+        await set_cached_market_summary(market_summary_payload(data))
+        if data.stocks:
+            await set_cached_live_market(LiveTick(data.stocks).to_compact())
+
+
+class DatabaseSink(MarketSink):
+    """The local ``stocks`` table: every listed company with its name and sector."""
+    name = "database"
+
+    async def publish(self, data: MarketData) -> None:
+        if not data.companies:
+            return
+        from app.database.session import AsyncSessionLocal
+        from app.repositories.stock_repo import StockRepository
+
+        async with AsyncSessionLocal() as db:
+            await StockRepository(db).upsert_stocks(data.companies.values())
+            await db.commit()
+
+
+async def publish(data: MarketData, sinks: Iterable[MarketSink]) -> List[str]:
+    """Publish to every sink concurrently; one failing sink does not stop the others.
+
+    Returns the names of the sinks that failed.
+    """
+    sinks = list(sinks)
+    results = await asyncio.gather(*(sink.publish(data) for sink in sinks), return_exceptions=True)
+    failed = []
+    for sink, result in zip(sinks, results):
+        if isinstance(result, Exception):
+            logger.error(f"Market sink {sink.name} failed: {result}")
+            failed.append(sink.name)
+    return failed
@@ -0,0 +1,136 @@
+"""
+Fetching from NEPSE.
+
+One process-wide NEPSE session, and the fetches that turn its responses into
+records. The API, background jobs and the InsForge sync all read the market
+through here.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List
+
+from app.ingestion.parsing import parse_float, parse_int
+from app.ingestion.records import Company, MarketData, MarketSummary, StockQuote, SubIndex, TopMover
+
+_nepse = None
+
+
+def get_nepse():
+    """The shared AsyncNepse; its access token is reused until it expires."""
+    global _nepse
+    if _nepse is None:
+        from nepse import AsyncNepse
+
+        _nepse = AsyncNepse()
+        _nepse.setTLSVerification(False)
+    return _nepse
+
+
+# ─── Normalization ──────────────────────────────────────────
+
+def parse_quotes(live_data: Iterable[Dict[str, Any]]) -> List[StockQuote]:
+    return [
+        StockQuote(
+            symbol=row["symbol"],
+            ltp=parse_float(row.get("lastTradedPrice")),
+            previous_close=parse_float(row.get("previousClose")),
+            percentage_change=parse_float(row.get("percentageChange")),
+            volume=parse_int(row.get("totalTradeQuantity")),
+            turnover=parse_float(row.get("totalTradeValue")),
+            high=parse_float(row.get("highPrice")),
+            low=parse_float(row.get("lowPrice")),
+            open_price=parse_float(row.get("openPrice")),
+        )
+        for row in live_data or []
+        if row.get("symbol")
+    ]
+
+
+def parse_sub_indices(raw: Iterable[Dict[str, Any]]) -> List[SubIndex]:
+    sub_indices = []
+    for item in raw or []:
+        sector = item.get("index", "").replace(" SubIndex", "").replace(" Index", "").strip()
+        if sector:
+            sub_indices.append(SubIndex(
+                sector=sector,
+                value=parse_float(item.get("currentValue")),
+                change=parse_float(item.get("change")),
+                percentage_change=parse_float(item.get("percentChange")),
+            ))
+    return sub_indices
+
+
+def parse_movers(raw: Iterable[Dict[str, Any]]) -> List[TopMover]:
+    return [
+        TopMover(
+            symbol=item["symbol"],
+            ltp=parse_float(item.get("ltp")),
+            point_change=parse_float(item.get("pointChange")),
+            percentage_change=parse_float(item.get("percentageChange")),
+            turnover=parse_float(item.get("turnover")),
+        )
+        for item in raw or []
+        if item.get("symbol")
+    ]
+
+
+def parse_summary(summary_raw: Iterable[Dict[str, Any]], indices_raw: Iterable[Dict[str, Any]], is_open) -> MarketSummary:
+    # Detail labels carry units ("Total Turnover Rs:"), so match on the prefix
+    details = {item.get("detail", ""): item.get("value") for item in summary_raw or []}
+
+    def detail(label: str) -> float:
+        return next((parse_float(v) for k, v in details.items() if k.startswith(label)), 0.0)
+
+    nepse_index = next((item for item in indices_raw or [] if item.get("index") == "NEPSE Index"), {})
+    return MarketSummary(
+        nepse_index=parse_float(nepse_index.get("currentValue")),
+        point_change=parse_float(nepse_index.get("change")),
+        percentage_change=parse_float(nepse_index.get("perChange")),
+        total_turnover=detail("Total Turnover"),
+        total_traded_shares=detail("Total Traded Shares"),
+        total_transactions=int(detail("Total Transactions")),
+        is_open=bool(is_open),
+    )
+
+
+def parse_companies(raw: Iterable[Dict[str, Any]]) -> Dict[str, Company]:
+    return {
+        c["symbol"]: Company(symbol=c["symbol"], name=c.get("securityName") or c["symbol"], sector=c.get("sectorName"))
+        for c in raw or []
+        if c.get("symbol")
+    }
+
+
+# ─── Fetches ────────────────────────────────────────────────
+
+async def fetch_live_quotes(nepse=None) -> List[StockQuote]:
+    """Just the live market — what every tick needs."""
+    return parse_quotes(await (nepse or get_nepse()).getLiveMarket())
+
+
+async def fetch_market(nepse=None, companies: bool = False) -> MarketData:
+    """The whole market in one round of concurrent NEPSE calls.
+
+    ``companies`` also fetches the company list (names and sectors), which
+    only changes on new listings.
+    """
+    n = nepse or get_nepse()
+    calls = [
+        n.getSummary(), n.getNepseIndex(), n.getNepseSubIndices(),
+        n.getTopGainers(), n.getTopLosers(), n.getTopTenTurnoverScrips(),
+        n.isNepseOpen(), n.getLiveMarket(),
+    ]
+    if companies:
+        calls.append(n.getCompanyList())
+    summary_raw, indices_raw, subindices_raw, gainers_raw, losers_raw, turnovers_raw, is_open, live_data, *rest = (
+        await asyncio.gather(*calls)
+    )
+    return MarketData(
+        summary=parse_summary(summary_raw, indices_raw, is_open),
+        stocks=parse_quotes(live_data),
+        sub_indices=parse_sub_indices(subindices_raw),
+        gainers=parse_movers(gainers_raw),
+        losers=parse_movers(losers_raw),
+        turnovers=parse_movers(turnovers_raw),
+        companies=parse_companies(rest[0]) if rest else {},
+    )
@@ -18,7 +18,14 @@ from app.database.connection import engine
 from app.database.base import Base
 from app.websocket.connection_manager import manager
 from app.background.scheduler import start_scheduler, stop_scheduler
+from app.background.tick_feed import tick_feed
+from app.background.order_matcher import load_open_orders, match_orders
+from app.background.leaderboard_ranker import rank_leaderboard
+from app.background.price_alerts import alert_dispatcher, check_alerts, load_alerts
+from app.services.notification_service import notification_pipeline
+from app.services.market_snapshot import market_snapshot
 from app.cache.redis_client import setup_redis, close_redis
+from app.core.hashing import password_hasher
 
 # ─── Sentry Error Monitoring ──────────────────────────────
 # To enable: pip install sentry-sdk[fastapi]
@@ -88,14 +95,33 @@ async def lifespan(app: FastAPI):
     # Initialize Redis
     await setup_redis()
     
+    # Keep an indexed copy of the latest tick for per-symbol lookups
+    tick_feed.subscribe(market_snapshot.update)
+
+    # Restore resting limit/stop orders and match them on every live tick
+    await load_open_orders()
+    tick_feed.subscribe(match_orders)
+    tick_feed.subscribe(rank_leaderboard)
+
+    # Arm watchlist price alerts and evaluate them on every live tick
+    await load_alerts()
+    tick_feed.subscribe(check_alerts)
+    notification_pipeline.start()
+    alert_dispatcher.start()
+
     manager.start_broadcasting()
+    tick_feed.start()
     start_scheduler()
     
     yield
     
     logger.info("Shutting down...")
     stop_scheduler()
+    tick_feed.stop()
+    alert_dispatcher.stop()
+    await notification_pipeline.stop()
     manager.stop_broadcasting()
+    password_hasher.shutdown()
     await close_redis()
     await engine.dispose()
 
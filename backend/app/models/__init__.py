@@ -6,3 +6,8 @@ from .portfolio import Portfolio
 from .transaction import Transaction
 from .ipo import Ipo
 from .watchlist import Watchlist
+from .order import Order
+from .realized_pnl import RealizedPnl
+from .portfolio_snapshot import PortfolioSnapshot
+from .notification_delivery import NotificationDelivery
+from .news_article import NewsArticle, NewsSymbol
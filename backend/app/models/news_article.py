@@ -0,0 +1,51 @@
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Index, Integer, String, Text, event
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+class NewsArticle(Base):
+    """Every scraped news article, kept once and never replaced."""
+    __tablename__ = "news_articles"
+    __table_args__ = (
+        Index("ix_news_articles_category_id", "category", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    title_hash = Column(String(64), unique=True, nullable=False) # sha256 of the normalised title
+    url = Column(String, unique=True, nullable=True)
+    title = Column(String(500), nullable=False)
+    category = Column(String, nullable=False)
+    source = Column(String, nullable=False)
+    content = Column(Text, nullable=True)
+    published_at = Column(DateTime(timezone=True), server_default=func.now()) # first seen by the scraper
+
+class NewsSymbol(Base):
+    """Stock symbols mentioned by an article, extracted at ingestion."""
+    __tablename__ = "news_symbols"
+
+    symbol = Column(String, primary_key=True)
+    article_id = Column(Integer, ForeignKey("news_articles.id", ondelete="CASCADE"), primary_key=True)
+
+
+# ─── Full-text index ────────────────────────────────────────
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+# PostgreSQL: a generated tsvector column with a GIN index.
+_table = NewsArticle.__table__
+
+for statement in (
+    "CREATE VIRTUAL TABLE news_articles_fts USING fts5("
+    "title, content, content='news_articles', content_rowid='id')",
+    "CREATE TRIGGER news_articles_fts_insert AFTER INSERT ON news_articles BEGIN "
+    "INSERT INTO news_articles_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER news_articles_fts_delete AFTER DELETE ON news_articles BEGIN "
+    "INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+):
+    event.listen(_table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(_table, "before_drop", DDL("DROP TABLE IF EXISTS news_articles_fts").execute_if(dialect="sqlite"))
+
+for statement in (
+    "ALTER TABLE news_articles ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+    "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))) STORED",
+    "CREATE INDEX ix_news_articles_search ON news_articles USING GIN (search_vector)",
+):
+    event.listen(_table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
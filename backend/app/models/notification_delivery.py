@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+class NotificationDelivery(Base):
+    """Outcome of delivering one notification over one channel."""
+    __tablename__ = "notification_deliveries"
+    __table_args__ = (
+        Index("ix_notification_deliveries_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    channel = Column(String, nullable=False) # 'websocket', 'email', 'webpush'
+    kind = Column(String, nullable=False) # e.g. 'PRICE_ALERT'
+    symbol = Column(String, nullable=True)
+    message = Column(String, nullable=False)
+    status = Column(String, nullable=False) # 'DELIVERED', 'SKIPPED', 'FAILED', 'DROPPED'
+    attempts = Column(Integer, nullable=False, default=1)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False) # when the notification was raised
+    delivered_at = Column(DateTime(timezone=True), server_default=func.now())
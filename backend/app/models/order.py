@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+class Order(Base):
+    __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_status_symbol", "status", "symbol"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    symbol = Column(String, ForeignKey("stocks.symbol"), nullable=False)
+    side = Column(String, nullable=False) # 'BUY' or 'SELL'
+    order_type = Column(String, nullable=False) # 'LIMIT' or 'STOP'
+    quantity = Column(Integer, nullable=False)
+    price = Column(Numeric(10, 2), nullable=False) # limit price or stop trigger
+    status = Column(String, nullable=False, default="OPEN") # 'OPEN', 'FILLED', 'CANCELLED', 'REJECTED'
+    status_reason = Column(String, nullable=True)
+    filled_price = Column(Numeric(10, 2), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    filled_at = Column(DateTime(timezone=True), nullable=True)
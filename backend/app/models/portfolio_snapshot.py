@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Date, DateTime, UniqueConstraint
+from app.database.base import Base
+
+class PortfolioSnapshot(Base):
+    """End-of-day net asset value of one user's paper portfolio."""
+    __tablename__ = "portfolio_snapshots"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_portfolio_snapshot_user_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False) # NPT trading day
+    cash = Column(Numeric(14, 2), nullable=False)
+    holdings_value = Column(Numeric(14, 2), nullable=False)
+    nav = Column(Numeric(14, 2), nullable=False) # cash + holdings_value
+    net_flow = Column(Numeric(14, 2), nullable=False, default=0.00) # cash in/out not explained by trades
+    taken_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+class RealizedPnl(Base):
+    """Running realized P&L per (user, symbol), updated as each trade executes."""
+    __tablename__ = "realized_pnl"
+    __table_args__ = (
+        UniqueConstraint("user_id", "symbol", name="uq_realized_pnl_user_symbol"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    symbol = Column(String, ForeignKey("stocks.symbol"), nullable=False)
+    quantity_sold = Column(Integer, nullable=False, default=0)
+    sell_value = Column(Numeric(14, 2), nullable=False, default=0.00) # gross proceeds
+    cost_basis = Column(Numeric(14, 2), nullable=False, default=0.00) # average cost of shares sold
+    fees_paid = Column(Numeric(12, 2), nullable=False, default=0.00) # buy + sell fees
+    realized_pnl = Column(Numeric(14, 2), nullable=False, default=0.00) # sell_value - cost_basis - sell fees
+
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
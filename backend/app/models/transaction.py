@@ -11,4 +11,6 @@ class Transaction(Base):
     transaction_type = Column(String, nullable=False) # 'BUY' or 'SELL'
     quantity = Column(Integer, nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
+    fees = Column(Numeric(12, 2), nullable=False, default=0.00) # brokerage + SEBON + DP
+    realized_pnl = Column(Numeric(14, 2), nullable=True) # SELL only, weighted-average cost
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
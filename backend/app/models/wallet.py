@@ -2,12 +2,14 @@ from sqlalchemy import Column, Integer, Numeric, ForeignKey, DateTime, CheckCons
 from sqlalchemy.sql import func
 from app.database.base import Base
 
+STARTING_BALANCE = 1000000.00 # NPR 10 Lakh paper-trading capital
+
 class Wallet(Base):
     __tablename__ = "wallet"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
-    balance = Column(Numeric(12, 2), default=1000000.00, nullable=False) # NPR 10 Lakh default
+    balance = Column(Numeric(12, 2), default=STARTING_BALANCE, nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
     __table_args__ = (
@@ -7,6 +7,8 @@ class Watchlist(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "symbol", name="uq_watchlist_user_symbol"),
     )
+    # Fetch id/added_at with INSERT ... RETURNING instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -0,0 +1,132 @@
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.news_article import NewsArticle, NewsSymbol
+
+_WORD = re.compile(r"\w+")
+_SYMBOL_TOKEN = re.compile(r"\b[A-Z][A-Z0-9]{1,9}\b")
+_fts = table("news_articles_fts", column("rowid"))
+
+
+def title_hash(title: str) -> str:
+    """Dedup key: the title lower-cased with whitespace collapsed."""
+    return hashlib.sha256(" ".join(title.lower().split()).encode()).hexdigest()
+
+def extract_symbols(content: str, known_symbols: Set[str]) -> Set[str]:
+    """Known stock symbols written in upper case in ``content``."""
+    return {token for token in _SYMBOL_TOKEN.findall(content or "") if token in known_symbols}
+
+
+class NewsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _insert(self):
+        dialect = self.db.bind.dialect.name
+        return (pg_insert if dialect == "postgresql" else sqlite_insert)(NewsArticle)
+
+    async def _find(self, hashes: Iterable[str], urls: Iterable[str]) -> List[Any]:
+        hashes, urls = list(hashes), [u for u in urls if u]
+        result = await self.db.execute(
+            select(NewsArticle.id, NewsArticle.title_hash, NewsArticle.url, NewsArticle.published_at)
+            .where(or_(NewsArticle.title_hash.in_(hashes), NewsArticle.url.in_(urls)))
+        )
+        return list(result.all())
+
+    async def ingest(self, items: Sequence[Dict[str, Any]], known_symbols: Set[str]) -> List[Dict[str, Any]]:
+        """Archive scraped items, skipping ones already stored under the same URL or title.
+
+        Returns the items with their stable archive ``id`` and first-seen
+        ``published_at``, in the order given.
+        """
+        if not items:
+            return []
+        keyed = [(title_hash(item["title"]), item) for item in items]
+        existing = await self._find((h for h, _ in keyed), (i.get("url") for _, i in keyed))
+        known_hashes = {row.title_hash for row in existing}
+        known_urls = {row.url for row in existing if row.url}
+
+        new_rows, pending = [], set()
+        for h, item in keyed:
+            if h in known_hashes or h in pending or (item.get("url") and item["url"] in known_urls):
+                continue
+            pending.add(h)
+            if item.get("url"):
+                known_urls.add(item["url"])
+            new_rows.append({
+                "title_hash": h,
+                "url": item.get("url"),
+                "title": item["title"],
+                "category": item["category"],
+                "source": item["source"],
+                "content": item.get("content"),
+            })
+
+        if new_rows:
+            # Another worker may be ingesting the same scrape; conflicts are skipped
+            result = await self.db.execute(
+                self._insert().on_conflict_do_nothing()
+                .returning(NewsArticle.id, NewsArticle.title, NewsArticle.content),
+                new_rows,
+            )
+            mentions = [
+                {"symbol": symbol, "article_id": row.id}
+                for row in result.all()
+                for symbol in extract_symbols(f"{row.title} {row.content or ''}", known_symbols)
+            ]
+            if mentions:
+                await self.db.execute(NewsSymbol.__table__.insert(), mentions)
+            existing = await self._find((h for h, _ in keyed), (i.get("url") for _, i in keyed))
+
+        by_hash = {row.title_hash: row for row in existing}
+        by_url = {row.url: row for row in existing if row.url}
+        archived = []
+        for h, item in keyed:
+            row = by_hash.get(h) or by_url.get(item.get("url"))
+            if row is None:
+                continue
+            published_at = row.published_at.strftime("%Y-%m-%d %H:%M") if row.published_at else item.get("published_at")
+            archived.append({**item, "id": row.id, "published_at": published_at})
+        return archived
+
+    async def search(
+        self, q: Optional[str] = None, symbol: Optional[str] = None,
+        before: Optional[int] = None, limit: int = 20,
+    ) -> List[NewsArticle]:
+        """Newest-first archive page, continuing below article id ``before``.
+
+        Paging is by keyset on ``id`` (ids follow first-seen order), so every
+        page is an index range scan however deep it goes.
+        """
+        stmt = select(NewsArticle)
+        # Page on the id column of whichever index drives the query, so the
+        # range and the ordering are both served by that index
+        key = NewsArticle.id
+        if symbol:
+            stmt = stmt.join(NewsSymbol, NewsSymbol.article_id == NewsArticle.id).where(NewsSymbol.symbol == symbol)
+            key = NewsSymbol.article_id
+        if q:
+            words = _WORD.findall(q)
+            if not words:
+                return []
+            if self.db.bind.dialect.name == "postgresql":
+                query = " & ".join(f"{w}:*" for w in words)
+                stmt = stmt.where(
+                    literal_column("news_articles.search_vector").op("@@")(func.to_tsquery("english", query))
+                )
+            else:
+                query = " ".join(f'"{w}"*' for w in words)
+                stmt = stmt.join(_fts, _fts.c.rowid == NewsArticle.id).where(
+                    text("news_articles_fts MATCH :fts_query").bindparams(fts_query=query)
+                )
+                key = _fts.c.rowid
+        if before is not None:
+            stmt = stmt.where(key < before)
+        result = await self.db.execute(stmt.order_by(key.desc()).limit(limit))
+        return list(result.scalars().all())
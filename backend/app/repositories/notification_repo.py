@@ -0,0 +1,13 @@
+from typing import Any, Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert
+
+from app.models.notification_delivery import NotificationDelivery
+
+class NotificationRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_deliveries(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            await self.db.execute(insert(NotificationDelivery), rows)
@@ -0,0 +1,33 @@
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.models.order import Order
+
+class OrderRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def create(self, order: Order):
+        self.db.add(order)
+
+    async def get_open_orders(self) -> List[Order]:
+        result = await self.db.execute(
+            select(Order).where(Order.status == "OPEN").order_by(Order.id)
+        )
+        return list(result.scalars().all())
+
+    async def get_user_orders(self, user_id: int, status: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Order]:
+        query = select(Order).where(Order.user_id == user_id)
+        if status:
+            query = query.where(Order.status == status)
+        result = await self.db.execute(
+            query.order_by(Order.id.desc()).offset(offset).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_order_for_update(self, order_id: int) -> Optional[Order]:
+        result = await self.db.execute(
+            select(Order).where(Order.id == order_id).with_for_update()
+        )
+        return result.scalar_one_or_none()
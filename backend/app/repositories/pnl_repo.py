@@ -0,0 +1,70 @@
+from decimal import Decimal
+from typing import Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert, select, update
+
+from app.models.realized_pnl import RealizedPnl
+
+ZERO = Decimal("0")
+CENT = Decimal("0.01")
+
+class RealizedPnlRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record(
+        self,
+        user_id: int,
+        symbol: str,
+        fees: Decimal,
+        quantity_sold: int = 0,
+        sell_value: Decimal = ZERO,
+        cost_basis: Decimal = ZERO,
+        realized_pnl: Decimal = ZERO,
+    ) -> None:
+        """Add one trade's (or one batch's) figures to the running per-symbol totals."""
+        result = await self.db.execute(
+            update(RealizedPnl)
+            .where(RealizedPnl.user_id == user_id, RealizedPnl.symbol == symbol)
+            .values(
+                quantity_sold=RealizedPnl.quantity_sold + quantity_sold,
+                sell_value=RealizedPnl.sell_value + sell_value,
+                cost_basis=RealizedPnl.cost_basis + cost_basis,
+                fees_paid=RealizedPnl.fees_paid + fees,
+                realized_pnl=RealizedPnl.realized_pnl + realized_pnl,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            return
+
+        await self.db.execute(
+            insert(RealizedPnl).values(
+                user_id=user_id,
+                symbol=symbol,
+                quantity_sold=quantity_sold,
+                sell_value=sell_value,
+                cost_basis=cost_basis,
+                fees_paid=fees,
+                realized_pnl=realized_pnl,
+            )
+        )
+
+    async def get_user_realized(self, user_id: int) -> List[RealizedPnl]:
+        result = await self.db.execute(
+            select(RealizedPnl).where(RealizedPnl.user_id == user_id).order_by(RealizedPnl.symbol)
+        )
+        return list(result.scalars().all())
+
+    async def get_user_totals(self, user_id: int) -> Dict[str, Decimal]:
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(RealizedPnl.realized_pnl), 0),
+                func.coalesce(func.sum(RealizedPnl.fees_paid), 0),
+            ).where(RealizedPnl.user_id == user_id)
+        )
+        realized_pnl, fees_paid = result.one()
+        return {
+            "realized_pnl": Decimal(str(realized_pnl)).quantize(CENT),
+            "fees_paid": Decimal(str(fees_paid)).quantize(CENT),
+        }
@@ -1,6 +1,7 @@
-from typing import List
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, update
 
 from app.models.portfolio import Portfolio
 
@@ -20,5 +21,62 @@ class PortfolioRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_portfolio_items_for_update(self, user_id: int, symbols: Iterable[str]) -> Dict[str, Portfolio]:
+        result = await self.db.execute(
+            select(Portfolio).where(Portfolio.user_id == user_id, Portfolio.symbol.in_(list(symbols))).with_for_update()
+        )
+        return {p.symbol: p for p in result.scalars().all()}
+
     def create(self, portfolio: Portfolio):
         self.db.add(portfolio)
+
+    async def add_to_position(self, user_id: int, symbol: str, quantity: int, price: Decimal) -> Tuple[int, Decimal]:
+        """Grow a position (re-averaging the buy price) with a single UPDATE ... RETURNING.
+
+        Inserts the position when the user doesn't hold the symbol yet.
+        Returns the new ``(quantity, average_buy_price)``.
+        """
+        result = await self.db.execute(
+            update(Portfolio)
+            .where(Portfolio.user_id == user_id, Portfolio.symbol == symbol)
+            .values(
+                quantity=Portfolio.quantity + quantity,
+                average_buy_price=(
+                    Portfolio.quantity * Portfolio.average_buy_price + price * quantity
+                ) / (Portfolio.quantity + quantity),
+            )
+            .returning(Portfolio.quantity, Portfolio.average_buy_price)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is not None:
+            return row.quantity, row.average_buy_price
+
+        await self.db.execute(
+            insert(Portfolio).values(user_id=user_id, symbol=symbol, quantity=quantity, average_buy_price=price)
+        )
+        return quantity, price
+
+    async def remove_from_position(self, user_id: int, symbol: str, quantity: int) -> Optional[Tuple[int, Decimal]]:
+        """Shrink a position with a single conditional UPDATE ... RETURNING.
+
+        Returns the remaining ``(quantity, average_buy_price)``, or None when the
+        user holds fewer shares than requested. Emptied positions are deleted.
+        """
+        result = await self.db.execute(
+            update(Portfolio)
+            .where(Portfolio.user_id == user_id, Portfolio.symbol == symbol, Portfolio.quantity >= quantity)
+            .values(quantity=Portfolio.quantity - quantity)
+            .returning(Portfolio.quantity, Portfolio.average_buy_price)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        if row.quantity == 0:
+            await self.db.execute(
+                delete(Portfolio)
+                .where(Portfolio.user_id == user_id, Portfolio.symbol == symbol, Portfolio.quantity == 0)
+                .execution_options(synchronize_session=False)
+            )
+        return row.quantity, row.average_buy_price
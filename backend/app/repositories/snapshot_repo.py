@@ -0,0 +1,55 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, insert, select
+
+from app.models.portfolio import Portfolio
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.models.wallet import Wallet
+
+class SnapshotRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_all_holdings(self) -> List[Tuple[int, Decimal, Optional[str], Optional[int], Optional[Decimal]]]:
+        """Every wallet joined with its open positions, in one query.
+
+        Rows are ``(user_id, cash, symbol, quantity, average_buy_price)``; users
+        without positions appear once with ``None`` position columns.
+        """
+        result = await self.db.execute(
+            select(Wallet.user_id, Wallet.balance, Portfolio.symbol, Portfolio.quantity, Portfolio.average_buy_price)
+            .outerjoin(Portfolio, (Portfolio.user_id == Wallet.user_id) & (Portfolio.quantity > 0))
+            .order_by(Wallet.user_id)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_previous(self, before: date) -> Tuple[Optional[datetime], Dict[int, Decimal]]:
+        """The most recent snapshot run before ``before``: its time and each user's cash."""
+        prev_date = (await self.db.execute(
+            select(func.max(PortfolioSnapshot.date)).where(PortfolioSnapshot.date < before)
+        )).scalar_one_or_none()
+        if prev_date is None:
+            return None, {}
+        result = await self.db.execute(
+            select(PortfolioSnapshot.user_id, PortfolioSnapshot.cash, PortfolioSnapshot.taken_at)
+            .where(PortfolioSnapshot.date == prev_date)
+        )
+        rows = result.all()
+        taken_at = max((r.taken_at for r in rows), default=None)
+        return taken_at, {r.user_id: r.cash for r in rows}
+
+    async def replace_day(self, day: date, rows: List[Dict[str, Any]]) -> None:
+        """Write one day's snapshots, replacing any earlier run for the same day."""
+        await self.db.execute(delete(PortfolioSnapshot).where(PortfolioSnapshot.date == day))
+        if rows:
+            await self.db.execute(insert(PortfolioSnapshot), rows)
+
+    async def get_range(self, user_id: int, start: date, end: date) -> List[PortfolioSnapshot]:
+        result = await self.db.execute(
+            select(PortfolioSnapshot)
+            .where(PortfolioSnapshot.user_id == user_id, PortfolioSnapshot.date.between(start, end))
+            .order_by(PortfolioSnapshot.date)
+        )
+        return list(result.scalars().all())
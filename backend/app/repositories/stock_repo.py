@@ -1,4 +1,6 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -17,6 +19,25 @@ class StockRepository:
         result = await self.db.execute(select(Stock).limit(limit))
         return list(result.scalars().all())
 
+    async def get_symbols(self) -> List[str]:
+        result = await self.db.execute(select(Stock.symbol))
+        return list(result.scalars().all())
+
+    async def upsert_stocks(self, companies: Iterable) -> None:
+        """Insert listed companies, refreshing the name and sector of known ones."""
+        rows = [{"symbol": c.symbol, "company_name": c.name, "sector": c.sector} for c in companies]
+        if not rows:
+            return
+        insert = pg_insert if self.db.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(Stock)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Stock.symbol],
+                set_={"company_name": stmt.excluded.company_name, "sector": stmt.excluded.sector},
+            ),
+            rows,
+        )
+
     async def get_historical_prices(self, symbol: str, limit: int = 30) -> List[HistoricalPrice]:
         result = await self.db.execute(
             select(HistoricalPrice)
@@ -1,6 +1,8 @@
-from typing import List
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, case, func, insert, select
 
 from app.models.transaction import Transaction
 
@@ -11,6 +13,25 @@ class TradeRepository:
     def record_transaction(self, transaction: Transaction):
         self.db.add(transaction)
 
+    async def append_transactions(self, rows: List[Dict[str, Any]]) -> List[Row]:
+        """Append trades to the transactions journal with one bulk INSERT ... RETURNING.
+
+        Returned rows carry the generated ids and timestamps, so callers never
+        need a follow-up refresh SELECT.
+        """
+        result = await self.db.execute(
+            insert(Transaction)
+            .returning(
+                Transaction.id, Transaction.user_id, Transaction.symbol,
+                Transaction.transaction_type, Transaction.quantity,
+                Transaction.price, Transaction.fees,
+                Transaction.realized_pnl, Transaction.timestamp,
+                sort_by_parameter_order=True,
+            ),
+            rows,
+        )
+        return list(result.all())
+
     async def get_user_transactions(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Transaction]:
         result = await self.db.execute(
             select(Transaction)
@@ -20,3 +41,17 @@ class TradeRepository:
             .limit(limit)
         )
         return list(result.scalars().all())
+
+    async def get_net_trade_spend(self, since: datetime, until: datetime) -> Dict[int, Decimal]:
+        """Cash each user spent on trades in ``(since, until]``: buy cost minus sell proceeds, fees included."""
+        gross = Transaction.price * Transaction.quantity
+        spend = case(
+            (Transaction.transaction_type == "BUY", gross + Transaction.fees),
+            else_=-(gross - Transaction.fees),
+        )
+        result = await self.db.execute(
+            select(Transaction.user_id, func.sum(spend))
+            .where(Transaction.timestamp > since, Transaction.timestamp <= until)
+            .group_by(Transaction.user_id)
+        )
+        return {user_id: Decimal(str(total)).quantize(Decimal("0.01")) for user_id, total in result.all()}
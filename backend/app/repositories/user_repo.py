@@ -1,6 +1,7 @@
-from typing import Optional
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.models.user import User
 from app.models.wallet import Wallet
@@ -30,6 +31,12 @@ class UserRepository:
         await self.db.refresh(db_user)
         return db_user
 
+    async def get_emails(self, user_ids: Iterable[int]) -> Dict[int, str]:
+        result = await self.db.execute(
+            select(User.id, User.email).where(User.id.in_(list(user_ids)), User.is_active.is_(True))
+        )
+        return {user_id: email for user_id, email in result.all()}
+
     async def get_wallet(self, user_id: int) -> Optional[Wallet]:
         result = await self.db.execute(select(Wallet).where(Wallet.user_id == user_id))
         return result.scalar_one_or_none()
@@ -37,3 +44,28 @@ class UserRepository:
     async def get_wallet_for_update(self, user_id: int) -> Optional[Wallet]:
         result = await self.db.execute(select(Wallet).where(Wallet.user_id == user_id).with_for_update())
         return result.scalar_one_or_none()
+
+    async def debit_wallet(self, user_id: int, amount: Decimal) -> Optional[Decimal]:
+        """Atomically subtract ``amount`` if the balance covers it.
+
+        Returns the new balance, or None when the wallet is missing or short.
+        """
+        result = await self.db.execute(
+            update(Wallet)
+            .where(Wallet.user_id == user_id, Wallet.balance >= amount)
+            .values(balance=Wallet.balance - amount)
+            .returning(Wallet.balance)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
+
+    async def credit_wallet(self, user_id: int, amount: Decimal) -> Optional[Decimal]:
+        """Atomically add ``amount``. Returns the new balance, or None if there is no wallet."""
+        result = await self.db.execute(
+            update(Wallet)
+            .where(Wallet.user_id == user_id)
+            .values(balance=Wallet.balance + amount)
+            .returning(Wallet.balance)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
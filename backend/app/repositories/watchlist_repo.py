@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from typing import List, Optional
+from sqlalchemy import delete, select, and_, or_
+from typing import Iterable, List, Optional
 
 from app.models.watchlist import Watchlist
 from app.schemas.watchlist_schema import WatchlistItemCreate, WatchlistItemUpdate
@@ -15,6 +15,13 @@ class WatchlistRepository:
         )
         return list(result.scalars().all())
 
+    async def get_active_alerts(self) -> List[Watchlist]:
+        """Every watchlist row with a target price or stop loss set."""
+        result = await self.db.execute(
+            select(Watchlist).where(or_(Watchlist.target_price.is_not(None), Watchlist.stop_loss.is_not(None)))
+        )
+        return list(result.scalars().all())
+
     async def get_watchlist_item(self, user_id: int, symbol: str) -> Optional[Watchlist]:
         result = await self.db.execute(
             select(Watchlist).where(
@@ -23,37 +30,65 @@ class WatchlistRepository:
         )
         return result.scalar_one_or_none()
 
-    async def add_item(self, user_id: int, item: WatchlistItemCreate) -> Watchlist:
-        db_item = Watchlist(
-            user_id=user_id,
-            symbol=item.symbol.upper(),
-            target_price=item.target_price,
-            stop_loss=item.stop_loss
+    async def upsert_items(self, user_id: int, items: List[WatchlistItemCreate]) -> List[Watchlist]:
+        """Add new symbols and update thresholds of existing ones, in a single commit.
+
+        Thresholds left as None keep their current value on existing rows.
+        """
+        symbols = [item.symbol.upper() for item in items]
+        result = await self.db.execute(
+            select(Watchlist).where(Watchlist.user_id == user_id, Watchlist.symbol.in_(symbols))
         )
-        self.db.add(db_item)
+        existing = {w.symbol: w for w in result.scalars().all()}
+
+        saved: List[Watchlist] = []
+        for symbol, item in zip(symbols, items):
+            db_item = existing.get(symbol)
+            if db_item is None:
+                db_item = Watchlist(
+                    user_id=user_id,
+                    symbol=symbol,
+                    target_price=item.target_price,
+                    stop_loss=item.stop_loss
+                )
+                self.db.add(db_item)
+                existing[symbol] = db_item
+            else:
+                self._apply_update(db_item, item)
+            saved.append(db_item)
+
         await self.db.commit()
-        await self.db.refresh(db_item)
+        return saved
+
+    async def add_item(self, user_id: int, item: WatchlistItemCreate) -> Watchlist:
+        [db_item] = await self.upsert_items(user_id, [item])
         return db_item
 
     async def update_item(self, user_id: int, symbol: str, data: WatchlistItemUpdate) -> Optional[Watchlist]:
         db_item = await self.get_watchlist_item(user_id, symbol)
         if not db_item:
             return None
-        
+
+        self._apply_update(db_item, data)
+        await self.db.commit()
+        return db_item
+
+    @staticmethod
+    def _apply_update(db_item: Watchlist, data: WatchlistItemUpdate | WatchlistItemCreate) -> None:
         if data.target_price is not None:
             db_item.target_price = data.target_price
         if data.stop_loss is not None:
             db_item.stop_loss = data.stop_loss
-            
-        await self.db.commit()
-        await self.db.refresh(db_item)
-        return db_item
 
     async def remove_item(self, user_id: int, symbol: str) -> bool:
-        db_item = await self.get_watchlist_item(user_id, symbol)
-        if not db_item:
-            return False
-            
-        await self.db.delete(db_item)
+        return await self.remove_items(user_id, [symbol]) > 0
+
+    async def remove_items(self, user_id: int, symbols: Iterable[str]) -> int:
+        """Delete several symbols with one statement. Returns how many rows were removed."""
+        result = await self.db.execute(
+            delete(Watchlist)
+            .where(Watchlist.user_id == user_id, Watchlist.symbol.in_(list(symbols)))
+            .execution_options(synchronize_session=False)
+        )
         await self.db.commit()
-        return True
+        return result.rowcount
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from decimal import Decimal
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    name: str # opaque public handle
+    nav: Decimal
+    return_pct: float
+
+class LeaderboardRank(BaseModel):
+    rank: int
+    user_id: int
+    name: str # own handle, to find yourself on the public board
+    nav: Decimal
+    return_pct: float
+    total_users: int
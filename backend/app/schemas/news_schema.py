@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class NewsArticleResponse(BaseModel):
+    id: int
+    title: str
+    category: str
+    source: str
+    url: Optional[str] = None
+    content: Optional[str] = None
+    published_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class NewsSearchResponse(BaseModel):
+    items: List[NewsArticleResponse]
+    next_before: Optional[int] = None # pass as ?before= for the next page
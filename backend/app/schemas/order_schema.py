@@ -0,0 +1,26 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+from decimal import Decimal
+from datetime import datetime
+
+class OrderRequest(BaseModel):
+    symbol: str
+    side: Literal["BUY", "SELL"]
+    order_type: Literal["LIMIT", "STOP"]
+    quantity: int
+    price: Decimal
+
+class OrderResponse(BaseModel):
+    id: int
+    symbol: str
+    side: str
+    order_type: str
+    quantity: int
+    price: Decimal
+    status: str
+    status_reason: Optional[str] = None
+    filled_price: Optional[Decimal] = None
+    created_at: datetime
+    filled_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
@@ -1,6 +1,7 @@
+from typing import List, Optional
 from pydantic import BaseModel
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
 
 class PortfolioResponse(BaseModel):
     symbol: str
@@ -9,3 +10,38 @@ class PortfolioResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+class RealizedPnlItem(BaseModel):
+    symbol: str
+    quantity_sold: int
+    sell_value: Decimal
+    cost_basis: Decimal
+    fees_paid: Decimal
+    realized_pnl: Decimal
+
+    model_config = {"from_attributes": True}
+
+class RealizedPnlSummary(BaseModel):
+    total_realized_pnl: Decimal
+    total_fees_paid: Decimal
+    total_sell_value: Decimal
+    total_cost_basis: Decimal
+
+class RealizedPnlResponse(BaseModel):
+    symbols: List[RealizedPnlItem]
+    summary: RealizedPnlSummary
+
+class PerformancePoint(BaseModel):
+    date: date
+    nav: Decimal
+    cash: Decimal
+    holdings_value: Decimal
+    net_flow: Decimal
+    twr: float # cumulative time-weighted return, %
+
+class PerformanceResponse(BaseModel):
+    start: date
+    end: date
+    twr: Optional[float] # %, None with fewer than two snapshots
+    mwr: Optional[float] # %, Modified Dietz
+    series: List[PerformancePoint]
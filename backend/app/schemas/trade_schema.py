@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
 from decimal import Decimal
 from datetime import datetime
 
@@ -6,12 +7,22 @@ class TradeRequest(BaseModel):
     symbol: str
     quantity: int
 
+class BatchOrderItem(BaseModel):
+    symbol: str
+    side: Literal["BUY", "SELL"]
+    quantity: int
+
+class BatchTradeRequest(BaseModel):
+    orders: List[BatchOrderItem] = Field(..., min_length=1, max_length=50)
+
 class TransactionResponse(BaseModel):
     id: int
     symbol: str
     transaction_type: str
     quantity: int
     price: Decimal
+    fees: Decimal = Decimal("0")
+    realized_pnl: Optional[Decimal] = None
     timestamp: datetime
 
     model_config = {"from_attributes": True}
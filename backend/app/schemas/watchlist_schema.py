@@ -22,6 +22,12 @@ class WatchlistItemResponse(WatchlistItemBase):
     class Config:
         from_attributes = True
 
+class WatchlistBulkCreate(BaseModel):
+    items: List[WatchlistItemCreate] = Field(..., min_length=1, max_length=50)
+
+class WatchlistBulkRemove(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, max_length=50)
+
 class WatchlistResponse(BaseModel):
     items: List[WatchlistItemResponse]
     
@@ -0,0 +1,131 @@
+"""
+In-memory index of watchlist price alerts, evaluated against every live tick.
+
+Each symbol keeps two sorted lists of ``(threshold, user_id)``:
+
+- ``above``: ``target_price`` alerts, fire when the price rises through them
+- ``below``: ``stop_loss`` alerts, fire when the price falls through them
+
+A tick only bisects the slice between the previous and the new price, so the
+cost per tick is proportional to the number of crossed thresholds rather than
+to the number of watchlist rows. An alert fires once and is disarmed until
+the user saves the watchlist item again.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+_INF = float("inf")
+
+
+@dataclass(frozen=True)
+class PriceAlert:
+    user_id: int
+    symbol: str
+    kind: str  # 'TARGET' or 'STOP_LOSS'
+    threshold: float
+    price: float
+
+    @property
+    def message(self) -> str:
+        if self.kind == "TARGET":
+            return f"{self.symbol} rose to Rs. {self.price:,.2f}, reaching your target of Rs. {self.threshold:,.2f}"
+        return f"{self.symbol} fell to Rs. {self.price:,.2f}, hitting your stop loss of Rs. {self.threshold:,.2f}"
+
+
+class _SymbolAlerts:
+    __slots__ = ("above", "below")
+
+    def __init__(self):
+        self.above: SortedList = SortedList()
+        self.below: SortedList = SortedList()
+
+
+class AlertEngine:
+    def __init__(self):
+        self._books: Dict[str, _SymbolAlerts] = {}
+        self._armed: Dict[Tuple[int, str], Tuple[Optional[float], Optional[float]]] = {}
+        self._last_price: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return sum(len(b.above) + len(b.below) for b in self._books.values())
+
+    def set(self, user_id: int, symbol: str, target_price: Optional[float], stop_loss: Optional[float]) -> None:
+        """Arm (or re-arm) the alerts of one watchlist item, replacing earlier thresholds."""
+        self.remove(user_id, symbol)
+        if not target_price and not stop_loss:
+            return
+        book = self._books.setdefault(symbol, _SymbolAlerts())
+        if target_price:
+            book.above.add((target_price, user_id))
+        if stop_loss:
+            book.below.add((stop_loss, user_id))
+        self._armed[(user_id, symbol)] = (target_price or None, stop_loss or None)
+
+    def remove(self, user_id: int, symbol: str) -> None:
+        target_price, stop_loss = self._armed.pop((user_id, symbol), (None, None))
+        book = self._books.get(symbol)
+        if not book:
+            return
+        if target_price:
+            book.above.discard((target_price, user_id))
+        if stop_loss:
+            book.below.discard((stop_loss, user_id))
+        if not book.above and not book.below:
+            del self._books[symbol]
+
+    def clear(self) -> None:
+        self._books.clear()
+        self._armed.clear()
+        self._last_price.clear()
+
+    def evaluate(self, prices: Mapping[str, float]) -> List[PriceAlert]:
+        """Fire and disarm every alert crossed between the previous and these prices.
+
+        The first price seen for a symbol only sets the baseline.
+        """
+        fired: List[PriceAlert] = []
+        for symbol, price in prices.items():
+            if not price or price <= 0:
+                continue
+            last = self._last_price.get(symbol)
+            self._last_price[symbol] = price
+            book = self._books.get(symbol)
+            if last is None or book is None or price == last:
+                continue
+
+            if price > last:
+                # last < threshold <= price
+                lo = book.above.bisect_right((last, _INF))
+                hi = book.above.bisect_right((price, _INF))
+                crossed = [(t, uid, "TARGET") for t, uid in book.above[lo:hi]]
+            else:
+                # price <= threshold < last
+                lo = book.below.bisect_left((price, -_INF))
+                hi = book.below.bisect_left((last, -_INF))
+                crossed = [(t, uid, "STOP_LOSS") for t, uid in book.below[lo:hi]]
+
+            for threshold, user_id, kind in crossed:
+                fired.append(PriceAlert(user_id, symbol, kind, threshold, price))
+                self._disarm(user_id, symbol, kind)
+            if not book.above and not book.below:
+                del self._books[symbol]
+        return fired
+
+    def _disarm(self, user_id: int, symbol: str, kind: str) -> None:
+        target_price, stop_loss = self._armed.get((user_id, symbol), (None, None))
+        if kind == "TARGET":
+            self._books[symbol].above.discard((target_price, user_id))
+            target_price = None
+        else:
+            self._books[symbol].below.discard((stop_loss, user_id))
+            stop_loss = None
+        if target_price or stop_loss:
+            self._armed[(user_id, symbol)] = (target_price, stop_loss)
+        else:
+            self._armed.pop((user_id, symbol), None)
+
+
+alert_engine = AlertEngine()
@@ -0,0 +1,142 @@
+"""
+NEPSE fee engine.
+
+The tiered brokerage schedule is turned into lower tier bounds plus the
+cumulative commission already owed at each bound, so a fee lookup is one
+bisect and one multiply instead of a walk over the tiers. The batch API
+does the same over NumPy arrays in integer paisa, which keeps it exact
+and rounds exactly like the Decimal path (half up to the paisa).
+"""
+
+from bisect import bisect_right
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+# ─── NEPSE Brokerage Fee Schedule ───────────────────────────
+# Based on SEBON's tiered commission structure for stock trading.
+# These are approximate and for paper trading educational purposes.
+BROKERAGE_TIERS = [
+    (50_000, Decimal("0.36")),        # up to 50k: 0.36%
+    (500_000, Decimal("0.33")),       # 50k-500k: 0.33%
+    (2_000_000, Decimal("0.31")),     # 500k-2M: 0.31%
+    (10_000_000, Decimal("0.27")),    # 2M-10M: 0.27%
+    (float("inf"), Decimal("0.24")),  # 10M+: 0.24%
+]
+SEBON_FEE_RATE = Decimal("0.015")      # 0.015% SEBON regulation fee
+DP_CHARGE = Decimal("25.00")            # Rs 25 per transaction (DP charge)
+
+_PAISA = Decimal("0.01")
+_HUNDRED = Decimal("100")
+
+
+class FeeBatch(NamedTuple):
+    """Vectorized fees, as int64 arrays in paisa (1/100 rupee)."""
+    brokerage: np.ndarray
+    sebon_fee: np.ndarray
+    dp_charge: np.ndarray
+    total_fees: np.ndarray
+
+    def as_dicts(self) -> List[Dict[str, Decimal]]:
+        """Convert back to the per-trade ``calculate_total_fees`` shape."""
+        return [
+            {
+                "brokerage": Decimal(int(b)).scaleb(-2),
+                "sebon_fee": Decimal(int(s)).scaleb(-2),
+                "dp_charge": Decimal(int(d)).scaleb(-2),
+                "total_fees": Decimal(int(t)).scaleb(-2),
+            }
+            for b, s, d, t in zip(self.brokerage, self.sebon_fee, self.dp_charge, self.total_fees)
+        ]
+
+
+def _integer_rate(rate_pct: Decimal) -> Tuple[int, int]:
+    """Express a percentage rate as ``numerator / denominator`` applied to paisa."""
+    places = max(0, -rate_pct.as_tuple().exponent) + 2  # +2: percent → fraction
+    return int(rate_pct.scaleb(places - 2)), 10 ** places
+
+
+class FeeSchedule:
+    def __init__(self, tiers: Sequence[Tuple[float, Decimal]], sebon_rate: Decimal, dp_charge: Decimal):
+        self.sebon_rate = sebon_rate / _HUNDRED
+        self.dp_charge = dp_charge
+
+        # Lower bound of every tier and the commission already owed when reaching it
+        self._bounds: List[Decimal] = []
+        self._rates: List[Decimal] = []
+        self._base: List[Decimal] = []
+        lower = Decimal("0")
+        owed = Decimal("0")
+        for limit, rate_pct in tiers:
+            rate = rate_pct / _HUNDRED
+            self._bounds.append(lower)
+            self._rates.append(rate)
+            self._base.append(owed)
+            if limit == float("inf"):
+                break
+            upper = Decimal(str(limit))
+            owed += (upper - lower) * rate
+            lower = upper
+
+        # Same schedule in integer paisa for the vectorized path. Commission is
+        # kept scaled by a common denominator so partial paisa are exact until
+        # the final rounding.
+        rates = [_integer_rate(rate_pct) for _, rate_pct in tiers[:len(self._bounds)]]
+        self._denominator = max(den for _, den in rates)
+        self._bounds_paisa = np.array([int(b * 100) for b in self._bounds], dtype=np.int64)
+        self._rates_scaled = np.array(
+            [num * (self._denominator // den) for num, den in rates], dtype=np.int64
+        )
+        base_scaled = [0]
+        for i in range(1, len(self._bounds)):
+            width = int((self._bounds[i] - self._bounds[i - 1]) * 100)
+            base_scaled.append(base_scaled[-1] + width * int(self._rates_scaled[i - 1]))
+        self._base_scaled = np.array(base_scaled, dtype=np.int64)
+        self._sebon_num, self._sebon_den = _integer_rate(sebon_rate)
+        self._dp_paisa = int(dp_charge * 100)
+
+    # ─── Per-trade ──────────────────────────────────────────
+    def brokerage(self, trade_amount: Decimal) -> Decimal:
+        """Tiered NEPSE brokerage commission."""
+        if trade_amount <= 0:
+            return Decimal("0").quantize(_PAISA)
+        i = bisect_right(self._bounds, trade_amount) - 1
+        commission = self._base[i] + (trade_amount - self._bounds[i]) * self._rates[i]
+        return commission.quantize(_PAISA, rounding=ROUND_HALF_UP)
+
+    def sebon_fee(self, trade_amount: Decimal) -> Decimal:
+        return (trade_amount * self.sebon_rate).quantize(_PAISA, rounding=ROUND_HALF_UP)
+
+    def total_fees(self, trade_amount: Decimal) -> Dict[str, Decimal]:
+        brokerage = self.brokerage(trade_amount)
+        sebon_fee = self.sebon_fee(trade_amount)
+        return {
+            "brokerage": brokerage,
+            "sebon_fee": sebon_fee,
+            "dp_charge": self.dp_charge,
+            "total_fees": brokerage + sebon_fee + self.dp_charge,
+        }
+
+    # ─── Vectorized ─────────────────────────────────────────
+    def total_fees_batch(self, trade_amounts: Sequence) -> FeeBatch:
+        """Fees for many trade amounts (in rupees, rounded to the paisa) at once."""
+        amounts = np.rint(np.asarray(trade_amounts, dtype=np.float64) * 100).astype(np.int64)
+        amounts = np.maximum(amounts, 0)
+
+        tier = np.searchsorted(self._bounds_paisa, amounts, side="right") - 1
+        tier = np.maximum(tier, 0)
+        scaled = self._base_scaled[tier] + (amounts - self._bounds_paisa[tier]) * self._rates_scaled[tier]
+        # Round half up to the paisa (all values are non-negative)
+        brokerage = (scaled + self._denominator // 2) // self._denominator
+        sebon_fee = (amounts * self._sebon_num + self._sebon_den // 2) // self._sebon_den
+        dp_charge = np.full_like(amounts, self._dp_paisa)
+        return FeeBatch(brokerage, sebon_fee, dp_charge, brokerage + sebon_fee + dp_charge)
+
+
+fee_schedule = FeeSchedule(BROKERAGE_TIERS, SEBON_FEE_RATE, DP_CHARGE)
+
+
+def calculate_total_fees_batch(trade_amounts: Sequence) -> List[Dict[str, Decimal]]:
+    """Per-trade fee dicts for many amounts, computed in one vectorized pass."""
+    return fee_schedule.total_fees_batch(trade_amounts).as_dicts()
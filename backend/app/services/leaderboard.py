@@ -0,0 +1,136 @@
+"""
+Leaderboard of every paper-trading account, ranked by total return.
+
+Positions are held as a users × symbols sparse matrix, so valuing every
+account against a tick is one sparse matrix-vector product. Symbols missing
+from the tick are valued at each position's average buy price through a
+second (cost) matrix. Ranks live in a Redis sorted set, which answers top-N
+and rank-of-user queries in O(log n).
+"""
+
+import hashlib
+import hmac
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.cache.redis_client import get_redis
+from app.config import settings
+from app.models.wallet import STARTING_BALANCE
+
+RANK_KEY = "leaderboard:return"
+NAV_KEY = "leaderboard:nav"
+
+
+class LeaderboardBook:
+    def __init__(self, starting_balance: float = STARTING_BALANCE):
+        self.starting_balance = float(starting_balance)
+        self.user_ids = np.zeros(0, dtype=np.int64)
+        self.loaded_at = 0.0
+        self._symbols: Dict[str, int] = {}
+        self._cash = np.zeros(0)
+        self._quantity = sparse.csr_matrix((0, 0))
+        self._cost = sparse.csr_matrix((0, 0))
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def load(self, holdings: Sequence[Tuple[int, Decimal, Optional[str], Optional[int], Optional[Decimal]]]) -> None:
+        """Rebuild the matrices from ``(user_id, cash, symbol, quantity, average_buy_price)`` rows."""
+        users: Dict[int, int] = {}
+        symbols: Dict[str, int] = {}
+        cash: List[float] = []
+        rows: List[int] = []
+        cols: List[int] = []
+        quantities: List[float] = []
+        costs: List[float] = []
+        for user_id, balance, symbol, quantity, average_buy_price in holdings:
+            if user_id not in users:
+                users[user_id] = len(users)
+                cash.append(float(balance))
+            if symbol is None or not quantity:
+                continue
+            rows.append(users[user_id])
+            cols.append(symbols.setdefault(symbol, len(symbols)))
+            quantities.append(quantity)
+            costs.append(quantity * float(average_buy_price))
+
+        shape = (len(users), len(symbols))
+        self.user_ids = np.fromiter(users, dtype=np.int64, count=len(users))
+        self._symbols = symbols
+        self._cash = np.array(cash, dtype=np.float64)
+        self._quantity = sparse.csr_matrix((quantities, (rows, cols)), shape=shape)
+        self._cost = sparse.csr_matrix((costs, (rows, cols)), shape=shape)
+        self.loaded_at = time.monotonic()
+
+    def value(self, prices: Mapping[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Net asset value and total return (%) of every loaded account."""
+        price_vector = np.zeros(len(self._symbols))
+        for symbol, col in self._symbols.items():
+            price = prices.get(symbol)
+            if price and price > 0:
+                price_vector[col] = price
+        unpriced = (price_vector == 0).astype(np.float64)
+
+        nav = self._cash + self._quantity @ price_vector + self._cost @ unpriced
+        returns = (nav / self.starting_balance - 1.0) * 100
+        return nav, returns
+
+
+async def publish_ranks(user_ids: np.ndarray, nav: np.ndarray, returns: np.ndarray) -> None:
+    """Atomically replace the ranked set and NAV hash with a fresh valuation."""
+    redis = await get_redis()
+    scores = {str(uid): round(float(r), 4) for uid, r in zip(user_ids, returns)}
+    navs = {str(uid): f"{v:.2f}" for uid, v in zip(user_ids, nav)}
+    async with redis.pipeline(transaction=True) as pipe:
+        if scores:
+            pipe.delete(f"{RANK_KEY}:next", f"{NAV_KEY}:next")
+            pipe.zadd(f"{RANK_KEY}:next", scores)
+            pipe.hset(f"{NAV_KEY}:next", mapping=navs)
+            pipe.rename(f"{RANK_KEY}:next", RANK_KEY)
+            pipe.rename(f"{NAV_KEY}:next", NAV_KEY)
+        else:
+            pipe.delete(RANK_KEY, NAV_KEY)
+        await pipe.execute()
+
+
+def public_handle(user_id: int) -> str:
+    """Stable pseudonym for the public board.
+
+    Keyed with the server secret, so it reveals neither the account id nor
+    signup order, and can't be matched to the id elsewhere.
+    """
+    digest = hmac.new(settings.SECRET_KEY.encode(), f"leaderboard:{user_id}".encode(), hashlib.sha256)
+    return f"Trader-{digest.hexdigest()[:10]}"
+
+
+async def get_top(limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+    """``limit`` best accounts starting at ``offset``, best first."""
+    redis = await get_redis()
+    ranked = await redis.zrevrange(RANK_KEY, offset, offset + limit - 1, withscores=True)
+    if not ranked:
+        return []
+    navs = await redis.hmget(NAV_KEY, [member for member, _ in ranked])
+    return [
+        {"rank": offset + i + 1, "user_id": int(member), "return_pct": score, "nav": Decimal(nav or "0")}
+        for i, ((member, score), nav) in enumerate(zip(ranked, navs))
+    ]
+
+
+async def get_user_rank(user_id: int) -> Optional[Dict[str, Any]]:
+    redis = await get_redis()
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.zrevrank(RANK_KEY, str(user_id))
+        pipe.zscore(RANK_KEY, str(user_id))
+        pipe.hget(NAV_KEY, str(user_id))
+        pipe.zcard(RANK_KEY)
+        rank, score, nav, total = await pipe.execute()
+    if rank is None:
+        return None
+    return {"rank": rank + 1, "user_id": user_id, "return_pct": score, "nav": Decimal(nav or "0"), "total_users": total}
+
+
+leaderboard_book = LeaderboardBook()
@@ -1,4 +1,5 @@
 from typing import Dict, Any, Optional
+from app.ingestion import LiveTick
 from app.services.nepse_service import NepseService
 
 class MarketService:
@@ -14,6 +15,10 @@ class MarketService:
     async def get_live(cls) -> Dict[str, Any]:
         return await NepseService.get_live_market()
 
+    @classmethod
+    async def get_live_tick(cls) -> LiveTick:
+        return await NepseService.get_live_tick()
+
     @staticmethod
     async def get_stock_detail(symbol: str) -> Optional[Dict[str, Any]]:
         return await NepseService.get_stock_details(symbol)
@@ -0,0 +1,49 @@
+"""
+Latest live tick, looked up by symbol.
+
+Fed by the tick feed, so readers that only need a few symbols (watchlists)
+look them up directly instead of decoding and scanning the whole cached
+live market on every request.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.ingestion import LiveTick, StockQuote
+from app.services.nepse_service import NepseService
+
+MAX_AGE = 15  # seconds — three missed ticks before a reader refreshes it itself
+
+
+class MarketSnapshot:
+    def __init__(self, max_age: float = MAX_AGE):
+        self.max_age = max_age
+        self.updated_at = 0.0
+        self._tick = LiveTick()
+
+    def __len__(self) -> int:
+        return len(self._tick)
+
+    async def update(self, tick: LiveTick):
+        if len(tick):
+            self._tick = tick
+            self.updated_at = time.monotonic()
+
+    async def refresh_if_stale(self):
+        """Fetch the live market when the tick feed hasn't updated the snapshot recently."""
+        if time.monotonic() - self.updated_at > self.max_age:
+            await self.update(await NepseService.get_live_tick())
+
+    def get(self, symbol: str) -> Optional[StockQuote]:
+        return self._tick.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return self._tick.symbols()
+
+    def prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """Last traded price per symbol; 0 for symbols not in the snapshot."""
+        prices = self._tick.prices()
+        return {s: float(prices.get(s, 0)) for s in symbols}
+
+
+market_snapshot = MarketSnapshot()
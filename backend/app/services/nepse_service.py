@@ -6,8 +6,11 @@ from datetime import datetime
 import hashlib
 from nepse import AsyncNepse
 
+from app.ingestion import (
+    LiveTick, RedisCacheSink, fetch_live_quotes, fetch_market, get_nepse, market_summary_payload, parse_float,
+)
 from app.cache.cache_service import (
-    get_cached_market_summary, set_cached_market_summary,
+    get_cached_market_summary,
     get_cached_live_market, set_cached_live_market, get_backup_live_market,
     get_cached_companies, set_cached_companies,
     get_cached_fundamentals, set_cached_fundamentals
@@ -15,21 +18,14 @@ from app.cache.cache_service import (
 from app.utils.logger import logger
 
 class NepseService:
-    _nepse: Optional[AsyncNepse] = None
+    parse_float = staticmethod(parse_float)
+    # The last decoded live tick and the cached JSON it came from
+    _tick_source: Optional[str] = None
+    _tick: Optional[LiveTick] = None
 
     @classmethod
     def get_nepse(cls) -> AsyncNepse:
-        if cls._nepse is None:
-            cls._nepse = AsyncNepse()
-            cls._nepse.setTLSVerification(False)
-        return cls._nepse
-
-    @staticmethod
-    def parse_float(val: str) -> float:
-        try:
-            return float(val.replace(",", "").replace("Rs", "").strip())
-        except:
-            return 0.0
+        return get_nepse()
 
     @classmethod
     async def get_market_summary(cls) -> Dict[str, Any]:
@@ -38,71 +34,11 @@ class NepseService:
         if cached:
             return cached
 
-        n = cls.get_nepse()
         try:
-            summary_raw, indices_raw, subindices_raw, gainers_raw, losers_raw, turnovers_raw, is_open = await asyncio.gather(
-                n.getSummary(),
-                n.getNepseIndex(),
-                n.getNepseSubIndices(),
-                n.getTopGainers(),
-                n.getTopLosers(),
-                n.getTopTenTurnoverScrips(),
-                n.isNepseOpen()
-            )
-
-            summary_dict = {item["detail"]: item["value"] for item in summary_raw}
-            
-            nepse_index_data = next((item for item in indices_raw if item["index"] == "NEPSE Index"), None)
-            nepse_index_val = nepse_index_data["currentValue"] if nepse_index_data else 0.0
-
-            subIndices = []
-            for item in subindices_raw:
-                subIndices.append({
-                    "sector": item.get("index", "").replace(" SubIndex", "").replace(" Index", ""),
-                    "value": float(item.get("currentValue", 0)),
-                    "change": float(item.get("change", 0))
-                })
-
-            topGainers = []
-            for item in gainers_raw:
-                topGainers.append({
-                    "symbol": item.get("symbol"),
-                    "ltp": float(item.get("ltp", 0)),
-                    "pointChange": float(item.get("pointChange", 0)),
-                    "percentageChange": float(item.get("percentageChange", 0))
-                })
-
-            topLosers = []
-            for item in losers_raw:
-                topLosers.append({
-                    "symbol": item.get("symbol"),
-                    "ltp": float(item.get("ltp", 0)),
-                    "pointChange": float(item.get("pointChange", 0)),
-                    "percentageChange": float(item.get("percentageChange", 0))
-                })
-
-            topTurnovers = []
-            for item in turnovers_raw:
-                topTurnovers.append({
-                    "symbol": item.get("symbol"),
-                    "turnover": float(item.get("turnover", 0))
-                })
-
-            result = {
-                "summary": {
-                    "nepseIndex": float(nepse_index_val),
-                    "totalTurnover": cls.parse_float(str(summary_dict.get("Total Turnover", "0"))),
-                    "totalTradedShares": cls.parse_float(str(summary_dict.get("Total Traded Shares", "0"))),
-                    "marketStatus": "Open" if is_open else "Closed"
-                },
-                "subIndices": subIndices,
-                "topGainers": topGainers,
-                "topLosers": topLosers,
-                "topTurnovers": topTurnovers,
-                "is_stale": False
-            }
-            await set_cached_market_summary(result)
-            return result
+            # The same round of calls has the live market; cache that too
+            data = await fetch_market(cls.get_nepse())
+            await RedisCacheSink().publish(data)
+            return market_summary_payload(data)
         except Exception as e:
             logger.error(f"Failed to fetch market summary from nepse_service: {e}")
             return {
@@ -111,32 +47,27 @@ class NepseService:
             }
 
     @classmethod
-    async def get_live_market(cls) -> Dict[str, Any]:
+    async def get_live_tick(cls) -> LiveTick:
+        """The current live tick. Every reader within one cache period shares one decoded tick."""
         # Check cache first
         cached = await get_cached_live_market()
         if cached:
-            return json.loads(cached)
+            if cached != cls._tick_source:
+                cls._tick_source, cls._tick = cached, LiveTick.from_json(cached)
+            return cls._tick
 
-        n = cls.get_nepse()
         try:
-            live_data = await n.getLiveMarket()
-            formatted_data = []
-            for stock in live_data:
-                ltp = float(stock.get("lastTradedPrice", 0))
-                prev = float(stock.get("previousClose", 0))
-                formatted_data.append({
-                    "symbol": stock.get("symbol"),
-                    "lastTradedPrice": ltp,
-                    "pointChange": round(ltp - prev, 2),
-                    "percentageChange": float(stock.get("percentageChange", 0)),
-                    "volume": int(stock.get("totalTradeQuantity", 0))
-                })
-            result = {"live_market": formatted_data, "is_stale": False}
-            await set_cached_live_market(result)
-            return result
+            tick = LiveTick(await fetch_live_quotes(cls.get_nepse()))
+            await set_cached_live_market(tick.to_compact())
+            return tick
         except Exception as e:
             logger.error(f"Failed to fetch live market: {e}")
-            return {"live_market": [], "is_stale": True}
+            return LiveTick(is_stale=True)
+
+    @classmethod
+    async def get_live_market(cls) -> Dict[str, Any]:
+        """The live market in its JSON wire format, for API responses and WebSocket pushes."""
+        return (await cls.get_live_tick()).to_payload()
 
     @classmethod
     async def get_stock_details(cls, symbol: str) -> Optional[Dict[str, Any]]:
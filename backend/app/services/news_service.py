@@ -1,134 +1,173 @@
-from typing import Dict, Any, List
+"""
+News scraping from ShareSansar and MeroLagani.
+
+All source pages are fetched concurrently (at most ``MAX_CONCURRENT_FETCHES``
+at a time), so a refresh takes as long as the slowest page instead of the sum
+of all of them. Each page is fetched with ``If-None-Match`` /
+``If-Modified-Since`` from the previous response, and a page whose body hashes
+the same as last time is not parsed again. Unchanged pages reuse their parsed
+items, including the time they were first seen.
+
+Scraping only runs in the background refresher
+(``app.background.news_refresher``), which stores the result in Redis; the
+request path reads from there and never scrapes.
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import logging
 import httpx
 from bs4 import BeautifulSoup
 
+from app.cache.cache_service import get_cached_news, get_cached_news_categories, get_news_refreshed_at
+
 logger = logging.getLogger(__name__)
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+MAX_CONCURRENT_FETCHES = 4
 
-class NewsService:
-    _cache: List[Dict[str, Any]] = []
-    _cache_time: datetime | None = None
-    _CACHE_TTL_SECONDS = 300  # 5 minutes
 
-    @classmethod
-    async def _scrape_news(cls) -> List[Dict[str, Any]]:
-        """Scrape real financial news from ShareSansar and MeroLagani."""
-        news_items: List[Dict[str, Any]] = []
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
+@dataclass(frozen=True)
+class NewsSource:
+    url: str
+    category: str
+    source: str
+    selector: str
+    base_url: str
+    min_title_length: int
 
-        async with httpx.AsyncClient(follow_redirects=True, timeout=15) as client:
-            # Source 1: ShareSansar
-            urls = [
-                ("https://www.sharesansar.com/news-page", "Market"),
-                ("https://www.sharesansar.com/category/company-analysis", "Analysis"),
-                ("https://www.sharesansar.com/category/mutual-fund", "Mutual Fund"),
-            ]
-            for url, category in urls:
-                try:
-                    resp = await client.get(url, headers=headers)
-                    if resp.status_code != 200:
-                        continue
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    articles = soup.select(".featured-news-list a, .media-heading a, h4 a, h3 a, h2 a")
-                    seen_titles = set()
-                    for a in articles:
-                        title = a.get_text(strip=True)
-                        href = a.get("href", "")
-                        if not title or len(title) < 15 or title in seen_titles:
-                            continue
-                        seen_titles.add(title)
-                        if href and not href.startswith("http"):
-                            href = f"https://www.sharesansar.com{href}"
-                        news_items.append({
-                            "id": len(news_items) + 1,
-                            "title": title[:500],
-                            "category": category,
-                            "source": "ShareSansar",
-                            "published_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                            "url": href or None,
-                            "content": title,
-                        })
-                except Exception as e:
-                    logger.warning(f"ShareSansar {category} scrape error: {e}")
-
-            # Source 2: MeroLagani
-            try:
-                resp = await client.get("https://merolagani.com/NewsList.aspx", headers=headers)
-                if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    existing_titles = {n["title"] for n in news_items}
-                    for a in soup.select("h4 a, .media-news a, .news-heading a"):
-                        title = a.get_text(strip=True)
-                        href = a.get("href", "")
-                        if title and len(title) > 10 and title not in existing_titles:
-                            if href and not href.startswith("http"):
-                                href = f"https://merolagani.com/{href.lstrip('/')}"
-                            news_items.append({
-                                "id": len(news_items) + 1,
-                                "title": title[:500],
-                                "category": "Market",
-                                "source": "MeroLagani",
-                                "published_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                                "url": href or None,
-                                "content": title,
-                            })
-                            existing_titles.add(title)
-            except Exception as e:
-                logger.warning(f"MeroLagani news scrape error: {e}")
 
-        return news_items
+NEWS_SOURCES = [
+    NewsSource("https://www.sharesansar.com/news-page", "Market", "ShareSansar",
+               ".featured-news-list a, .media-heading a, h4 a, h3 a, h2 a", "https://www.sharesansar.com", 15),
+    NewsSource("https://www.sharesansar.com/category/company-analysis", "Analysis", "ShareSansar",
+               ".featured-news-list a, .media-heading a, h4 a, h3 a, h2 a", "https://www.sharesansar.com", 15),
+    NewsSource("https://www.sharesansar.com/category/mutual-fund", "Mutual Fund", "ShareSansar",
+               ".featured-news-list a, .media-heading a, h4 a, h3 a, h2 a", "https://www.sharesansar.com", 15),
+    NewsSource("https://merolagani.com/NewsList.aspx", "Market", "MeroLagani",
+               "h4 a, .media-news a, .news-heading a", "https://merolagani.com", 11),
+]
 
-    @classmethod
-    async def _get_cached_news(cls) -> List[Dict[str, Any]]:
-        """Return cached news, refreshing if stale."""
-        now = datetime.now()
-        if cls._cache and cls._cache_time and (now - cls._cache_time).total_seconds() < cls._CACHE_TTL_SECONDS:
-            return cls._cache
 
+@dataclass
+class _PageState:
+    """What we know about a source page from its last successful fetch."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[bytes] = None
+    items: List[Dict[str, Any]] = field(default_factory=list)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def parse_news_page(html: bytes, source: NewsSource, seen_at: str) -> List[Dict[str, Any]]:
+    """Article links on one source page, without ids."""
+    soup = BeautifulSoup(html, "lxml")
+    items: List[Dict[str, Any]] = []
+    seen_titles = set()
+    for a in soup.select(source.selector):
+        title = a.get_text(strip=True)
+        href = a.get("href", "")
+        if not title or len(title) < source.min_title_length or title in seen_titles:
+            continue
+        seen_titles.add(title)
+        if href and not href.startswith("http"):
+            href = f"{source.base_url}/{href.lstrip('/')}"
+        items.append({
+            "title": title[:500],
+            "category": source.category,
+            "source": source.source,
+            "published_at": seen_at,
+            "url": href or None,
+            "content": title,
+        })
+    return items
+
+
+class NewsService:
+    _pages: Dict[str, _PageState] = {}
+
+    @classmethod
+    async def _fetch_source(
+        cls, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, source: NewsSource
+    ) -> List[Dict[str, Any]]:
+        state = cls._pages.setdefault(source.url, _PageState())
         try:
-            fresh = await cls._scrape_news()
-            if fresh:
-                cls._cache = fresh
-                cls._cache_time = now
-                return fresh
+            async with semaphore:
+                resp = await client.get(source.url, headers={**HEADERS, **state.conditional_headers()})
+            if resp.status_code == 304:
+                return state.items
+            if resp.status_code != 200:
+                return state.items
+
+            content_hash = hashlib.sha256(resp.content).digest()
+            if content_hash != state.content_hash:
+                seen_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+                state.items = await asyncio.to_thread(parse_news_page, resp.content, source, seen_at)
+                state.content_hash = content_hash
+            # Validators only describe a page we have parsed; if parsing fails the
+            # next request must fetch it in full rather than get a 304
+            state.etag = resp.headers.get("ETag")
+            state.last_modified = resp.headers.get("Last-Modified")
         except Exception as e:
-            logger.error(f"Failed to scrape news: {e}")
-
-        # Return stale cache if scrape failed
-        if cls._cache:
-            return cls._cache
-
-        # Final fallback: return empty with explanation
-        return [{
-            "id": 0,
-            "title": "News temporarily unavailable. Please try again later.",
-            "category": "System",
-            "source": "ShareSathi",
-            "published_at": now.strftime("%Y-%m-%d %H:%M"),
-            "url": None,
-            "content": "Unable to fetch live news at this time."
-        }]
+            logger.warning(f"{source.source} {source.category} scrape error: {e}")
+        return state.items
+
+    @classmethod
+    async def scrape_news(cls, client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
+        """Scrape real financial news from ShareSansar and MeroLagani."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        if client is None:
+            async with httpx.AsyncClient(follow_redirects=True, timeout=15) as own_client:
+                pages = await asyncio.gather(*(cls._fetch_source(own_client, semaphore, s) for s in NEWS_SOURCES))
+        else:
+            pages = await asyncio.gather(*(cls._fetch_source(client, semaphore, s) for s in NEWS_SOURCES))
+
+        # Merge in source order; a story listed by several pages is kept once
+        news_items: List[Dict[str, Any]] = []
+        seen_titles = set()
+        for items in pages:
+            for item in items:
+                if item["title"] in seen_titles:
+                    continue
+                seen_titles.add(item["title"])
+                news_items.append({"id": len(news_items) + 1, **item})
+        return news_items
 
     @classmethod
     async def get_latest_news(cls, category: str = "All") -> Dict[str, Any]:
-        """Fetch real financial news with caching."""
-        news = await cls._get_cached_news()
-        if category != "All":
-            news = [item for item in news if item["category"] == category]
+        """Latest news as last stored by the background refresher."""
+        news = await get_cached_news(category)
+        if news is None:
+            # Refresher has not completed a run yet
+            news = [{
+                "id": 0,
+                "title": "News temporarily unavailable. Please try again later.",
+                "category": "System",
+                "source": "ShareSathi",
+                "published_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                "url": None,
+                "content": "Unable to fetch live news at this time."
+            }]
         return {
             "news": news,
             "category": category,
             "source": "Live scraped from ShareSansar & MeroLagani",
-            "cached": cls._cache_time.isoformat() if cls._cache_time else None,
+            "cached": await get_news_refreshed_at(),
         }
 
     @classmethod
     async def get_categories(cls) -> List[str]:
-        """Return unique categories from cached news."""
-        news = await cls._get_cached_news()
-        cats = sorted({item["category"] for item in news if item.get("category")})
-        return ["All"] + cats
+        """Return unique categories from the stored news."""
+        return await get_cached_news_categories() or ["All"]
@@ -0,0 +1,158 @@
+"""
+Delivery channels for the notification pipeline.
+
+A channel sends a whole batch at once and returns one ``(status, error)``
+per notification. A ``RETRY`` outcome marks one notification as transiently
+failed; raising from ``send_batch`` marks all of them. The pipeline re-sends
+only those, with backoff.
+"""
+
+import asyncio
+import smtplib
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from email.message import EmailMessage
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.database.session import AsyncSessionLocal
+from app.repositories.user_repo import UserRepository
+from app.websocket.connection_manager import manager
+
+if TYPE_CHECKING:
+    from app.services.notification_service import Notification
+
+DELIVERED = "DELIVERED"
+SKIPPED = "SKIPPED"  # nowhere to deliver, e.g. the user has no open socket
+FAILED = "FAILED"
+RETRY = "RETRY"  # transient failure, re-sent by the pipeline; never stored
+DROPPED = "DROPPED"  # a queue was full, so it was never sent
+
+Outcome = Tuple[str, Optional[str]]
+
+
+class Channel(ABC):
+    name = "base"
+    batch_size = 50
+
+    @abstractmethod
+    async def send_batch(self, batch: List["Notification"]) -> List[Outcome]:
+        """Send every notification in ``batch``; one outcome each, in order."""
+
+    async def close(self) -> None:
+        pass
+
+
+class WebSocketChannel(Channel):
+    """Push to every live socket the user has open."""
+    name = "websocket"
+    batch_size = 100
+
+    async def send_batch(self, batch: List["Notification"]) -> List[Outcome]:
+        # Users are sent to in parallel, so one stalled socket only delays its
+        # own user; each user's notifications still arrive in order
+        by_user = defaultdict(list)
+        for i, notification in enumerate(batch):
+            by_user[notification.user_id].append(i)
+        outcomes: List[Outcome] = [(SKIPPED, "no open socket")] * len(batch)
+
+        async def send_user(indexes: List[int]):
+            for i in indexes:
+                if await manager.send_to_user(batch[i].user_id, {"notification": batch[i].payload()}):
+                    outcomes[i] = (DELIVERED, None)
+
+        await asyncio.gather(*(send_user(indexes) for indexes in by_user.values()))
+        return outcomes
+
+
+class EmailChannel(Channel):
+    """Send every message in a batch over one SMTP connection."""
+    name = "email"
+    batch_size = 20
+
+    def __init__(self, host: str, port: int, sender: str):
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    async def send_batch(self, batch: List["Notification"]) -> List[Outcome]:
+        async with AsyncSessionLocal() as db:
+            emails = await UserRepository(db).get_emails({n.user_id for n in batch})
+        messages = []
+        for notification in batch:
+            address = emails.get(notification.user_id)
+            if not address:
+                messages.append(None)
+                continue
+            message = EmailMessage()
+            message["From"] = self.sender
+            message["To"] = address
+            message["Subject"] = f"ShareSathi: {notification.title}"
+            message.set_content(notification.message)
+            messages.append(message)
+        return await asyncio.to_thread(self._send, messages)
+
+    def _send(self, messages: List[Optional[EmailMessage]]) -> List[Outcome]:
+        # Failing to connect propagates: nothing was sent, so the whole batch is retried
+        smtp = smtplib.SMTP(self.host, self.port, timeout=10)
+        outcomes: List[Outcome] = []
+        try:
+            for message in messages:
+                if message is None:
+                    outcomes.append((SKIPPED, "no active account email"))
+                    continue
+                try:
+                    smtp.send_message(message)
+                    outcomes.append((DELIVERED, None))
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                    outcomes.append((FAILED, str(e)[:255]))
+                except OSError as e:
+                    # Connection lost mid-batch: keep what already went out and
+                    # retry only the rest, so nobody gets the same email twice
+                    error = str(e)[:255] or type(e).__name__
+                    outcomes.extend(
+                        (SKIPPED, "no active account email") if rest is None else (RETRY, error)
+                        for rest in messages[len(outcomes):]
+                    )
+                    break
+        finally:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+        return outcomes
+
+
+class WebPushChannel(Channel):
+    """Hand a batch to a web push gateway, which holds the browser subscriptions."""
+    name = "webpush"
+    batch_size = 100
+
+    def __init__(self, gateway_url: str):
+        self.gateway_url = gateway_url
+        self._client = httpx.AsyncClient(timeout=10)
+
+    async def send_batch(self, batch: List["Notification"]) -> List[Outcome]:
+        response = await self._client.post(
+            self.gateway_url,
+            json={"notifications": [{"user_id": n.user_id, **n.payload()} for n in batch]},
+        )
+        if response.status_code >= 500:
+            response.raise_for_status()  # retried
+        if response.status_code >= 400:
+            return [(FAILED, f"gateway returned {response.status_code}")] * len(batch)
+        return [(DELIVERED, None)] * len(batch)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def configured_channels() -> List[Channel]:
+    channels: List[Channel] = [WebSocketChannel()]
+    if settings.SMTP_HOST:
+        channels.append(EmailChannel(settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_FROM))
+    if settings.WEB_PUSH_GATEWAY_URL:
+        channels.append(WebPushChannel(settings.WEB_PUSH_GATEWAY_URL))
+    return channels
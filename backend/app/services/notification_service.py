@@ -1,5 +1,230 @@
+"""
+Notification delivery pipeline.
+
+``submit`` never blocks: notifications go onto a bounded intake queue and
+are fanned out to a bounded queue per channel. Each channel worker drains
+its queue in batches (up to ``batch_size`` or ``BATCH_WINDOW`` seconds),
+retries failed batches with exponential backoff and jitter, and records
+every outcome in ``notification_deliveries``. When a queue is full the
+notification is dropped, so an alert storm at market open degrades delivery
+instead of stalling the request path or the tick feed. Drops are noted in
+memory and written as ``DROPPED`` deliveries in batches by a background task.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.database.session import AsyncSessionLocal
+from app.repositories.notification_repo import NotificationRepository
+from app.services.notification_channels import DROPPED, FAILED, RETRY, Channel, Outcome, configured_channels
+from app.utils.logger import logger
+
+QUEUE_SIZE = 5000  # notifications waiting for fan-out
+CHANNEL_QUEUE_SIZE = 1000  # notifications waiting per channel
+BATCH_WINDOW = 0.5  # seconds to wait for a batch to fill
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 1.0  # seconds, doubled on every retry
+BACKOFF_MAX = 30.0
+DROP_LOG_SIZE = 20000  # drops awaiting a DROPPED row; beyond this they are only counted
+
+
+@dataclass(frozen=True)
+class Notification:
+    user_id: int
+    kind: str  # e.g. 'PRICE_ALERT'
+    title: str
+    message: str
+    symbol: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def payload(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "title": self.title,
+            "message": self.message,
+            "symbol": self.symbol,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class NotificationPipeline:
+    def __init__(
+        self,
+        channels: Optional[List[Channel]] = None,
+        queue_size: int = QUEUE_SIZE,
+        channel_queue_size: int = CHANNEL_QUEUE_SIZE,
+        batch_window: float = BATCH_WINDOW,
+        max_attempts: int = MAX_ATTEMPTS,
+        backoff_base: float = BACKOFF_BASE,
+        persist: bool = True,
+    ):
+        self._channels = channels
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._channel_queue_size = channel_queue_size
+        self._channel_queues: Dict[str, asyncio.Queue] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.batch_window = batch_window
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.persist = persist
+        self.dropped = 0
+        # (channel name, or None when dropped before fan-out, notification)
+        self._drops: List[Tuple[Optional[str], Notification]] = []
+
+    @property
+    def channels(self) -> List[Channel]:
+        return self._channels or []
+
+    def submit(self, notification: Notification) -> bool:
+        """Queue a notification for delivery; False if it had to be dropped."""
+        try:
+            self._queue.put_nowait(notification)
+            return True
+        except asyncio.QueueFull:
+            self._drop(None, notification)
+            logger.warning(f"[Notifications] Intake queue full, dropped {notification.kind} for user={notification.user_id}")
+            return False
+
+    def _drop(self, channel_name: Optional[str], notification: Notification):
+        self.dropped += 1
+        if len(self._drops) < DROP_LOG_SIZE:
+            self._drops.append((channel_name, notification))
+
+    def start(self):
+        if self._tasks:
+            return
+        if self._channels is None:
+            self._channels = configured_channels()
+        self._tasks.append(asyncio.create_task(self._fan_out()))
+        self._tasks.append(asyncio.create_task(self._drop_recorder()))
+        for channel in self._channels:
+            queue = asyncio.Queue(maxsize=self._channel_queue_size)
+            self._channel_queues[channel.name] = queue
+            self._tasks.append(asyncio.create_task(self._channel_worker(channel, queue)))
+        logger.info(f"Started notification pipeline ({', '.join(c.name for c in self._channels)})")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self._record_drops()
+        for channel in self.channels:
+            await channel.close()
+        logger.info("Stopped notification pipeline")
+
+    async def _fan_out(self):
+        while True:
+            notification = await self._queue.get()
+            for name, queue in self._channel_queues.items():
+                try:
+                    queue.put_nowait(notification)
+                except asyncio.QueueFull:
+                    self._drop(name, notification)
+                    logger.warning(f"[Notifications] {name} queue full, dropped {notification.kind} for user={notification.user_id}")
+
+    async def _channel_worker(self, channel: Channel, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < channel.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            outcomes, attempts = await self._deliver(channel, batch)
+            await self._record(channel.name, batch, outcomes, attempts)
+
+    async def _deliver(self, channel: Channel, batch: List[Notification]) -> Tuple[List[Outcome], List[int]]:
+        """Send a batch, re-sending only the notifications that failed transiently.
+
+        A raised exception marks every pending notification for retry; a
+        ``RETRY`` outcome marks just that one. Returns one outcome and one
+        attempt count per notification.
+        """
+        outcomes: List[Outcome] = [(RETRY, None)] * len(batch)
+        attempts = [0] * len(batch)
+        pending = list(range(len(batch)))
+        for attempt in range(1, self.max_attempts + 1):
+            for i in pending:
+                attempts[i] = attempt
+            try:
+                results = await channel.send_batch([batch[i] for i in pending])
+            except Exception as e:
+                results = [(RETRY, str(e)[:255])] * len(pending)
+            for i, outcome in zip(pending, results):
+                outcomes[i] = outcome
+            pending = [i for i in pending if outcomes[i][0] == RETRY]
+            if not pending or attempt == self.max_attempts:
+                break
+            delay = min(BACKOFF_MAX, self.backoff_base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            logger.warning(
+                f"[Notifications] {channel.name} {len(pending)} of {len(batch)} failed "
+                f"(attempt {attempt}/{self.max_attempts}), retrying in {delay:.1f}s: {outcomes[pending[0]][1]}"
+            )
+            await asyncio.sleep(delay)
+
+        if pending:
+            logger.error(f"[Notifications] {channel.name} {len(pending)} of {len(batch)} gave up: {outcomes[pending[0]][1]}")
+            for i in pending:
+                outcomes[i] = (FAILED, outcomes[i][1])
+        return outcomes, attempts
+
+    async def _drop_recorder(self):
+        while True:
+            await asyncio.sleep(self.batch_window)
+            await self._record_drops()
+
+    async def _record_drops(self):
+        """Write the drops noted since the last call as DROPPED deliveries, one batch per channel."""
+        drops, self._drops = self._drops, []
+        by_channel: Dict[str, List[Notification]] = defaultdict(list)
+        for channel_name, notification in drops:
+            # Dropped at intake: it reached none of the channels
+            for name in [channel_name] if channel_name else [c.name for c in self.channels]:
+                by_channel[name].append(notification)
+        for name, batch in by_channel.items():
+            await self._record(name, batch, [(DROPPED, "queue full")] * len(batch), [0] * len(batch))
+
+    async def _record(self, channel_name: str, batch: List[Notification], outcomes: List[Outcome], attempts: List[int]):
+        if not self.persist:
+            return
+        rows = [
+            {
+                "user_id": n.user_id,
+                "channel": channel_name,
+                "kind": n.kind,
+                "symbol": n.symbol,
+                "message": n.message,
+                "status": status,
+                "attempts": tries,
+                "error": error,
+                "created_at": n.created_at,
+            }
+            for n, (status, error), tries in zip(batch, outcomes, attempts)
+        ]
+        try:
+            async with AsyncSessionLocal() as db:
+                await NotificationRepository(db).record_deliveries(rows)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"[Notifications] Failed to record {len(rows)} {channel_name} deliveries: {e}")
+
+notification_pipeline = NotificationPipeline()
+
+
 class NotificationService:
     @staticmethod
-    async def notify_price_alert(user_id: int, symbol: str, message: str):
-        # Placeholder for Push/Email notification service
-        pass
+    async def notify_price_alert(user_id: int, symbol: str, message: str) -> bool:
+        return notification_pipeline.submit(
+            Notification(user_id=user_id, kind="PRICE_ALERT", title=f"{symbol} price alert", message=message, symbol=symbol)
+        )
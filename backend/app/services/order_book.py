@@ -0,0 +1,145 @@
+"""
+In-memory limit/stop order book used by the paper-trading matcher.
+
+Every symbol keeps two heaps of resting orders, split by the direction in
+which the market has to move to trigger them:
+
+- ``rise``: fires once LTP >= price (SELL LIMIT, BUY STOP) — min-heap
+- ``fall``: fires once LTP <= price (BUY LIMIT, SELL STOP) — max-heap
+
+Heap entries are ``(price_key, order_id)``; order ids grow with time, so ties
+on price resolve by arrival (price-time priority). Matching only pops the
+heap tops that cross the tick price, so per-tick cost is proportional to the
+number of fills, not to the size of the book. Cancelled orders are dropped
+from the id index and their heap entries counted as dead: dead entries are
+popped whenever they reach a heap top, and a heap is rebuilt once more than
+half of it is dead, so the book grows with resting orders, not cancellations.
+"""
+
+import heapq
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Mapping, Tuple
+
+
+@dataclass(frozen=True)
+class RestingOrder:
+    id: int
+    user_id: int
+    symbol: str
+    side: str  # 'BUY' or 'SELL'
+    order_type: str  # 'LIMIT' or 'STOP'
+    quantity: int
+    price: Decimal
+
+    @property
+    def fires_on_rise(self) -> bool:
+        return (self.side, self.order_type) in (("SELL", "LIMIT"), ("BUY", "STOP"))
+
+
+class _SymbolBook:
+    __slots__ = ("rise", "fall", "dead_rise", "dead_fall")
+
+    def __init__(self):
+        self.rise: List[Tuple[float, int]] = []
+        self.fall: List[Tuple[float, int]] = []
+        self.dead_rise = 0
+        self.dead_fall = 0
+
+
+class OrderBook:
+    def __init__(self):
+        self._books: Dict[str, _SymbolBook] = {}
+        self._orders: Dict[int, RestingOrder] = {}
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self._orders
+
+    def add(self, order: RestingOrder) -> None:
+        if order.id in self._orders:
+            return
+        self._orders[order.id] = order
+        book = self._books.setdefault(order.symbol, _SymbolBook())
+        price = float(order.price)
+        if order.fires_on_rise:
+            heapq.heappush(book.rise, (price, order.id))
+        else:
+            heapq.heappush(book.fall, (-price, order.id))
+
+    def remove(self, order_id: int) -> None:
+        """Forget an order and mark its heap entry dead."""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return
+        book = self._books[order.symbol]
+        if order.fires_on_rise:
+            book.dead_rise += 1
+        else:
+            book.dead_fall += 1
+        self._prune(order.symbol, book)
+
+    def _prune(self, symbol: str, book: _SymbolBook) -> None:
+        """Pop dead entries off the heap tops and compact a heap that is mostly dead."""
+        live = self._orders
+        while book.rise and book.rise[0][1] not in live:
+            heapq.heappop(book.rise)
+            book.dead_rise -= 1
+        while book.fall and book.fall[0][1] not in live:
+            heapq.heappop(book.fall)
+            book.dead_fall -= 1
+        if book.dead_rise * 2 > len(book.rise):
+            book.rise = [entry for entry in book.rise if entry[1] in live]
+            heapq.heapify(book.rise)
+            book.dead_rise = 0
+        if book.dead_fall * 2 > len(book.fall):
+            book.fall = [entry for entry in book.fall if entry[1] in live]
+            heapq.heapify(book.fall)
+            book.dead_fall = 0
+        if not book.rise and not book.fall:
+            del self._books[symbol]
+
+    def heap_size(self) -> int:
+        """Heap entries held across all symbols, live or dead."""
+        return sum(len(book.rise) + len(book.fall) for book in self._books.values())
+
+    def clear(self) -> None:
+        self._books.clear()
+        self._orders.clear()
+
+    def match(self, prices: Mapping[str, float]) -> List[Tuple[RestingOrder, float]]:
+        """Pop every resting order crossed by the given last traded prices.
+
+        Returns ``(order, fill_price)`` pairs in price-time priority per symbol.
+        Matched orders are removed from the book.
+        """
+        fills: List[Tuple[RestingOrder, float]] = []
+        for symbol in list(self._books):
+            ltp = prices.get(symbol)
+            if not ltp or ltp <= 0:
+                continue
+            book = self._books[symbol]
+
+            while book.rise and book.rise[0][0] <= ltp:
+                _, order_id = heapq.heappop(book.rise)
+                order = self._orders.pop(order_id, None)
+                if order:
+                    fills.append((order, ltp))
+                else:
+                    book.dead_rise -= 1
+
+            while book.fall and -book.fall[0][0] >= ltp:
+                _, order_id = heapq.heappop(book.fall)
+                order = self._orders.pop(order_id, None)
+                if order:
+                    fills.append((order, ltp))
+                else:
+                    book.dead_fall -= 1
+
+            self._prune(symbol, book)
+        return fills
+
+
+order_book = OrderBook()
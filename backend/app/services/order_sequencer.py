@@ -0,0 +1,130 @@
+"""
+Per-user order sequencing.
+
+Orders for the same user run strictly one after another, while different
+users proceed fully in parallel. Inside a worker this is a map of asyncio
+locks keyed by user id; entries are reference-counted and evicted as soon as
+nobody holds or waits on them, so the map only ever contains users with
+in-flight orders. Across workers the same key is additionally guarded by a
+Redis lock, so balances stay correct without relying on database row locks
+(which SQLite doesn't have). The Redis lock is extended while its holder
+runs, so its TTL only bounds how long a crashed worker can block a user.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException
+from redis.exceptions import LockError, RedisError
+
+from app.cache.redis_client import get_redis, using_fakeredis
+from app.config import settings
+from app.utils.logger import logger
+
+
+class _UserLock:
+    __slots__ = ("lock", "refs")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.refs = 0
+
+
+def _busy() -> HTTPException:
+    return HTTPException(status_code=429, detail="Another order for this account is still processing. Please retry.")
+
+
+class UserOrderSequencer:
+    def __init__(self, distributed: bool = True):
+        self.distributed = distributed
+        self._locks: Dict[int, _UserLock] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def serialize(self, user_id: int, wait: Optional[float] = None) -> AsyncIterator[None]:
+        """Hold the user's order lock for the duration of the block.
+
+        ``wait`` bounds how long to queue behind the user's in-flight order
+        (default: locally unbounded, ``ORDER_LOCK_WAIT_SECONDS`` across
+        workers); when it runs out the block is refused with a 429.
+        """
+        entry = self._locks.get(user_id)
+        if entry is None:
+            entry = self._locks[user_id] = _UserLock()
+        entry.refs += 1
+        try:
+            if wait is None:
+                await entry.lock.acquire()
+            else:
+                try:
+                    await asyncio.wait_for(entry.lock.acquire(), wait)
+                except asyncio.TimeoutError:
+                    raise _busy()
+            try:
+                async with self._distributed_lock(user_id, wait):
+                    yield
+            finally:
+                entry.lock.release()
+        finally:
+            entry.refs -= 1
+            if entry.refs == 0:
+                self._locks.pop(user_id, None)
+
+    @asynccontextmanager
+    async def _distributed_lock(self, user_id: int, wait: Optional[float] = None) -> AsyncIterator[None]:
+        if not self.distributed:
+            yield
+            return
+
+        redis = await get_redis()
+        # fakeredis is per-process, so the local lock is already sufficient
+        if using_fakeredis():
+            yield
+            return
+
+        try:
+            lock = redis.lock(
+                f"lock:orders:user:{user_id}",
+                timeout=settings.ORDER_LOCK_TIMEOUT_SECONDS,
+                blocking_timeout=settings.ORDER_LOCK_WAIT_SECONDS if wait is None else wait,
+            )
+            acquired = await lock.acquire()
+        except RedisError as e:
+            logger.warning(f"Order lock unavailable for user {user_id}, serializing locally only: {e}")
+            yield
+            return
+
+        if not acquired:
+            raise _busy()
+        keeper = asyncio.create_task(self._keep_alive(lock, user_id))
+        try:
+            yield
+        finally:
+            keeper.cancel()
+            try:
+                await lock.release()
+            except (LockError, RedisError) as e:
+                logger.warning(f"Order lock for user {user_id} expired before release: {e}")
+
+    @staticmethod
+    async def _keep_alive(lock, user_id: int) -> None:
+        """Reset the lock's TTL while its holder runs.
+
+        The TTL only has to outlive a crashed worker; a slow trade keeps the
+        lock for as long as it takes, so no other worker can enter the same
+        user's critical section halfway through.
+        """
+        interval = settings.ORDER_LOCK_TIMEOUT_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await lock.reacquire()
+            except (LockError, RedisError) as e:
+                logger.warning(f"Could not extend order lock for user {user_id}: {e}")
+                return
+
+
+order_sequencer = UserOrderSequencer()
@@ -0,0 +1,70 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.snapshot_repo import SnapshotRepository
+
+
+def time_weighted_returns(navs: Sequence[float], flows: Sequence[float]) -> List[float]:
+    """Cumulative time-weighted return at each snapshot, chaining daily sub-period returns.
+
+    A flow is assumed to land just before the NAV it is recorded with, so it
+    is taken out of that day's growth rather than counted as performance.
+    """
+    cumulative = [0.0]
+    growth = 1.0
+    for i in range(1, len(navs)):
+        if navs[i - 1] > 0:
+            growth *= (navs[i] - flows[i]) / navs[i - 1]
+        cumulative.append(growth - 1.0)
+    return cumulative
+
+
+def modified_dietz(navs: Sequence[float], flows: Sequence[float], days: Sequence[int]) -> Optional[float]:
+    """Money-weighted return over the whole range (Modified Dietz).
+
+    ``days`` are offsets of each snapshot from the first; the starting
+    snapshot's own flow is already inside its NAV and is ignored.
+    """
+    if len(navs) < 2:
+        return None
+    period = days[-1] or 1
+    net_flow = sum(flows[1:])
+    weighted = sum(flow * (period - day) / period for flow, day in zip(flows[1:], days[1:]))
+    denominator = navs[0] + weighted
+    if denominator <= 0:
+        return None
+    return (navs[-1] - navs[0] - net_flow) / denominator
+
+
+class PerformanceService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.snapshot_repo = SnapshotRepository(db)
+
+    async def get_performance(self, user_id: int, start: date, end: date) -> Dict[str, Any]:
+        snapshots = await self.snapshot_repo.get_range(user_id, start, end)
+        navs = [float(s.nav) for s in snapshots]
+        flows = [float(s.net_flow) for s in snapshots]
+        twr = time_weighted_returns(navs, flows)
+        mwr = modified_dietz(navs, flows, [(s.date - snapshots[0].date).days for s in snapshots]) if snapshots else None
+
+        return {
+            "start": snapshots[0].date if snapshots else start,
+            "end": snapshots[-1].date if snapshots else end,
+            "twr": round(twr[-1] * 100, 4) if len(snapshots) > 1 else None,
+            "mwr": round(mwr * 100, 4) if mwr is not None else None,
+            "series": [
+                {
+                    "date": s.date,
+                    "nav": s.nav,
+                    "cash": s.cash,
+                    "holdings_value": s.holdings_value,
+                    "net_flow": s.net_flow,
+                    "twr": round(r * 100, 4),
+                }
+                for s, r in zip(snapshots, twr)
+            ],
+        }
@@ -3,21 +3,24 @@ from typing import Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.portfolio_repo import PortfolioRepository
+from app.repositories.pnl_repo import RealizedPnlRepository
 from app.services.nepse_service import NepseService
 
 class PortfolioService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.portfolio_repo = PortfolioRepository(db)
+        self.pnl_repo = RealizedPnlRepository(db)
 
     async def calculate_portfolio_pnl(self, user_id: int) -> Dict[str, Any]:
         portfolios = await self.portfolio_repo.get_user_portfolio(user_id)
         
-        market_data = await NepseService.get_live_market()
+        tick = await NepseService.get_live_tick()
         live_prices = {}
-        if not market_data.get('is_stale', False) or market_data.get('live_market'):
-            for stock in market_data.get("live_market", []):
-                 live_prices[stock.get("symbol")] = Decimal(str(stock.get("lastTradedPrice", 0)))
+        for p in portfolios:
+            quote = tick.get(p.symbol)
+            if quote is not None:
+                live_prices[p.symbol] = Decimal(str(quote.ltp))
 
         total_investment = Decimal("0.0")
         total_current_value = Decimal("0.0")
@@ -49,6 +52,7 @@ class PortfolioService:
 
         total_pnl = total_current_value - total_investment
         overall_pnl_percentage = (total_pnl / total_investment * 100) if total_investment > 0 else Decimal("0.0")
+        realized = await self.pnl_repo.get_user_totals(user_id)
 
         return {
             "assets": assets,
@@ -56,6 +60,21 @@ class PortfolioService:
                 "total_investment": total_investment,
                 "total_current_value": total_current_value,
                 "total_pnl": total_pnl,
-                "overall_pnl_percentage": overall_pnl_percentage
+                "overall_pnl_percentage": overall_pnl_percentage,
+                "total_realized_pnl": realized["realized_pnl"],
+                "total_fees_paid": realized["fees_paid"]
+            }
+        }
+
+    async def get_realized_pnl(self, user_id: int) -> Dict[str, Any]:
+        """Realized P&L per symbol, read from the running totals kept at trade time."""
+        rows = await self.pnl_repo.get_user_realized(user_id)
+        return {
+            "symbols": rows,
+            "summary": {
+                "total_realized_pnl": sum((r.realized_pnl for r in rows), Decimal("0")),
+                "total_fees_paid": sum((r.fees_paid for r in rows), Decimal("0")),
+                "total_sell_value": sum((r.sell_value for r in rows), Decimal("0")),
+                "total_cost_basis": sum((r.cost_basis for r in rows), Decimal("0")),
             }
         }
@@ -1,68 +1,52 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime, timezone, timedelta
 from fastapi import HTTPException
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.transaction import Transaction
+from app.ingestion import LiveTick
 from app.models.portfolio import Portfolio
+from app.models.order import Order
 from app.repositories.user_repo import UserRepository
 from app.repositories.portfolio_repo import PortfolioRepository
 from app.repositories.trade_repo import TradeRepository
+from app.repositories.order_repo import OrderRepository
+from app.repositories.pnl_repo import RealizedPnlRepository
 from app.services.nepse_service import NepseService
+from app.services.fee_engine import (  # noqa: F401 — fee constants re-exported for existing importers
+    BROKERAGE_TIERS, SEBON_FEE_RATE, DP_CHARGE, calculate_total_fees_batch, fee_schedule,
+)
+from app.services.order_book import RestingOrder, order_book
+from app.services.order_sequencer import order_sequencer
 
 logger = logging.getLogger(__name__)
 
 # Nepal Standard Time = UTC+5:45
 NPT_OFFSET = timedelta(hours=5, minutes=45)
 
-# ─── NEPSE Brokerage Fee Schedule ───────────────────────────
-# Based on SEBON's tiered commission structure for stock trading.
-# These are approximate and for paper trading educational purposes.
-BROKERAGE_TIERS = [
-    (50_000, Decimal("0.36")),        # up to 50k: 0.36%
-    (500_000, Decimal("0.33")),       # 50k-500k: 0.33%
-    (2_000_000, Decimal("0.31")),     # 500k-2M: 0.31%
-    (10_000_000, Decimal("0.27")),    # 2M-10M: 0.27%
-    (float("inf"), Decimal("0.24")),  # 10M+: 0.24%
-]
-SEBON_FEE_RATE = Decimal("0.015")      # 0.015% SEBON regulation fee
-DP_CHARGE = Decimal("25.00")            # Rs 25 per transaction (DP charge)
 CIRCUIT_LIMIT_PCT = Decimal("10")       # ±10% daily circuit breaker (NEPSE rule)
 
 
 def calculate_brokerage(trade_amount: Decimal) -> Decimal:
     """Calculate tiered NEPSE brokerage commission."""
-    remaining = trade_amount
-    total_commission = Decimal("0")
-    prev_limit = Decimal("0")
-    for limit, rate in BROKERAGE_TIERS:
-        tier_amount = min(remaining, Decimal(str(limit)) - prev_limit)
-        if tier_amount <= 0:
-            break
-        total_commission += tier_amount * rate / Decimal("100")
-        remaining -= tier_amount
-        prev_limit = Decimal(str(limit))
-    return total_commission.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return fee_schedule.brokerage(trade_amount)
 
 
 def calculate_total_fees(trade_amount: Decimal) -> Dict[str, Decimal]:
     """Calculate all trading fees: brokerage + SEBON fee + DP charge."""
-    brokerage = calculate_brokerage(trade_amount)
-    sebon_fee = (trade_amount * SEBON_FEE_RATE / Decimal("100")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    return {
-        "brokerage": brokerage,
-        "sebon_fee": sebon_fee,
-        "dp_charge": DP_CHARGE,
-        "total_fees": brokerage + sebon_fee + DP_CHARGE,
-    }
+    return fee_schedule.total_fees(trade_amount)
+
+
+def npt_now() -> datetime:
+    """Current wall-clock time in Nepal Standard Time."""
+    return datetime.now(timezone.utc) + NPT_OFFSET
 
 
 def is_market_hours() -> bool:
     """Check if current time is within NEPSE trading hours (Sun-Thu 11:00-15:00 NPT)."""
-    now_utc = datetime.now(timezone.utc)
-    now_npt = now_utc + NPT_OFFSET
+    now_npt = npt_now()
     weekday = now_npt.weekday()  # 0=Mon ... 6=Sun
     # NEPSE trades Sun(6)-Thu(3) — in Python: Sun=6, Mon=0, Tue=1, Wed=2, Thu=3
     trading_days = {6, 0, 1, 2, 3}  # Sun, Mon, Tue, Wed, Thu
@@ -82,17 +66,23 @@ class TradingService:
         self.user_repo = UserRepository(db)
         self.portfolio_repo = PortfolioRepository(db)
         self.trade_repo = TradeRepository(db)
+        self.order_repo = OrderRepository(db)
+        self.pnl_repo = RealizedPnlRepository(db)
 
-    async def _get_current_price(self, symbol: str) -> Decimal:
-        market_data = await NepseService.get_live_market()
-        if market_data.get('is_stale', False) and not market_data.get('live_market'):
+    async def _get_market_snapshot(self) -> LiveTick:
+        """One live tick, so every lookup in a request prices off the same market."""
+        tick = await NepseService.get_live_tick()
+        if tick.is_stale and not len(tick):
             raise HTTPException(status_code=503, detail="Market data unavailable")
-            
-        for stock in market_data.get("live_market", []):
-            if stock.get("symbol") == symbol:
-                return Decimal(str(stock.get("lastTradedPrice", 0)))
-                
-        raise HTTPException(status_code=404, detail=f"Symbol {symbol} not found in live market")
+        return tick
+
+    @staticmethod
+    def _quote(snapshot: LiveTick, symbol: str) -> Tuple[Decimal, Decimal]:
+        """Return ``(last traded price, previous close)`` for a symbol in the snapshot."""
+        quote = snapshot.get(symbol)
+        if quote is None:
+            raise HTTPException(status_code=404, detail=f"Symbol {symbol} not found in live market")
+        return Decimal(str(quote.ltp)), Decimal(str(quote.previous_close))
 
     def _check_circuit_breaker(self, symbol: str, current_price: Decimal, previous_close: Decimal) -> None:
         """Enforce NEPSE ±10% daily circuit breaker.
@@ -116,130 +106,321 @@ class TradingService:
                 ),
             )
 
-    async def _get_previous_close(self, symbol: str) -> Decimal:
-        """Get previous close from live market data."""
-        market_data = await NepseService.get_live_market()
-        for stock in market_data.get("live_market", []):
-            if stock.get("symbol") == symbol:
-                pc = stock.get("previousClose") or stock.get("previousDayClosePrice") or 0
-                return Decimal(str(pc))
-        return Decimal("0")
-
-    async def execute_buy(self, user_id: int, symbol: str, quantity: int) -> Transaction:
-        if quantity <= 0:
-            raise HTTPException(status_code=400, detail="Quantity must be greater than 0")
-        if quantity < 10:
-            raise HTTPException(status_code=400, detail="Minimum order size is 10 shares (NEPSE lot size)")
+    async def execute_buy(self, user_id: int, symbol: str, quantity: int) -> Row:
+        self._validate_quantity(quantity)
 
         # Check trading hours (warn but allow for paper trading)
         market_open = is_market_hours()
 
-        price = await self._get_current_price(symbol)
+        price, previous_close = self._quote(await self._get_market_snapshot(), symbol)
 
         # NEPSE ±10% circuit breaker
-        previous_close = await self._get_previous_close(symbol)
         self._check_circuit_breaker(symbol, price, previous_close)
 
-        trade_amount = price * quantity
-
-        # Calculate fees
-        fees = calculate_total_fees(trade_amount)
-        total_cost = trade_amount + fees["total_fees"]
+        # One order per user at a time, so concurrent requests can't race the balance
+        async with order_sequencer.serialize(user_id):
+            transaction, fees = await self._apply_buy(user_id, symbol, quantity, price)
+            await self.db.commit()
 
-        wallet = await self.user_repo.get_wallet_for_update(user_id)
-        if not wallet:
-            raise HTTPException(status_code=404, detail="Wallet not found")
+        logger.info(
+            f"BUY executed: user={user_id} symbol={symbol} qty={quantity} "
+            f"price={price} fees={fees['total_fees']} market_open={market_open}"
+        )
+        return transaction
 
-        if wallet.balance < total_cost:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Insufficient balance. Need Rs. {total_cost:.2f} (shares: {trade_amount:.2f} + fees: {fees['total_fees']:.2f}) but have Rs. {wallet.balance:.2f}"
-            )
+    async def execute_sell(self, user_id: int, symbol: str, quantity: int) -> Row:
+        self._validate_quantity(quantity)
 
-        portfolio = await self.portfolio_repo.get_portfolio_item_for_update(user_id, symbol)
-
-        if portfolio:
-            total_value = (portfolio.quantity * portfolio.average_buy_price) + trade_amount
-            new_quantity = portfolio.quantity + quantity
-            portfolio.quantity = new_quantity
-            portfolio.average_buy_price = total_value / new_quantity
-        else:
-            portfolio = Portfolio(
-                user_id=user_id,
-                symbol=symbol,
-                quantity=quantity,
-                average_buy_price=price
-            )
-            self.portfolio_repo.create(portfolio)
+        market_open = is_market_hours()
 
-        wallet.balance -= total_cost
+        price, previous_close = self._quote(await self._get_market_snapshot(), symbol)
 
-        transaction = Transaction(
-            user_id=user_id,
-            symbol=symbol,
-            transaction_type="BUY",
-            quantity=quantity,
-            price=price
-        )
-        self.trade_repo.record_transaction(transaction)
+        # NEPSE ±10% circuit breaker
+        self._check_circuit_breaker(symbol, price, previous_close)
 
-        await self.db.commit()
-        await self.db.refresh(transaction)
+        # One order per user at a time, so concurrent requests can't race the balance
+        async with order_sequencer.serialize(user_id):
+            transaction, fees = await self._apply_sell(user_id, symbol, quantity, price)
+            await self.db.commit()
 
         logger.info(
-            f"BUY executed: user={user_id} symbol={symbol} qty={quantity} "
+            f"SELL executed: user={user_id} symbol={symbol} qty={quantity} "
             f"price={price} fees={fees['total_fees']} market_open={market_open}"
         )
         return transaction
 
-    async def execute_sell(self, user_id: int, symbol: str, quantity: int) -> Transaction:
+    @staticmethod
+    def _validate_quantity(quantity: int) -> None:
         if quantity <= 0:
             raise HTTPException(status_code=400, detail="Quantity must be greater than 0")
         if quantity < 10:
             raise HTTPException(status_code=400, detail="Minimum order size is 10 shares (NEPSE lot size)")
 
-        market_open = is_market_hours()
+    async def _apply_buy(self, user_id: int, symbol: str, quantity: int, price: Decimal) -> Tuple[Row, Dict[str, Decimal]]:
+        """Debit the wallet, grow the position and journal the trade. Caller commits."""
+        trade_amount = price * quantity
 
-        price = await self._get_current_price(symbol)
+        # Calculate fees
+        fees = calculate_total_fees(trade_amount)
+        total_cost = trade_amount + fees["total_fees"]
 
-        # NEPSE ±10% circuit breaker
-        previous_close = await self._get_previous_close(symbol)
-        self._check_circuit_breaker(symbol, price, previous_close)
+        new_balance = await self.user_repo.debit_wallet(user_id, total_cost)
+        if new_balance is None:
+            wallet = await self.user_repo.get_wallet(user_id)
+            if not wallet:
+                raise HTTPException(status_code=404, detail="Wallet not found")
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Insufficient balance. Need Rs. {total_cost:.2f} (shares: {trade_amount:.2f} + fees: {fees['total_fees']:.2f}) but have Rs. {wallet.balance:.2f}"
+            )
 
+        await self.portfolio_repo.add_to_position(user_id, symbol, quantity, price)
+        await self.pnl_repo.record(user_id, symbol, fees=fees["total_fees"])
+
+        [transaction] = await self.trade_repo.append_transactions([{
+            "user_id": user_id,
+            "symbol": symbol,
+            "transaction_type": "BUY",
+            "quantity": quantity,
+            "price": price,
+            "fees": fees["total_fees"],
+            "timestamp": datetime.now(timezone.utc),
+        }])
+        return transaction, fees
+
+    async def _apply_sell(self, user_id: int, symbol: str, quantity: int, price: Decimal) -> Tuple[Row, Dict[str, Decimal]]:
+        """Shrink the position, credit the wallet and journal the trade. Caller commits."""
         trade_amount = price * quantity
 
         # Calculate fees
         fees = calculate_total_fees(trade_amount)
         net_revenue = trade_amount - fees["total_fees"]
 
-        portfolio = await self.portfolio_repo.get_portfolio_item_for_update(user_id, symbol)
-        if not portfolio or portfolio.quantity < quantity:
+        remaining = await self.portfolio_repo.remove_from_position(user_id, symbol, quantity)
+        if remaining is None:
             raise HTTPException(status_code=400, detail="Insufficient stock quantity")
 
-        wallet = await self.user_repo.get_wallet_for_update(user_id)
-        if not wallet:
+        if await self.user_repo.credit_wallet(user_id, net_revenue) is None:
             raise HTTPException(status_code=404, detail="Wallet not found")
 
-        portfolio.quantity -= quantity
-        if portfolio.quantity == 0:
-            await self.db.delete(portfolio)
-        
-        wallet.balance += net_revenue
+        _, average_buy_price = remaining
+        cost_basis, realized_pnl = realize(trade_amount, quantity, average_buy_price, fees["total_fees"])
+        await self.pnl_repo.record(
+            user_id, symbol, fees=fees["total_fees"], quantity_sold=quantity,
+            sell_value=trade_amount, cost_basis=cost_basis, realized_pnl=realized_pnl,
+        )
+
+        [transaction] = await self.trade_repo.append_transactions([{
+            "user_id": user_id,
+            "symbol": symbol,
+            "transaction_type": "SELL",
+            "quantity": quantity,
+            "price": price,
+            "fees": fees["total_fees"],
+            "realized_pnl": realized_pnl,
+            "timestamp": datetime.now(timezone.utc),
+        }])
+        return transaction, fees
+
+    # ─── Batch Orders ───────────────────────────────────────
+    async def execute_batch(self, user_id: int, orders: List[Tuple[str, str, int]]) -> List[Row]:
+        """Execute ``(side, symbol, quantity)`` orders all-or-nothing in one commit.
+
+        Every order is priced off a single market snapshot, the wallet and the
+        touched positions are locked once, and orders are applied in the given
+        sequence so a sell can fund a later buy. Any failing order aborts the
+        whole batch before anything is written.
+        """
+        if not orders:
+            raise HTTPException(status_code=400, detail="Batch must contain at least one order")
+
+        for i, (side, symbol, quantity) in enumerate(orders, start=1):
+            try:
+                self._validate_quantity(quantity)
+            except HTTPException as e:
+                raise HTTPException(status_code=e.status_code, detail=f"Order {i} ({side} {symbol}): {e.detail}")
+
+        market_open = is_market_hours()
+        snapshot = await self._get_market_snapshot()
+
+        priced = []
+        for i, (side, symbol, quantity) in enumerate(orders, start=1):
+            try:
+                price, previous_close = self._quote(snapshot, symbol)
+                self._check_circuit_breaker(symbol, price, previous_close)
+            except HTTPException as e:
+                raise HTTPException(status_code=e.status_code, detail=f"Order {i} ({side} {symbol}): {e.detail}")
+            priced.append((side, symbol, quantity, price, price * quantity))
+        batch_fees = calculate_total_fees_batch([trade_amount for *_, trade_amount in priced])
+        priced = [order + (fees,) for order, fees in zip(priced, batch_fees)]
+
+        async with order_sequencer.serialize(user_id):
+            wallet = await self.user_repo.get_wallet_for_update(user_id)
+            if not wallet:
+                raise HTTPException(status_code=404, detail="Wallet not found")
+            positions = await self.portfolio_repo.get_portfolio_items_for_update(
+                user_id, {symbol for _, symbol, _ in orders}
+            )
+
+            balance = wallet.balance
+            executed_at = datetime.now(timezone.utc)
+            journal: List[Dict[str, Any]] = []
+            realized: Dict[str, Dict[str, Any]] = {}
+            total_fees = Decimal("0")
+            for i, (side, symbol, quantity, price, trade_amount, fees) in enumerate(priced, start=1):
+                position = positions.get(symbol)
+                totals = realized.setdefault(symbol, {
+                    "fees": Decimal("0"), "quantity_sold": 0, "sell_value": Decimal("0"),
+                    "cost_basis": Decimal("0"), "realized_pnl": Decimal("0"),
+                })
+                realized_pnl = None
+                if side == "BUY":
+                    total_cost = trade_amount + fees["total_fees"]
+                    if balance < total_cost:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"Order {i} (BUY {symbol}): Insufficient balance. Need Rs. {total_cost:.2f} but have Rs. {balance:.2f}"
+                        )
+                    if position:
+                        total_value = (position.quantity * position.average_buy_price) + trade_amount
+                        position.quantity += quantity
+                        position.average_buy_price = total_value / position.quantity
+                    else:
+                        position = Portfolio(user_id=user_id, symbol=symbol, quantity=quantity, average_buy_price=price)
+                        self.portfolio_repo.create(position)
+                        positions[symbol] = position
+                    balance -= total_cost
+                else:
+                    if not position or position.quantity < quantity:
+                        raise HTTPException(status_code=400, detail=f"Order {i} (SELL {symbol}): Insufficient stock quantity")
+                    position.quantity -= quantity
+                    balance += trade_amount - fees["total_fees"]
+                    cost_basis, realized_pnl = realize(trade_amount, quantity, position.average_buy_price, fees["total_fees"])
+                    totals["quantity_sold"] += quantity
+                    totals["sell_value"] += trade_amount
+                    totals["cost_basis"] += cost_basis
+                    totals["realized_pnl"] += realized_pnl
+
+                totals["fees"] += fees["total_fees"]
+                total_fees += fees["total_fees"]
+                journal.append({
+                    "user_id": user_id,
+                    "symbol": symbol,
+                    "transaction_type": side,
+                    "quantity": quantity,
+                    "price": price,
+                    "fees": fees["total_fees"],
+                    "realized_pnl": realized_pnl,
+                    "timestamp": executed_at,
+                })
+
+            for position in positions.values():
+                if position.quantity == 0:
+                    if position in self.db.new:
+                        self.db.expunge(position)
+                    else:
+                        await self.db.delete(position)
+
+            wallet.balance = balance
+            await self.db.flush()
+            transactions = await self.trade_repo.append_transactions(journal)
+            for symbol, totals in realized.items():
+                await self.pnl_repo.record(user_id, symbol, **totals)
+            await self.db.commit()
 
-        transaction = Transaction(
+        logger.info(
+            f"BATCH executed: user={user_id} orders={len(transactions)} "
+            f"fees={total_fees} market_open={market_open}"
+        )
+        return transactions
+
+    # ─── Limit / Stop Orders ────────────────────────────────
+    async def place_order(self, user_id: int, symbol: str, side: str, order_type: str, quantity: int, price: Decimal) -> Order:
+        """Rest a limit or stop order in the book until a live tick crosses its price."""
+        self._validate_quantity(quantity)
+        if price <= 0:
+            raise HTTPException(status_code=400, detail="Order price must be greater than 0")
+
+        # Reject unknown symbols up front rather than at fill time
+        self._quote(await self._get_market_snapshot(), symbol)
+
+        order = Order(
             user_id=user_id,
             symbol=symbol,
-            transaction_type="SELL",
+            side=side,
+            order_type=order_type,
             quantity=quantity,
-            price=price
+            price=price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+            status="OPEN",
+        )
+        self.order_repo.create(order)
+        await self.db.commit()
+        await self.db.refresh(order)
+
+        order_book.add(resting_order(order))
+        logger.info(
+            f"{order_type} {side} placed: user={user_id} symbol={symbol} qty={quantity} "
+            f"price={order.price} order_id={order.id}"
         )
-        self.trade_repo.record_transaction(transaction)
+        return order
 
+    async def cancel_order(self, user_id: int, order_id: int) -> Order:
+        order = await self.order_repo.get_order_for_update(order_id)
+        if not order or order.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Order not found")
+        if order.status != "OPEN":
+            raise HTTPException(status_code=400, detail=f"Order is already {order.status.lower()}")
+
+        order.status = "CANCELLED"
+        await self.db.commit()
+        order_book.remove(order.id)
+        return order
+
+    async def fill_order(self, order_id: int, price: Decimal) -> Optional[Order]:
+        """Execute a triggered order at the tick price, or reject it if it can't be filled."""
+        order = await self.order_repo.get_order_for_update(order_id)
+        if not order or order.status != "OPEN":
+            return None
+
+        try:
+            if order.side == "BUY":
+                transaction, fees = await self._apply_buy(order.user_id, order.symbol, order.quantity, price)
+            else:
+                transaction, fees = await self._apply_sell(order.user_id, order.symbol, order.quantity, price)
+        except HTTPException as e:
+            await self.db.rollback()
+            order = await self.order_repo.get_order_for_update(order_id)
+            order.status = "REJECTED"
+            order.status_reason = str(e.detail)[:255]
+            await self.db.commit()
+            logger.info(f"Order {order_id} rejected at fill: {e.detail}")
+            return order
+
+        order.status = "FILLED"
+        order.filled_price = price
+        order.filled_at = datetime.now(timezone.utc)
         await self.db.commit()
-        await self.db.refresh(transaction)
 
         logger.info(
-            f"SELL executed: user={user_id} symbol={symbol} qty={quantity} "
-            f"price={price} fees={fees['total_fees']} net={net_revenue} market_open={market_open}"
+            f"{order.order_type} {order.side} filled: user={order.user_id} symbol={order.symbol} "
+            f"qty={order.quantity} price={price} fees={fees['total_fees']} order_id={order.id}"
         )
-        return transaction
+        return order
+
+
+def realize(trade_amount: Decimal, quantity: int, average_buy_price: Decimal, sell_fees: Decimal) -> Tuple[Decimal, Decimal]:
+    """Weighted-average cost basis and realized P&L (net of sell fees) for a sale."""
+    cost_basis = (Decimal(str(average_buy_price)) * quantity).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return cost_basis, trade_amount - cost_basis - sell_fees
+
+
+def resting_order(order: Order) -> RestingOrder:
+    return RestingOrder(
+        id=order.id,
+        user_id=order.user_id,
+        symbol=order.symbol,
+        side=order.side,
+        order_type=order.order_type,
+        quantity=order.quantity,
+        price=Decimal(str(order.price)),
+    )
@@ -1,10 +1,12 @@
 from typing import Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from decimal import Decimal
 
+from app.cache.cache_service import get_cached_watchlist, set_cached_watchlist, invalidate_watchlist
+from app.models.watchlist import Watchlist
 from app.repositories.watchlist_repo import WatchlistRepository
-from app.schemas.watchlist_schema import WatchlistItemCreate, WatchlistItemUpdate
-from app.services.nepse_service import NepseService
+from app.schemas.watchlist_schema import WatchlistItemCreate, WatchlistItemUpdate, WatchlistItemResponse
+from app.services.alert_engine import alert_engine
+from app.services.market_snapshot import market_snapshot
 
 class WatchlistService:
     def __init__(self, db: AsyncSession):
@@ -12,45 +14,49 @@ class WatchlistService:
         self.repo = WatchlistRepository(db)
 
     async def get_user_watchlist(self, user_id: int) -> Dict[str, Any]:
-        items = await self.repo.get_user_watchlist(user_id)
-        
-        # Optionally, merge live market data to provide current price
-        market_data = await NepseService.get_live_market()
-        live_prices = {}
-        if not market_data.get('is_stale', False) or market_data.get('live_market'):
-            for stock in market_data.get("live_market", []):
-                 live_prices[stock.get("symbol")] = stock.get("lastTradedPrice", 0)
-
-        results = []
-        for item in items:
-            results.append({
-                "id": item.id,
-                "user_id": item.user_id,
-                "symbol": item.symbol,
-                "target_price": item.target_price,
-                "stop_loss": item.stop_loss,
-                "added_at": item.added_at,
-                "current_price": float(live_prices.get(item.symbol, 0))
-            })
-            
-        return {"items": results}
+        # Rows come from the per-user cache (dropped on every write), prices from the live snapshot
+        items = await get_cached_watchlist(user_id)
+        if items is None:
+            items = [self._serialize(item) for item in await self.repo.get_user_watchlist(user_id)]
+            await set_cached_watchlist(user_id, items)
+
+        await market_snapshot.refresh_if_stale()
+        prices = market_snapshot.prices(item["symbol"] for item in items)
+        return {"items": [{**item, "current_price": prices[item["symbol"]]} for item in items]}
 
     async def add_item(self, user_id: int, item: WatchlistItemCreate) -> Dict[str, Any]:
-        existing = await self.repo.get_watchlist_item(user_id, item.symbol.upper())
-        if existing:
-            # If exists, update instead
-            update_data = WatchlistItemUpdate(target_price=item.target_price, stop_loss=item.stop_loss)
-            db_item = await self.repo.update_item(user_id, item.symbol.upper(), update_data)
-        else:
-            db_item = await self.repo.add_item(user_id, item)
-            
-        return db_item.__dict__
+        [saved] = await self.add_items(user_id, [item])
+        return saved
+
+    async def add_items(self, user_id: int, items: List[WatchlistItemCreate]) -> List[Dict[str, Any]]:
+        """Add or update several symbols in one transaction (existing ones are updated)."""
+        db_items = await self.repo.upsert_items(user_id, items)
+        await invalidate_watchlist(user_id)
+        for db_item in db_items:
+            alert_engine.set(user_id, db_item.symbol, db_item.target_price, db_item.stop_loss)
+        return [self._serialize(db_item) for db_item in db_items]
 
     async def update_item(self, user_id: int, symbol: str, data: WatchlistItemUpdate) -> Dict[str, Any]:
         db_item = await self.repo.update_item(user_id, symbol.upper(), data)
         if not db_item:
             raise ValueError(f"Symbol {symbol} not in watchlist")
-        return db_item.__dict__
+        await invalidate_watchlist(user_id)
+        alert_engine.set(user_id, db_item.symbol, db_item.target_price, db_item.stop_loss)
+        return self._serialize(db_item)
 
     async def remove_item(self, user_id: int, symbol: str) -> bool:
-        return await self.repo.remove_item(user_id, symbol.upper())
+        return await self.remove_items(user_id, [symbol]) > 0
+
+    async def remove_items(self, user_id: int, symbols: List[str]) -> int:
+        """Remove several symbols in one transaction. Returns how many were removed."""
+        symbols = [symbol.upper() for symbol in symbols]
+        removed = await self.repo.remove_items(user_id, symbols)
+        if removed:
+            await invalidate_watchlist(user_id)
+            for symbol in symbols:
+                alert_engine.remove(user_id, symbol)
+        return removed
+
+    @staticmethod
+    def _serialize(item: Watchlist) -> Dict[str, Any]:
+        return WatchlistItemResponse.model_validate(item).model_dump(mode="json")
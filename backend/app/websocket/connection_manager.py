@@ -1,29 +1,42 @@
 import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 from fastapi import WebSocket
 
 from app.services.market_service import MarketService
 from app.utils.logger import logger
 
 MAX_CONNECTIONS = 500  # Prevent DoS via WebSocket flood
+SEND_TIMEOUT = 2  # seconds — a stalled client must not hold up other sends
 
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.user_connections: Dict[int, Set[WebSocket]] = {}
+        self._socket_users: Dict[WebSocket, int] = {}
         self._broadcast_task: asyncio.Task = None
 
-    async def connect(self, websocket: WebSocket) -> bool:
+    async def connect(self, websocket: WebSocket, user_id: Optional[int] = None) -> bool:
         if len(self.active_connections) >= MAX_CONNECTIONS:
             logger.warning(f"WebSocket connection rejected: max {MAX_CONNECTIONS} reached")
             await websocket.close(code=1013, reason="Server capacity reached")
             return False
         await websocket.accept()
         self.active_connections.append(websocket)
+        if user_id is not None:
+            self.user_connections.setdefault(user_id, set()).add(websocket)
+            self._socket_users[websocket] = user_id
         logger.info(f"Client connected. Active: {len(self.active_connections)}")
         return True
 
     def disconnect(self, websocket: WebSocket):
+        user_id = self._socket_users.pop(websocket, None)
+        if user_id is not None:
+            sockets = self.user_connections.get(user_id)
+            if sockets:
+                sockets.discard(websocket)
+                if not sockets:
+                    del self.user_connections[user_id]
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
             logger.info(f"Client disconnected. Active: {len(self.active_connections)}")
@@ -40,6 +53,18 @@ class ConnectionManager:
         for conn in disconnected:
             self.disconnect(conn)
 
+    async def send_to_user(self, user_id: int, message: Dict[str, Any]) -> int:
+        """Push a message to every live socket of one user. Returns how many received it."""
+        delivered = 0
+        for connection in list(self.user_connections.get(user_id, ())):
+            try:
+                await asyncio.wait_for(connection.send_json(message), SEND_TIMEOUT)
+                delivered += 1
+            except Exception as e:
+                logger.warning(f"Failed to send to user {user_id}: {e}")
+                self.disconnect(connection)
+        return delivered
+
     async def _broadcast_loop(self):
         """Broadcast loop that fetches data (with caching) and pushes to clients."""
         while True:
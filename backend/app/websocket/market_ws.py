@@ -1,6 +1,7 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from app.websocket.connection_manager import manager
 from app.core.jwt_handler import decode_access_token
+from app.core.token_revocation import token_revocation
 from app.utils.logger import logger
 
 router = APIRouter()
@@ -15,12 +16,15 @@ async def websocket_endpoint(websocket: WebSocket, token: str = Query(default=No
     if token:
         try:
             payload = decode_access_token(token)
-            user_id = payload.get("sub")
+            if not await token_revocation.is_revoked(payload):
+                user_id = int(payload.get("sub"))
+            else:
+                logger.warning("WebSocket connection with revoked token")
         except Exception:
             # Allow connection but mark as unauthenticated
             logger.warning("WebSocket connection with invalid token")
     
-    connected = await manager.connect(websocket)
+    connected = await manager.connect(websocket, user_id)
     if not connected:
         return  # Connection was rejected (capacity full)
 
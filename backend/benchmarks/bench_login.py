@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark
+==========================
+Fires concurrent POST /auth/login requests through the real auth router and
+reports logins/sec plus the worst event-loop stall seen by a 10 ms heartbeat,
+first with bcrypt run inline on the event loop (the previous behaviour) and
+then on the PasswordHasher thread pool.
+
+Usage:
+    python benchmarks/bench_login.py
+    python benchmarks/bench_login.py --logins 200 --concurrency 50 --rounds 12 --workers 8
+
+The SQLite file is dropped and recreated — never point it at real data.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from fastapi import FastAPI
+from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api import auth
+from app.core.hashing import PasswordHasher
+from app.database.base import Base
+from app.database.session import get_db
+import app.models  # noqa: F401 — register every table on Base.metadata
+from app.models.user import User
+
+EMAIL = "bench@example.com"
+PASSWORD = "correct horse battery staple"
+
+
+async def _setup(engine, context: CryptContext):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    async with Session() as db:
+        db.add(User(email=EMAIL, password_hash=context.hash(PASSWORD)))
+        await db.commit()
+    return Session
+
+
+async def _heartbeat(stalls: list, stop: asyncio.Event, interval: float = 0.01):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        stalls.append(loop.time() - start - interval)
+
+
+async def _run(client: httpx.AsyncClient, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            response = await client.post("/auth/login", data={"username": EMAIL, "password": PASSWORD})
+            response.raise_for_status()
+
+    stalls: list = []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stalls, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await heartbeat
+    return logins / elapsed, max(stalls, default=0.0)
+
+
+async def main(logins: int, concurrency: int, rounds: int, workers: int):
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+    engine = create_async_engine("sqlite+aiosqlite:///./bench_login.db")
+    Session = await _setup(engine, context)
+
+    async def bench_db():
+        async with Session() as db:
+            yield db
+
+    api = FastAPI()
+    api.include_router(auth.router, prefix="/auth")
+    api.dependency_overrides[get_db] = bench_db
+
+    async def inline(self, fn, *args):
+        return fn(*args)
+
+    print(f"logins={logins} concurrency={concurrency} bcrypt rounds={rounds} workers={workers}")
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, run_inline in (("inline (blocks event loop)", True), ("thread pool", False)):
+            hasher = PasswordHasher(context, max_workers=workers)
+            patches = [patch.object(auth, "password_hasher", hasher)]
+            if run_inline:
+                patches.append(patch.object(PasswordHasher, "_run", inline))
+            for p in patches:
+                p.start()
+            try:
+                await _run(client, min(concurrency, logins), concurrency)  # warm-up
+                rate, stall = await _run(client, logins, concurrency)
+            finally:
+                for p in reversed(patches):
+                    p.stop()
+                hasher.shutdown()
+            print(f"  {name:<28} {rate:>8,.1f} logins/sec   worst loop stall {stall * 1000:>8,.0f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency, args.rounds, args.workers))
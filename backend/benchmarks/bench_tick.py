@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Live tick memory and allocation benchmark
+=========================================
+Replays one live market tick through every consumer, first with the previous
+dict pipeline and then with LiveTick records, and reports per tick:
+
+- time
+- peak traced memory
+- memory and allocated blocks still held once the tick is in place
+
+The previous pipeline built a five-key dict per stock and JSON-encoded the
+payload twice into the cache. Every reader then decoded it again: the tick
+feed, the WebSocket loop and each trading or portfolio request. Each tick
+handler (snapshot, order matcher, leaderboard, alerts) built its own
+symbol-to-row or symbol-to-price dict.
+
+The record pipeline parses into slotted StockQuotes and caches a compact
+positional encoding. Each process decodes that once per tick. Consumers
+share the tick's index, its price map and its wire payload, each built at
+most once.
+
+Redis is replaced by a dict, so only the in-process work is measured.
+
+Usage:
+    python benchmarks/bench_tick.py
+    python benchmarks/bench_tick.py --symbols 600 --requests 10 --ticks 200
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.ingestion import LiveTick
+from app.ingestion.source import parse_quotes
+
+
+def nepse_rows(symbols: int):
+    """What AsyncNepse.getLiveMarket returns, with its many unused fields."""
+    return [
+        {
+            "symbol": f"SYM{i:04d}", "securityName": f"Company {i} Limited", "securityId": 1000 + i,
+            "lastTradedPrice": 500.0 + i % 97, "previousClose": 495.0 + i % 89, "percentageChange": 1.01,
+            "totalTradeQuantity": 1000 + i, "totalTradeValue": 505000.0 + i, "highPrice": 510.0,
+            "lowPrice": 490.0, "openPrice": 500.0, "lastUpdatedDateTime": "2026-01-05T14:59:59",
+        }
+        for i in range(symbols)
+    ]
+
+
+# ─── Previous dict pipeline ─────────────────────────────────
+
+def dict_tick(raw, cache, requests: int):
+    formatted = []
+    for stock in raw:
+        ltp = float(stock.get("lastTradedPrice", 0))
+        prev = float(stock.get("previousClose", 0))
+        formatted.append({
+            "symbol": stock.get("symbol"),
+            "lastTradedPrice": ltp,
+            "pointChange": round(ltp - prev, 2),
+            "percentageChange": float(stock.get("percentageChange", 0)),
+            "volume": int(stock.get("totalTradeQuantity", 0)),
+        })
+    result = {"live_market": formatted, "is_stale": False}
+    cache["live"] = json.dumps(result)
+    cache["backup"] = json.dumps(result)
+
+    # Tick feed: decode, then every handler indexes the rows itself
+    tick = json.loads(cache["live"])
+    snapshot = {row.get("symbol"): row for row in tick["live_market"]}
+    handler_prices = [
+        {row.get("symbol"): row.get("lastTradedPrice", 0) for row in tick.get("live_market", [])}
+        for _ in ("order matcher", "leaderboard", "alerts")
+    ]
+    # WebSocket loop: decode again
+    ws_payload = json.loads(cache["live"])
+    # Trading / portfolio requests: decode and index per request
+    held = []
+    for _ in range(requests):
+        market = json.loads(cache["live"])
+        index = {s.get("symbol"): s for s in market["live_market"]}
+        held.append(Decimal(str(index["SYM0001"].get("lastTradedPrice", 0))))
+    return snapshot, handler_prices, ws_payload, held
+
+
+# ─── Record pipeline ────────────────────────────────────────
+
+def record_tick(raw, cache, requests: int, memo: dict):
+    tick = LiveTick(parse_quotes(raw))
+    encoded = json.dumps(tick.to_compact(), separators=(",", ":"))
+    cache["live"] = cache["backup"] = encoded
+
+    def read() -> LiveTick:
+        # NepseService.get_live_tick: decode only when the cached tick changed
+        cached = cache["live"]
+        if cached != memo.get("source"):
+            memo["source"], memo["tick"] = cached, LiveTick.from_json(cached)
+        return memo["tick"]
+
+    feed_tick = read()
+    snapshot = feed_tick
+    handler_prices = [feed_tick.prices() for _ in ("order matcher", "leaderboard", "alerts")]
+    ws_payload = read().to_payload()
+    held = [Decimal(str(read().get("SYM0001").ltp)) for _ in range(requests)]
+    return snapshot, handler_prices, ws_payload, held
+
+
+def measure(name: str, run, ticks: int, reset=lambda: None):
+    run()  # warm-up
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        run()
+    per_tick = (time.perf_counter() - start) / ticks
+
+    reset()  # count the tick's own memory, not just its difference from the last one
+    gc.collect()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    kept = run()
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+    del kept
+    print(
+        f"  {name:<16} {per_tick * 1e3:>8.2f} ms/tick   peak {(peak - base) / 1024:>8,.0f} KB   "
+        f"held {(current - base) / 1024:>8,.0f} KB in {blocks:>8,} blocks"
+    )
+
+
+def main(symbols: int, requests: int, ticks: int):
+    raw = nepse_rows(symbols)
+    print(f"symbols={symbols} requests per tick={requests} ticks={ticks}")
+    measure("dict pipeline", lambda: dict_tick(raw, {}, requests), ticks)
+    memo: dict = {}
+    measure("LiveTick records", lambda: record_tick(raw, {}, requests, memo), ticks, reset=memo.clear)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=350)
+    parser.add_argument("--requests", type=int, default=4)
+    parser.add_argument("--ticks", type=int, default=100)
+    args = parser.parse_args()
+    main(args.symbols, args.requests, args.ticks)
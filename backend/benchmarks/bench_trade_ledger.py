@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Trade ledger write benchmark
+============================
+Compares trades/sec of the previous ORM path (SELECT ... FOR UPDATE, modify,
+flush, commit, refresh) with the ledger path (conditional UPDATE ... RETURNING
+plus INSERT ... RETURNING) used by TradingService.
+
+Usage:
+    python benchmarks/bench_trade_ledger.py                     # SQLite file
+    python benchmarks/bench_trade_ledger.py --url postgresql+asyncpg://user:pw@localhost/bench
+    python benchmarks/bench_trade_ledger.py --trades 5000 --users 50
+
+The target database is dropped and recreated — never point it at real data.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.base import Base
+import app.models  # noqa: F401 — register every table on Base.metadata
+from app.models.portfolio import Portfolio
+from app.models.stock import Stock
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.services.trading_service import TradingService, calculate_total_fees
+
+SYMBOLS = ["NABIL", "NICA", "SCB", "HBL", "EBL", "NTC", "UPPER", "CHCL"]
+PRICE = Decimal("512.30")
+QUANTITY = 10
+
+
+async def _setup(engine, users: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    async with Session() as db:
+        db.add_all([Stock(symbol=s, company_name=s) for s in SYMBOLS])
+        db.add_all([User(id=i, email=f"bench{i}@example.com", password_hash="x") for i in range(1, users + 1)])
+        await db.flush()
+        db.add_all([Wallet(user_id=i, balance=Decimal("9999999999.00")) for i in range(1, users + 1)])
+        await db.commit()
+    return Session
+
+
+async def _orm_buy(db: AsyncSession, user_id: int, symbol: str):
+    """The pre-ledger execute_buy write path."""
+    trade_amount = PRICE * QUANTITY
+    total_cost = trade_amount + calculate_total_fees(trade_amount)["total_fees"]
+    wallet = (await db.execute(select(Wallet).where(Wallet.user_id == user_id).with_for_update())).scalar_one()
+    portfolio = (await db.execute(
+        select(Portfolio).where(Portfolio.user_id == user_id, Portfolio.symbol == symbol).with_for_update()
+    )).scalar_one_or_none()
+    if portfolio:
+        total_value = portfolio.quantity * portfolio.average_buy_price + trade_amount
+        portfolio.quantity += QUANTITY
+        portfolio.average_buy_price = total_value / portfolio.quantity
+    else:
+        db.add(Portfolio(user_id=user_id, symbol=symbol, quantity=QUANTITY, average_buy_price=PRICE))
+    wallet.balance -= total_cost
+    transaction = Transaction(user_id=user_id, symbol=symbol, transaction_type="BUY", quantity=QUANTITY, price=PRICE)
+    db.add(transaction)
+    await db.commit()
+    await db.refresh(transaction)
+
+
+async def _ledger_buy(db: AsyncSession, user_id: int, symbol: str):
+    await TradingService(db)._apply_buy(user_id, symbol, QUANTITY, PRICE)
+    await db.commit()
+
+
+async def _run(Session, trade_fn, trades: int, users: int) -> float:
+    start = time.perf_counter()
+    async with Session() as db:
+        for i in range(trades):
+            await trade_fn(db, i % users + 1, SYMBOLS[i % len(SYMBOLS)])
+    return trades / (time.perf_counter() - start)
+
+
+async def main(url: str, trades: int, users: int):
+    engine_kwargs = {} if url.startswith("sqlite") else {"pool_size": 5}
+    engine = create_async_engine(url, **engine_kwargs)
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}  trades={trades} users={users}")
+    for name, fn in (("orm (select-for-update + refresh)", _orm_buy), ("ledger (update/insert returning)", _ledger_buy)):
+        Session = await _setup(engine, users)
+        await _run(Session, fn, min(50, trades), users)  # warm-up
+        rate = await _run(Session, fn, trades, users)
+        print(f"  {name:<36} {rate:>10,.0f} trades/sec")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./bench_ledger.db")
+    parser.add_argument("--trades", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.trades, args.users))
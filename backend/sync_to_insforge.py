@@ -15,16 +15,23 @@ Usage:
 """
 
 import asyncio
+import hashlib
 import json
 import sys
 import os
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.ingestion import DatabaseSink, MarketData, MarketSink, RedisCacheSink, fetch_market, get_nepse, publish
+
 # ---------------------------------------------------------------------------
 # Configuration (loaded from environment variables)
 # ---------------------------------------------------------------------------
@@ -42,6 +49,37 @@ HEADERS = {
     "Content-Type": "application/json",
 }
 
+# Local state remembered between runs (article details, ...)
+SYNC_STATE_PATH = os.environ.get(
+    "SYNC_STATE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sync_state.db")
+)
+
+DETAIL_CONCURRENCY = 5          # article pages fetched at once
+DETAIL_RETRY_AFTER = 6 * 3600   # seconds before a failed article page is tried again
+
+HISTORY_MAX_CONCURRENCY = 8     # upper bound for concurrent NEPSE history requests
+HISTORY_TARGET_LATENCY = 3.0    # seconds; slower responses shrink the window like errors
+HISTORY_MAX_ATTEMPTS = 3        # per symbol and run
+HISTORY_RECHECK_AFTER = 12 * 3600  # symbols checked more recently are skipped (resume)
+
+# Consumers fed by each market fetch besides InsForge: "redis" (the API cache)
+# and/or "database" (the API's stocks table), comma-separated
+SYNC_SINKS = [name.strip() for name in os.environ.get("SYNC_SINKS", "").split(",") if name.strip()]
+
+PRICE_INTERVAL = 120            # daemon price sync period during market hours (seconds)
+OFF_HOURS_PRICE_INTERVAL = 900  # ... and outside them
+
+# RPC uploads: compact JSON bodies of at most RPC_CHUNK_BYTES, RPC_MAX_IN_FLIGHT at
+# once; 5xx/timeouts are retried (the sync_* functions upsert, so resending is safe)
+RPC_CHUNK_BYTES = 256 * 1024
+RPC_MAX_IN_FLIGHT = 4
+RPC_MAX_ATTEMPTS = 4
+RPC_TIMEOUT = 30
+RPC_RETRY_BACKOFF = 0.5         # seconds, doubled per attempt (plus jitter)
+
+# One pooled client serves every request; idle connections are kept for reuse
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=300)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
@@ -49,173 +87,402 @@ logging.basicConfig(
 )
 log = logging.getLogger("sync")
 
+# ---------------------------------------------------------------------------
+# Local sync state
+# ---------------------------------------------------------------------------
+class SyncState:
+    """SQLite file remembering what earlier runs already fetched."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS article_details (
+            url        TEXT PRIMARY KEY,
+            image_url  TEXT,
+            content    TEXT,
+            status     TEXT NOT NULL,  -- 'ok', 'gone' (4xx, never retried) or 'error'
+            fetched_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS history_marks (
+            symbol     TEXT PRIMARY KEY,
+            last_date  TEXT,           -- newest business date uploaded to InsForge
+            checked_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS pushed_rows (
+            kind TEXT NOT NULL,         -- 'stocks', 'market_summary', 'sub_indices'
+            key  TEXT NOT NULL,
+            hash TEXT NOT NULL,         -- of the row as last accepted by InsForge
+            PRIMARY KEY (kind, key)
+        );
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.conn = sqlite3.connect(path or SYNC_STATE_PATH)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- Article details ----------
+    def get_article_details(self, urls: Iterable[str]) -> Dict[str, dict]:
+        """Cached details for the given URLs that should not be fetched again."""
+        urls = list(urls)
+        if not urls:
+            return {}
+        retry_before = time.time() - DETAIL_RETRY_AFTER
+        placeholders = ",".join("?" * len(urls))
+        rows = self.conn.execute(
+            f"SELECT url, image_url, content, status, fetched_at FROM article_details WHERE url IN ({placeholders})",
+            urls,
+        ).fetchall()
+        return {
+            r["url"]: {"image_url": r["image_url"], "content": r["content"], "status": r["status"]}
+            for r in rows
+            if r["status"] != "error" or r["fetched_at"] >= retry_before
+        }
+
+    def save_article_details(self, details: Dict[str, dict]):
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO article_details (url, image_url, content, status, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(url, d.get("image_url"), d.get("content"), d["status"], now) for url, d in details.items()],
+            )
+
+    # ---------- Historical price high-water marks ----------
+    def get_history_marks(self) -> Dict[str, sqlite3.Row]:
+        rows = self.conn.execute("SELECT symbol, last_date, checked_at FROM history_marks").fetchall()
+        return {r["symbol"]: r for r in rows}
+
+    def set_history_mark(self, symbol: str, last_date: Optional[str]):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO history_marks (symbol, last_date, checked_at) VALUES (?, ?, ?)",
+                (symbol, last_date, time.time()),
+            )
+
+    # ---------- Last-pushed rows (change data capture) ----------
+    @staticmethod
+    def row_hash(row: dict) -> str:
+        return hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()
+
+    def changed_rows(self, kind: str, rows: Dict[str, dict]) -> Dict[str, dict]:
+        """The rows (by key) that are new or differ from the last push of ``kind``."""
+        pushed = dict(self.conn.execute("SELECT key, hash FROM pushed_rows WHERE kind = ?", (kind,)).fetchall())
+        return {key: row for key, row in rows.items() if pushed.get(key) != self.row_hash(row)}
+
+    def mark_pushed(self, kind: str, rows: Dict[str, dict]):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pushed_rows (kind, key, hash) VALUES (?, ?, ?)",
+                [(kind, key, self.row_hash(row)) for key, row in rows.items()],
+            )
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def bounded_map(fn: Callable[[T], Awaitable[R]], items: Iterable[T], concurrency: int) -> List[R]:
+    """``fn`` over ``items`` with at most ``concurrency`` calls in flight.
+
+    A sliding window: a new call starts as soon as any running one finishes,
+    instead of waiting for a whole batch. Results keep the order of ``items``.
+    """
+    items = list(items)
+    results: List[Any] = [None] * len(items)
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < len(items):
+            i = next_index
+            next_index += 1
+            results[i] = await fn(items[i])
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(items)))))
+    return results
+
+
+class AdaptiveLimiter:
+    """Concurrency limit tuned by AIMD from the outcome of each call.
+
+    Every fast success grows the window by about one slot per window's worth
+    of calls; an error or a call slower than ``target_latency`` halves it.
+    Errors also pause new calls for an exponentially growing cool-down.
+    """
+
+    def __init__(self, max_limit: int, target_latency: float, initial: float = 2.0):
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.limit = min(float(max_limit), initial)
+        self.in_flight = 0
+        self._cooldown = 0.0
+        self._resume_at = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def release(self, latency: float, ok: bool):
+        async with self._cond:
+            self.in_flight -= 1
+            if ok and latency <= self.target_latency:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                self._cooldown = 0.0
+            else:
+                self.limit = max(1.0, self.limit / 2)
+                if not ok:
+                    self._cooldown = min(30.0, self._cooldown * 2 or 1.0)
+                    self._resume_at = time.monotonic() + self._cooldown
+            self._cond.notify_all()
+
+
+def make_client() -> httpx.AsyncClient:
+    """HTTP/2 client with a keep-alive pool, shared by all sync tasks."""
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=30)
+
+
 # ---------------------------------------------------------------------------
 # InsForge RPC helper
 # ---------------------------------------------------------------------------
+def _compact(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+async def _post_rpc(client: httpx.AsyncClient, fn_name: str, body: bytes) -> dict:
+    """POST an encoded body to an RPC, retrying 5xx responses and timeouts."""
+    url = f"{RPC_URL}/{fn_name}"
+    for attempt in range(1, RPC_MAX_ATTEMPTS + 1):
+        try:
+            resp = await client.post(url, content=body, headers=HEADERS, timeout=RPC_TIMEOUT)
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            if resp.status_code < 400:
+                try:
+                    return resp.json()
+                except Exception:
+                    return {"raw": resp.text[:200]}
+            error = f"({resp.status_code}): {resp.text[:500]}"
+            if resp.status_code < 500:
+                break  # the request itself is wrong; resending will not help
+        if attempt < RPC_MAX_ATTEMPTS:
+            delay = RPC_RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(1, 1.5)
+            log.warning(f"RPC {fn_name} attempt {attempt} failed {error}; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    log.error(f"RPC {fn_name} failed {error}")
+    return {"error": error}
+
+
 async def call_rpc(client: httpx.AsyncClient, fn_name: str, payload: Any) -> dict:
     """Call an InsForge SECURITY DEFINER function via REST RPC."""
-    url = f"{RPC_URL}/{fn_name}"
-    resp = await client.post(url, json=payload, headers=HEADERS, timeout=60)
-    if resp.status_code >= 400:
-        log.error(f"RPC {fn_name} failed ({resp.status_code}): {resp.text[:500]}")
-        return {"error": resp.text[:500]}
+    return await _post_rpc(client, fn_name, _compact(payload))
+
+
+def chunk_rows(rows: Iterable[dict], max_bytes: int) -> Iterable[List[bytes]]:
+    """Group rows, encoded once as compact JSON, into chunks of at most ``max_bytes``.
+
+    A row larger than ``max_bytes`` on its own is sent as a chunk by itself.
+    """
+    chunk: List[bytes] = []
+    size = 0
+    for row in rows:
+        encoded = _compact(row)
+        if chunk and size + len(encoded) + 1 > max_bytes:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(encoded)
+        size += len(encoded) + 1  # the separating comma
+    if chunk:
+        yield chunk
+
+
+async def upload_rows(client: httpx.AsyncClient, fn_name: str, rows: List[dict], key: str = "data") -> dict:
+    """Send ``rows`` to an RPC as ``{key: [...]}`` in byte-sized chunks, several at a time.
+
+    Returns the upload totals, with an ``error`` entry if any chunk failed
+    after its retries.
+    """
+    prefix, suffix = f'{{"{key}":['.encode(), b"]}"
+    bodies = [prefix + b",".join(chunk) + suffix for chunk in chunk_rows(rows, RPC_CHUNK_BYTES)]
+    started = time.monotonic()
+    results = await bounded_map(lambda body: _post_rpc(client, fn_name, body), bodies, RPC_MAX_IN_FLIGHT)
+    elapsed = max(time.monotonic() - started, 1e-6)
+
+    total_bytes = sum(len(b) for b in bodies)
+    failed = sum(1 for r in results if isinstance(r, dict) and "error" in r)
+    summary = {"rows": len(rows), "chunks": len(bodies), "bytes": total_bytes}
+    if failed:
+        summary["error"] = f"{failed} of {len(bodies)} chunks failed"
+    log.info(
+        f"  ⬆ {fn_name}: {len(rows)} rows in {len(bodies)} chunks, {total_bytes / 1024:.0f} KB "
+        f"in {elapsed:.1f}s ({len(rows) / elapsed:.0f} rows/s, {total_bytes / 1024 / elapsed:.0f} KB/s)"
+    )
+    return summary
+
+
+async def push_changed(
+    kind: str, rows: Dict[str, dict], send: Callable[[List[dict]], Awaitable[dict]], only_changed: bool = True,
+) -> Optional[dict]:
+    """Send the rows of ``kind`` that changed since the last successful push.
+
+    ``send`` makes the RPC call for a list of rows. Returns its result, or
+    None when nothing changed.
+    """
+    state = SyncState()
     try:
-        return resp.json()
-    except Exception:
-        return {"raw": resp.text[:200]}
+        changed = state.changed_rows(kind, rows) if only_changed else rows
+        if not changed:
+            log.info(f"  {kind}: unchanged, nothing to push")
+            return None
+        res = await send(list(changed.values()))
+        if not (isinstance(res, dict) and "error" in res):
+            state.mark_pushed(kind, changed)
+        return res
+    finally:
+        state.close()
 
 
 # ===========================================================================
 # 1. NEPSE Market Data  (via NepseUnofficialApi)
 # ===========================================================================
-async def fetch_and_sync_market(client: httpx.AsyncClient):
-    """Fetch live market data from NEPSE and push to InsForge."""
-    from nepse import AsyncNepse
+class InsForgeSink(MarketSink):
+    """InsForge's stocks, market summary and sub-index tables, via RPC.
+
+    With ``only_changed``, rows identical to the last successful push (per the
+    local sync state) are not sent again.
+    """
+    name = "insforge"
+
+    def __init__(self, client: httpx.AsyncClient, only_changed: bool = True):
+        self.client = client
+        self.only_changed = only_changed
+
+    async def publish(self, data: MarketData):
+        client = self.client
+
+        # ---------- Stock records ----------
+        stocks_payload: List[dict] = []
+        for q in data.stocks:
+            company = data.companies.get(q.symbol)
+            stocks_payload.append({
+                "symbol": q.symbol,
+                "company_name": company.name if company else q.symbol,
+                "sector": company.sector if company else None,
+                "ltp": q.ltp,
+                "previous_close": q.previous_close,
+                "point_change": q.point_change,
+                "percentage_change": round(q.percentage_change, 2),
+                "volume": q.volume,
+                "turnover": round(q.turnover, 2),
+                "high": q.high,
+                "low": q.low,
+                "open_price": q.open_price,
+            })
+
+        if stocks_payload:
+            res = await push_changed(
+                "stocks", {s["symbol"]: s for s in stocks_payload},
+                lambda rows: upload_rows(client, "sync_stocks", rows, key="stock_data"), self.only_changed,
+            )
+            if res is not None:
+                log.info(f"📊 Stocks synced: {res}")
+
+        # ---------- Market summary ----------
+        summary = data.summary
+        ms_row = {
+            "nepse_index": summary.nepse_index,
+            "percentage_change": round(summary.percentage_change, 2),
+            "point_change": round(summary.point_change, 2),
+            "total_turnover": summary.total_turnover,
+            "total_traded_shares": int(summary.total_traded_shares),
+            "total_transactions": summary.total_transactions,
+            "market_status": "Open" if summary.is_open else "Closed",
+        }
+        res = await push_changed(
+            "market_summary", {"NEPSE": ms_row},
+            lambda rows: call_rpc(client, "sync_market_summary", {"data": rows[0]}), self.only_changed,
+        )
+        if res is not None:
+            log.info(f"📈 Market summary synced: {res}")
+
+        # ---------- Sub-indices ----------
+        sub_payload = [
+            {
+                "sector": s.sector,
+                "value": round(s.value, 2),
+                "change": round(s.change, 2),
+                "percentage_change": round(s.percentage_change, 2),
+            }
+            for s in data.sub_indices
+        ]
+        if sub_payload:
+            res = await push_changed(
+                "sub_indices", {s["sector"]: s for s in sub_payload},
+                lambda rows: upload_rows(client, "sync_sub_indices", rows), self.only_changed,
+            )
+            if res is not None:
+                log.info(f"🏦 Sub-indices synced: {res}")
 
-    log.info("⏳ Connecting to NEPSE API...")
-    n = AsyncNepse()
-    n.setTLSVerification(False)
 
+LOCAL_SINKS = {"redis": RedisCacheSink, "database": DatabaseSink}
+
+if set(SYNC_SINKS) - LOCAL_SINKS.keys():
+    print(f"ERROR: unknown SYNC_SINKS {sorted(set(SYNC_SINKS) - LOCAL_SINKS.keys())}; use {sorted(LOCAL_SINKS)}.")
+    sys.exit(1)
+
+
+async def fetch_and_sync_market(client: httpx.AsyncClient, only_changed: bool = True, nepse=None):
+    """Fetch live market data from NEPSE once and publish it to InsForge and any SYNC_SINKS."""
     try:
-        # Parallel fetch from NEPSE
-        (
-            summary_raw,
-            indices_raw,
-            subindices_raw,
-            gainers_raw,
-            losers_raw,
-            turnovers_raw,
-            is_open,
-            live_data,
-            company_list,
-        ) = await asyncio.gather(
-            n.getSummary(),
-            n.getNepseIndex(),
-            n.getNepseSubIndices(),
-            n.getTopGainers(),
-            n.getTopLosers(),
-            n.getTopTenTurnoverScrips(),
-            n.isNepseOpen(),
-            n.getLiveMarket(),
-            n.getCompanyList(),
-        )
-        log.info(f"✅ NEPSE data fetched — {len(live_data)} stocks, market {'OPEN' if is_open else 'CLOSED'}")
+        data = await fetch_market(nepse or get_nepse(), companies=True)
+        log.info(f"✅ NEPSE data fetched — {len(data.stocks)} stocks, market {'OPEN' if data.summary.is_open else 'CLOSED'}")
     except Exception as e:
         log.error(f"❌ Failed to fetch from NEPSE: {e}")
         return
 
-    # ---------- Build company lookup ----------
-    company_map: Dict[str, dict] = {}
-    for c in company_list:
-        sym = c.get("symbol")
-        if sym:
-            company_map[sym] = {
-                "name": c.get("securityName", sym),
-                "sector": c.get("sectorName"),
-            }
-
-    # ---------- Build stock records ----------
-    stocks_payload: List[dict] = []
-    for stock in live_data:
-        sym = stock.get("symbol")
-        if not sym:
-            continue
-        ltp = float(stock.get("lastTradedPrice", 0) or 0)
-        prev = float(stock.get("previousClose", 0) or 0)
-        pct = float(stock.get("percentageChange", 0) or 0)
-        vol = int(stock.get("totalTradeQuantity", 0) or 0)
-        turnover = float(stock.get("totalTradeValue", 0) or 0)
-        high = float(stock.get("highPrice", 0) or 0)
-        low = float(stock.get("lowPrice", 0) or 0)
-        open_price = float(stock.get("openPrice", 0) or 0)
-        info = company_map.get(sym, {})
-        stocks_payload.append({
-            "symbol": sym,
-            "company_name": info.get("name", sym),
-            "sector": info.get("sector"),
-            "ltp": ltp,
-            "previous_close": prev,
-            "point_change": round(ltp - prev, 2),
-            "percentage_change": round(pct, 2),
-            "volume": vol,
-            "turnover": round(turnover, 2),
-            "high": high,
-            "low": low,
-            "open_price": open_price,
-        })
-
-    if stocks_payload:
-        res = await call_rpc(client, "sync_stocks", {"stock_data": stocks_payload})
-        log.info(f"📊 Stocks synced: {res}")
-
-    # ---------- Market summary ----------
-    summary_dict = {}
-    if isinstance(summary_raw, list):
-        summary_dict = {item.get("detail", ""): item.get("value", "") for item in summary_raw}
-
-    nepse_index_data = next((item for item in (indices_raw or []) if item.get("index") == "NEPSE Index"), None)
-    nepse_index_val = float(nepse_index_data.get("currentValue", 0)) if nepse_index_data else 0.0
-    nepse_point_change = float(nepse_index_data.get("change", 0)) if nepse_index_data else 0.0
-    nepse_pct = float(nepse_index_data.get("perChange", 0)) if nepse_index_data else 0.0
-
-    def parse_float(val) -> float:
-        try:
-            return float(str(val).replace(",", "").replace("Rs", "").replace(":", "").strip())
-        except:
-            return 0.0
-
-    total_turnover = parse_float(summary_dict.get("Total Turnover Rs:", "0"))
-    total_traded = parse_float(summary_dict.get("Total Traded Shares", "0"))
-    total_txn = int(parse_float(summary_dict.get("Total Transactions", "0")))
-
-    ms_payload = {
-        "data": {
-            "nepse_index": nepse_index_val,
-            "percentage_change": round(nepse_pct, 2),
-            "point_change": round(nepse_point_change, 2),
-            "total_turnover": total_turnover,
-            "total_traded_shares": int(total_traded),
-            "total_transactions": total_txn,
-            "market_status": "Open" if is_open else "Closed",
-        }
-    }
-    res = await call_rpc(client, "sync_market_summary", ms_payload)
-    log.info(f"📈 Market summary synced: {res}")
-
-    # ---------- Sub-indices ----------
-    sub_payload: List[dict] = []
-    for item in (subindices_raw or []):
-        sector = (item.get("index", "").replace(" SubIndex", "").replace(" Index", "")).strip()
-        if not sector:
-            continue
-        value = float(item.get("currentValue", 0) or 0)
-        change = float(item.get("change", 0) or 0)
-        pct_change = float(item.get("percentChange", 0) or 0)
-        sub_payload.append({
-            "sector": sector,
-            "value": round(value, 2),
-            "change": round(change, 2),
-            "percentage_change": round(pct_change, 2),
-        })
-
-    if sub_payload:
-        res = await call_rpc(client, "sync_sub_indices", {"data": sub_payload})
-        log.info(f"🏦 Sub-indices synced: {res}")
+    sinks = [InsForgeSink(client, only_changed)] + [LOCAL_SINKS[name]() for name in SYNC_SINKS]
+    await publish(data, sinks)
 
 
 # ===========================================================================
 # 2. Historical Prices
 # ===========================================================================
-async def fetch_and_sync_history(client: httpx.AsyncClient, symbols: Optional[List[str]] = None, limit: int = 20):
-    """Fetch historical OHLCV for top stocks and push to InsForge."""
-    from nepse import AsyncNepse
+def _history_row(symbol: str, item: dict) -> Optional[dict]:
+    biz_date = item.get("businessDate")
+    if not biz_date:
+        return None
+    return {
+        "symbol": symbol,
+        "date": biz_date,
+        "open": float(item.get("openPrice", 0) or item.get("closePrice", 0) or 0),
+        "high": float(item.get("highPrice", 0) or 0),
+        "low": float(item.get("lowPrice", 0) or 0),
+        "close": float(item.get("closePrice", 0) or 0),
+        "volume": int(item.get("totalTradedQuantity", 0) or 0),
+    }
+
+
+async def fetch_and_sync_history(client: httpx.AsyncClient, symbols: Optional[List[str]] = None, nepse=None):
+    """Backfill historical OHLCV for every listed stock and push to InsForge.
 
+    Symbols are fetched by a pool of workers whose concurrency adapts to
+    NEPSE's errors and latency. Each symbol's newest uploaded date is kept in
+    the local sync state, so later runs only request and upload newer days,
+    and a run that was interrupted skips the symbols it already finished.
+    """
     if not symbols:
-        # Fetch top symbols from InsForge
+        # Every listed symbol, as pushed by the market sync
         resp = await client.get(
             f"{INSFORGE_BASE_URL}/api/database/records/stocks",
             headers=HEADERS,
-            params={"order": "turnover.desc", "limit": str(limit), "select": "symbol"},
+            params={"order": "symbol.asc", "limit": "5000", "select": "symbol"},
         )
         if resp.status_code == 200:
             symbols = [r["symbol"] for r in resp.json() if r.get("symbol")]
@@ -227,40 +494,65 @@ async def fetch_and_sync_history(client: httpx.AsyncClient, symbols: Optional[Li
         log.warning("No symbols to sync history for")
         return
 
-    log.info(f"⏳ Fetching history for {len(symbols)} stocks...")
-    n = AsyncNepse()
-    n.setTLSVerification(False)
+    nepse = nepse or get_nepse()
 
-    all_history: List[dict] = []
-    for sym in symbols:
-        try:
-            history = await n.getCompanyPriceVolumeHistory(sym)
-            for item in (history or []):
-                biz_date = item.get("businessDate")
-                if not biz_date:
-                    continue
-                all_history.append({
-                    "symbol": sym,
-                    "date": biz_date,
-                    "open": float(item.get("openPrice", 0) or item.get("closePrice", 0) or 0),
-                    "high": float(item.get("highPrice", 0) or 0),
-                    "low": float(item.get("lowPrice", 0) or 0),
-                    "close": float(item.get("closePrice", 0) or 0),
-                    "volume": int(item.get("totalTradedQuantity", 0) or 0),
-                })
-        except Exception as e:
-            log.warning(f"  ⚠ History for {sym}: {e}")
-        # Small delay to avoid rate limiting
-        await asyncio.sleep(0.3)
-
-    if all_history:
-        # Batch in chunks of 500
-        for i in range(0, len(all_history), 500):
-            chunk = all_history[i : i + 500]
-            res = await call_rpc(client, "sync_historical_prices", {"data": chunk})
-            log.info(f"📅 Historical prices batch {i//500+1}: {res}")
-    else:
-        log.warning("No historical data retrieved")
+    state = SyncState()
+    try:
+        marks = state.get_history_marks()
+        recheck_before = time.time() - HISTORY_RECHECK_AFTER
+        pending = [s for s in symbols if s not in marks or marks[s]["checked_at"] < recheck_before]
+        log.info(f"⏳ Fetching history for {len(pending)} of {len(symbols)} stocks...")
+
+        limiter = AdaptiveLimiter(HISTORY_MAX_CONCURRENCY, HISTORY_TARGET_LATENCY)
+        queue: asyncio.Queue = asyncio.Queue()
+        for sym in pending:
+            queue.put_nowait((sym, 1))
+        stats = {"symbols": 0, "rows": 0, "failed": 0}
+
+        async def backfill(sym: str, attempt: int):
+            last_date = marks[sym]["last_date"] if sym in marks else None
+            await limiter.acquire()
+            started = time.monotonic()
+            try:
+                if last_date:
+                    history = await nepse.getCompanyPriceVolumeHistory(
+                        sym, start_date=date.fromisoformat(last_date) + timedelta(days=1)
+                    )
+                else:
+                    history = await nepse.getCompanyPriceVolumeHistory(sym)
+            except Exception as e:
+                await limiter.release(time.monotonic() - started, ok=False)
+                if attempt < HISTORY_MAX_ATTEMPTS:
+                    queue.put_nowait((sym, attempt + 1))
+                else:
+                    stats["failed"] += 1
+                    log.warning(f"  ⚠ History for {sym}: {e}")
+                return
+            await limiter.release(time.monotonic() - started, ok=True)
+
+            rows = [r for r in (_history_row(sym, item) for item in (history or [])) if r]
+            rows = [r for r in rows if not last_date or r["date"] > last_date]
+            if rows and "error" in await upload_rows(client, "sync_historical_prices", rows):
+                # Keep the old mark so the next run uploads these days again
+                stats["failed"] += 1
+                return
+            state.set_history_mark(sym, max([r["date"] for r in rows], default=last_date))
+            stats["symbols"] += 1
+            stats["rows"] += len(rows)
+
+        async def worker():
+            while not queue.empty():
+                sym, attempt = queue.get_nowait()
+                await backfill(sym, attempt)
+
+        await asyncio.gather(*(worker() for _ in range(HISTORY_MAX_CONCURRENCY)))
+    finally:
+        state.close()
+
+    log.info(
+        f"📅 Historical prices: {stats['rows']} new rows for {stats['symbols']} stocks"
+        f" ({stats['failed']} failed, final concurrency {int(limiter.limit)})"
+    )
 
 
 # ===========================================================================
@@ -269,7 +561,7 @@ async def fetch_and_sync_history(client: httpx.AsyncClient, symbols: Optional[Li
 
 async def _fetch_article_details(client: httpx.AsyncClient, url: str) -> dict:
     """Fetch image and content from a single article page."""
-    result = {"image_url": None, "content": None}
+    result = {"image_url": None, "content": None, "status": "error"}
     if not url:
         return result
     try:
@@ -277,8 +569,11 @@ async def _fetch_article_details(client: httpx.AsyncClient, url: str) -> dict:
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }, timeout=10, follow_redirects=True)
         if resp.status_code != 200:
+            if 400 <= resp.status_code < 500:
+                result["status"] = "gone"
             return result
         soup = BeautifulSoup(resp.text, "lxml")
+        result["status"] = "ok"
 
         # Extract og:image (most reliable)
         og = soup.find("meta", property="og:image")
@@ -408,22 +703,29 @@ async def fetch_and_sync_news(client: httpx.AsyncClient):
                 seen.add(n["title"])
                 unique.append(n)
 
-        # Fetch article details (image + content) for items missing images
-        # Process in batches of 5 to avoid hammering servers
+        # Fetch article details (image + content) for items missing images.
+        # Pages seen by an earlier run come from the local cache.
         items_needing_details = [n for n in unique if not n.get("image_url") and n.get("url")]
-        log.info(f"  Fetching article details for {len(items_needing_details)} items...")
-        for i in range(0, len(items_needing_details), 5):
-            batch = items_needing_details[i:i+5]
-            tasks = [_fetch_article_details(client, n["url"]) for n in batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for n, res in zip(batch, results):
-                if isinstance(res, dict):
-                    if res.get("image_url"):
-                        n["image_url"] = res["image_url"]
-                    if res.get("content") and len(res["content"]) > len(n.get("content", "")):
-                        n["content"] = res["content"]
-
-        res = await call_rpc(client, "sync_news", {"data": unique})
+        state = SyncState()
+        try:
+            details = state.get_article_details({n["url"] for n in items_needing_details})
+            new_urls = sorted({n["url"] for n in items_needing_details} - details.keys())
+            log.info(f"  Article details: {len(details)} cached, fetching {len(new_urls)} new pages...")
+            fetched = await bounded_map(lambda url: _fetch_article_details(client, url), new_urls, DETAIL_CONCURRENCY)
+            fetched_details = dict(zip(new_urls, fetched))
+            state.save_article_details(fetched_details)
+            details.update(fetched_details)
+        finally:
+            state.close()
+
+        for n in items_needing_details:
+            res = details.get(n["url"]) or {}
+            if res.get("image_url"):
+                n["image_url"] = res["image_url"]
+            if res.get("content") and len(res["content"]) > len(n.get("content", "")):
+                n["content"] = res["content"]
+
+        res = await upload_rows(client, "sync_news", unique)
         log.info(f"📰 News synced ({len(unique)} articles): {res}")
     else:
         log.warning("No news articles scraped")
@@ -537,7 +839,7 @@ async def fetch_and_sync_ipo(client: httpx.AsyncClient):
         log.warning(f"ShareSansar IPO error: {e}")
 
     if ipo_items:
-        res = await call_rpc(client, "sync_ipo", {"data": ipo_items})
+        res = await upload_rows(client, "sync_ipo", ipo_items)
         log.info(f"🏢 IPO synced ({len(ipo_items)} items): {res}")
     else:
         log.warning("No IPO data scraped")
@@ -552,9 +854,9 @@ async def full_sync():
     log.info("🚀 ShareSathi Full Sync — Starting")
     log.info("=" * 60)
 
-    async with httpx.AsyncClient() as client:
-        # 1) Market data + stock prices + sub-indices
-        await fetch_and_sync_market(client)
+    async with make_client() as client:
+        # 1) Market data + stock prices + sub-indices (everything, re-baselining the local hashes)
+        await fetch_and_sync_market(client, only_changed=False)
 
         # 2) News from real sources
         await fetch_and_sync_news(client)
@@ -562,63 +864,66 @@ async def full_sync():
         # 3) IPO data
         await fetch_and_sync_ipo(client)
 
-        # 4) Historical prices for top 15 stocks by turnover
-        await fetch_and_sync_history(client, limit=15)
+        # 4) Historical prices for every listed stock (only days not yet uploaded)
+        await fetch_and_sync_history(client)
 
     log.info("=" * 60)
     log.info("✅ Full sync complete!")
     log.info("=" * 60)
 
 
-async def prices_only():
-    """Quick sync — stock prices + market summary only."""
+async def prices_only(client: httpx.AsyncClient):
+    """Quick sync — stock prices + market summary only (rows changed since the last push)."""
     log.info("⚡ Quick price sync...")
-    async with httpx.AsyncClient() as client:
-        await fetch_and_sync_market(client)
+    await fetch_and_sync_market(client)
     log.info("✅ Price sync done")
 
 
-async def run_daemon():
-    """Run the sync on a schedule."""
-    log.info("🔄 Starting daemon mode...")
-    log.info("   • Prices: every 2 minutes")
-    log.info("   • News:   every 30 minutes")
-    log.info("   • IPO:    every 6 hours")
-    log.info("   • History: every 24 hours")
+@dataclass
+class SyncTask:
+    """A data source the daemon syncs on its own schedule."""
+    name: str
+    run: Callable[[httpx.AsyncClient], Awaitable[Any]]
+    interval: Callable[[], float]  # seconds until the next run, asked after each run
+    timeout: float                 # a run taking longer is cancelled
 
-    last_news = datetime.min
-    last_ipo = datetime.min
-    last_history = datetime.min
 
+async def run_task_forever(task: SyncTask, client: httpx.AsyncClient):
+    """Run ``task`` every ``task.interval()`` seconds, measured from the start of each run."""
     while True:
-        now = datetime.now()
+        started = time.monotonic()
         try:
-            # Always sync prices
-            await prices_only()
-
-            # News every 30 min
-            if (now - last_news).total_seconds() > 1800:
-                async with httpx.AsyncClient() as client:
-                    await fetch_and_sync_news(client)
-                last_news = now
-
-            # IPO every 6 hours
-            if (now - last_ipo).total_seconds() > 21600:
-                async with httpx.AsyncClient() as client:
-                    await fetch_and_sync_ipo(client)
-                last_ipo = now
-
-            # History once per day
-            if (now - last_history).total_seconds() > 86400:
-                async with httpx.AsyncClient() as client:
-                    await fetch_and_sync_history(client, limit=15)
-                last_history = now
-
+            await asyncio.wait_for(task.run(client), task.timeout)
+        except asyncio.TimeoutError:
+            log.error(f"⏱ {task.name} sync timed out after {task.timeout:.0f}s")
         except Exception as e:
-            log.error(f"Daemon loop error: {e}")
+            log.error(f"{task.name} sync error: {e}")
+        await asyncio.sleep(max(0.0, task.interval() - (time.monotonic() - started)))
+
+
+async def run_daemon():
+    """Run every data source on its own schedule over one shared client."""
+    from app.services.trading_service import is_market_hours
+
+    # Prices only move during trading hours (Sun–Thu 11:00–15:00 NPT)
+    def price_interval() -> float:
+        return PRICE_INTERVAL if is_market_hours() else OFF_HOURS_PRICE_INTERVAL
+
+    tasks = [
+        SyncTask("Prices", prices_only, price_interval, timeout=90),
+        SyncTask("News", fetch_and_sync_news, lambda: 1800, timeout=300),
+        SyncTask("IPO", fetch_and_sync_ipo, lambda: 21600, timeout=120),
+        SyncTask("History", fetch_and_sync_history, lambda: 86400, timeout=3600),
+    ]
+
+    log.info("🔄 Starting daemon mode...")
+    log.info("   • Prices: every 2 minutes in market hours, 15 minutes otherwise")
+    log.info("   • News:   every 30 minutes")
+    log.info("   • IPO:    every 6 hours")
+    log.info("   • History: every 24 hours")
 
-        log.info("💤 Sleeping 2 minutes...")
-        await asyncio.sleep(120)
+    async with make_client() as client:
+        await asyncio.gather(*(run_task_forever(task, client) for task in tasks))
 
 
 # ===========================================================================
@@ -633,21 +938,24 @@ if __name__ == "__main__":
         except KeyboardInterrupt:
             log.info("👋 Daemon stopped gracefully")
     elif "--prices" in args:
-        asyncio.run(prices_only())
+        async def _prices():
+            async with make_client() as c:
+                await prices_only(c)
+        asyncio.run(_prices())
     elif "--news" in args:
         async def _news():
-            async with httpx.AsyncClient() as c:
+            async with make_client() as c:
                 await fetch_and_sync_news(c)
         asyncio.run(_news())
     elif "--ipo" in args:
         async def _ipo():
-            async with httpx.AsyncClient() as c:
+            async with make_client() as c:
                 await fetch_and_sync_ipo(c)
         asyncio.run(_ipo())
     elif "--history" in args:
         async def _hist():
-            async with httpx.AsyncClient() as c:
-                await fetch_and_sync_history(c, limit=15)
+            async with make_client() as c:
+                await fetch_and_sync_history(c)
         asyncio.run(_hist())
     else:
         asyncio.run(full_sync())
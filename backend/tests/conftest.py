@@ -4,3 +4,19 @@ import os
 
 # Ensure the backend root is on the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+@pytest_asyncio.fixture
+async def sqlite_sessions(tmp_path):
+    """Session factory bound to a fresh SQLite database with every table created."""
+    from app.database.base import Base
+    import app.models  # noqa: F401 — register every table on Base.metadata
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    await engine.dispose()
@@ -0,0 +1,87 @@
+"""
+ShareSathi — Price Alert Tests
+===============================
+Tests for per-tick watchlist alert evaluation and dispatch backpressure.
+Run with: pytest tests/ -v
+"""
+
+import pytest
+
+from app.background.price_alerts import AlertDispatcher
+from app.services.alert_engine import AlertEngine, PriceAlert
+
+
+def _fired(engine, **prices):
+    return sorted((a.user_id, a.kind, a.threshold) for a in engine.evaluate(prices))
+
+
+class TestAlertEngine:
+    """Test threshold crossing detection."""
+
+    def test_first_tick_only_sets_baseline(self):
+        engine = AlertEngine()
+        engine.set(1, "NABIL", target_price=500.0, stop_loss=None)
+        assert _fired(engine, NABIL=550.0) == []
+
+    def test_target_fires_on_upward_cross(self):
+        engine = AlertEngine()
+        engine.set(1, "NABIL", target_price=510.0, stop_loss=450.0)
+        engine.set(2, "NABIL", target_price=530.0, stop_loss=None)
+        engine.evaluate({"NABIL": 500.0})
+        assert _fired(engine, NABIL=520.0) == [(1, "TARGET", 510.0)]
+        assert _fired(engine, NABIL=530.0) == [(2, "TARGET", 530.0)]
+
+    def test_stop_loss_fires_on_downward_cross(self):
+        engine = AlertEngine()
+        engine.set(1, "NABIL", target_price=None, stop_loss=480.0)
+        engine.set(2, "NABIL", target_price=None, stop_loss=470.0)
+        engine.evaluate({"NABIL": 500.0})
+        assert _fired(engine, NABIL=490.0) == []
+        assert _fired(engine, NABIL=470.0) == [(1, "STOP_LOSS", 480.0), (2, "STOP_LOSS", 470.0)]
+
+    def test_alert_fires_once_until_rearmed(self):
+        engine = AlertEngine()
+        engine.set(1, "NABIL", target_price=510.0, stop_loss=None)
+        engine.evaluate({"NABIL": 500.0})
+        assert len(_fired(engine, NABIL=520.0)) == 1
+        engine.evaluate({"NABIL": 500.0})
+        assert _fired(engine, NABIL=520.0) == []
+        engine.set(1, "NABIL", target_price=510.0, stop_loss=None)
+        engine.evaluate({"NABIL": 500.0})
+        assert len(_fired(engine, NABIL=520.0)) == 1
+
+    def test_other_side_stays_armed(self):
+        engine = AlertEngine()
+        engine.set(1, "NABIL", target_price=510.0, stop_loss=490.0)
+        engine.evaluate({"NABIL": 500.0})
+        engine.evaluate({"NABIL": 515.0})
+        assert _fired(engine, NABIL=485.0) == [(1, "STOP_LOSS", 490.0)]
+        assert len(engine) == 0
+
+    def test_removed_alert_never_fires(self):
+        engine = AlertEngine()
+        engine.set(1, "NABIL", target_price=510.0, stop_loss=None)
+        engine.remove(1, "NABIL")
+        engine.evaluate({"NABIL": 500.0})
+        assert _fired(engine, NABIL=520.0) == []
+
+    def test_update_replaces_thresholds(self):
+        engine = AlertEngine()
+        engine.set(1, "NABIL", target_price=510.0, stop_loss=None)
+        engine.set(1, "NABIL", target_price=540.0, stop_loss=None)
+        engine.evaluate({"NABIL": 500.0})
+        assert _fired(engine, NABIL=520.0) == []
+        assert _fired(engine, NABIL=540.0) == [(1, "TARGET", 540.0)]
+
+
+class TestAlertDispatcher:
+    """Test that a full queue drops instead of blocking the tick handler."""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_alerts(self):
+        dispatcher = AlertDispatcher(maxsize=2)
+        alert = PriceAlert(1, "NABIL", "TARGET", 510.0, 520.0)
+        assert dispatcher.submit(alert)
+        assert dispatcher.submit(alert)
+        assert not dispatcher.submit(alert)
+        assert dispatcher.dropped == 1
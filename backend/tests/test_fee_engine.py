@@ -0,0 +1,78 @@
+"""
+ShareSathi — Fee Engine Tests
+==============================
+Tests for the precomputed brokerage schedule and the vectorized fee API.
+Run with: pytest tests/ -v
+"""
+
+import random
+from decimal import Decimal, ROUND_HALF_UP
+
+from app.services.fee_engine import (
+    BROKERAGE_TIERS,
+    FeeSchedule,
+    calculate_total_fees_batch,
+    fee_schedule,
+)
+
+
+def _tier_walk(trade_amount: Decimal) -> Decimal:
+    """Reference implementation: walk the tiers one by one."""
+    remaining = trade_amount
+    commission = Decimal("0")
+    prev_limit = Decimal("0")
+    for limit, rate in BROKERAGE_TIERS:
+        tier_amount = min(remaining, Decimal(str(limit)) - prev_limit)
+        if tier_amount <= 0:
+            break
+        commission += tier_amount * rate / Decimal("100")
+        remaining -= tier_amount
+        prev_limit = Decimal(str(limit))
+    return commission.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+class TestFeeSchedule:
+    """Test the bisect-based per-trade lookup."""
+
+    def test_matches_tier_walk_at_boundaries(self):
+        for amount in ["0.01", "49999.99", "50000", "50000.01", "500000", "2000000", "10000000", "10000000.01"]:
+            assert fee_schedule.brokerage(Decimal(amount)) == _tier_walk(Decimal(amount)), amount
+
+    def test_matches_tier_walk_on_random_amounts(self):
+        rng = random.Random(42)
+        for _ in range(2000):
+            amount = Decimal(rng.randint(1, 5_000_000_000)) / 100
+            assert fee_schedule.brokerage(amount) == _tier_walk(amount), amount
+
+    def test_non_positive_amount_has_no_commission(self):
+        assert fee_schedule.brokerage(Decimal("0")) == Decimal("0.00")
+        assert fee_schedule.brokerage(Decimal("-10")) == Decimal("0.00")
+
+    def test_custom_schedule(self):
+        schedule = FeeSchedule(
+            [(1000, Decimal("1")), (float("inf"), Decimal("0.5"))],
+            sebon_rate=Decimal("0"), dp_charge=Decimal("0"),
+        )
+        assert schedule.brokerage(Decimal("3000")) == Decimal("20.00")  # 10 + 2000 * 0.5%
+
+
+class TestFeeBatch:
+    """Test the vectorized paisa path against the Decimal path."""
+
+    def test_batch_matches_scalar(self):
+        rng = random.Random(7)
+        amounts = [Decimal(rng.randint(0, 5_000_000_000)) / 100 for _ in range(2000)]
+        amounts += [Decimal("50000"), Decimal("10000000")]
+        batch = calculate_total_fees_batch(amounts)
+        for amount, fees in zip(amounts, batch):
+            assert fees == fee_schedule.total_fees(amount), amount
+
+    def test_batch_arrays_are_paisa(self):
+        batch = fee_schedule.total_fees_batch([100000])
+        assert int(batch.brokerage[0]) == 34500
+        assert int(batch.sebon_fee[0]) == 1500
+        assert int(batch.dp_charge[0]) == 2500
+        assert int(batch.total_fees[0]) == 38500
+
+    def test_empty_batch(self):
+        assert calculate_total_fees_batch([]) == []
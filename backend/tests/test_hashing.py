@@ -0,0 +1,75 @@
+"""
+ShareSathi — Password Hashing Tests
+====================================
+Tests for the thread-pooled bcrypt hasher and cost-factor upgrades.
+Run with: pytest tests/ -v
+"""
+
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core.hashing import PasswordHasher
+
+
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(_context(4), max_workers=2)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestPasswordHasher:
+    """Test hashing, verification and transparent rehashing."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self, hasher):
+        hashed = await hasher.hash("s3cret-pass")
+        assert await hasher.verify("s3cret-pass", hashed)
+        assert not await hasher.verify("wrong-pass", hashed)
+
+    @pytest.mark.asyncio
+    async def test_current_hash_needs_no_update(self, hasher):
+        hashed = await hasher.hash("s3cret-pass")
+        assert await hasher.verify_and_update("s3cret-pass", hashed) == (True, None)
+
+    @pytest.mark.asyncio
+    async def test_rehash_when_cost_changes(self, hasher):
+        old = _context(5).hash("s3cret-pass")
+        verified, new_hash = await hasher.verify_and_update("s3cret-pass", old)
+        assert verified
+        assert new_hash is not None and new_hash.startswith("$2b$04$")
+
+    @pytest.mark.asyncio
+    async def test_wrong_password_never_rehashes(self, hasher):
+        old = _context(5).hash("s3cret-pass")
+        assert await hasher.verify_and_update("wrong-pass", old) == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_long_passwords_truncated_consistently(self, hasher):
+        hashed = await hasher.hash("x" * 100)
+        assert await hasher.verify("x" * 72, hashed)
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self):
+        hasher = PasswordHasher(_context(10), max_workers=1)
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(heartbeat())
+        try:
+            await hasher.hash("s3cret-pass")
+        finally:
+            task.cancel()
+            hasher.shutdown()
+        assert ticks > 0
@@ -0,0 +1,165 @@
+"""
+ShareSathi — Market Ingestion Tests
+====================================
+Tests for NEPSE parsing, normalized records and publishing to sinks.
+Run with: pytest tests/ -v
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.ingestion import (
+    DatabaseSink, LiveTick, MarketSink, RedisCacheSink, StockQuote, fetch_market, live_market_payload,
+    market_summary_payload, parse_float, publish,
+)
+from app.models.stock import Stock
+
+
+class FakeNepse:
+    """Canned NEPSE responses, counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def _respond(self, value):
+        self.calls += 1
+        return value
+
+    def getSummary(self):
+        return self._respond([
+            {"detail": "Total Turnover Rs:", "value": "2,345,678.90"},
+            {"detail": "Total Traded Shares", "value": "1,200"},
+            {"detail": "Total Transactions", "value": "321"},
+        ])
+
+    def getNepseIndex(self):
+        return self._respond([{"index": "NEPSE Index", "currentValue": "2,100.5", "change": 5.5, "perChange": 0.26}])
+
+    def getNepseSubIndices(self):
+        return self._respond([{"index": "Banking SubIndex", "currentValue": 1500, "change": 1, "percentChange": 0.1}])
+
+    def getTopGainers(self):
+        return self._respond([{"symbol": "NABIL", "ltp": 510, "pointChange": 10, "percentageChange": 2}])
+
+    def getTopLosers(self):
+        return self._respond([])
+
+    def getTopTenTurnoverScrips(self):
+        return self._respond([{"symbol": "NABIL", "turnover": "1,000"}])
+
+    def isNepseOpen(self):
+        return self._respond(True)
+
+    def getLiveMarket(self):
+        return self._respond([
+            {"symbol": "NABIL", "lastTradedPrice": 510, "previousClose": 500, "percentageChange": 2,
+             "totalTradeQuantity": "1,000"},
+            {"symbol": None, "lastTradedPrice": 1},
+        ])
+
+    def getCompanyList(self):
+        return self._respond([{"symbol": "NABIL", "securityName": "Nabil Bank", "sectorName": "Commercial Banks"}])
+
+
+class TestParsing:
+    """Test the one lenient number parser."""
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("1,234.50", 1234.5), ("Rs 12", 12.0), ("Rs: 7", 7.0), (42, 42.0), (None, 0.0), ("n/a", 0.0),
+    ])
+    def test_parse_float(self, raw, expected):
+        assert parse_float(raw) == expected
+
+
+class TestFetchMarket:
+    """Test that one fetch normalizes everything every consumer needs."""
+
+    @pytest.mark.asyncio
+    async def test_normalizes_nepse_responses(self):
+        nepse = FakeNepse()
+        data = await fetch_market(nepse, companies=True)
+        assert nepse.calls == 9
+        assert data.summary.total_turnover == 2345678.9
+        assert data.summary.total_transactions == 321
+        assert data.summary.nepse_index == 2100.5
+        assert [(q.symbol, q.point_change, q.volume) for q in data.stocks] == [("NABIL", 10.0, 1000)]
+        assert data.sub_indices[0].sector == "Banking"
+        assert data.companies["NABIL"].sector == "Commercial Banks"
+
+    @pytest.mark.asyncio
+    async def test_api_payloads(self):
+        data = await fetch_market(FakeNepse())
+        assert data.companies == {}
+        summary = market_summary_payload(data)
+        assert summary["summary"] == {
+            "nepseIndex": 2100.5, "totalTurnover": 2345678.9, "totalTradedShares": 1200.0, "marketStatus": "Open",
+        }
+        assert summary["topTurnovers"] == [{"symbol": "NABIL", "turnover": 1000.0}]
+        assert live_market_payload(data.stocks)["live_market"] == [
+            {"symbol": "NABIL", "lastTradedPrice": 510.0, "pointChange": 10.0, "percentageChange": 2.0, "volume": 1000},
+        ]
+
+
+class TestLiveTick:
+    """Test the shared per-tick views and the compact cache encoding."""
+
+    QUOTES = [StockQuote("NABIL", 510.0, 500.0, 2.0, 1000, 51000.0), StockQuote("NICA", 790.0, 800.0, -1.25, 20)]
+
+    def test_compact_encoding_round_trips(self):
+        tick = LiveTick(self.QUOTES)
+        decoded = LiveTick.from_json(json.dumps(tick.to_compact()))
+        assert decoded.quotes == tick.quotes
+        assert decoded.to_payload() == tick.to_payload()
+
+    def test_reads_the_legacy_wire_format(self):
+        legacy = json.dumps(live_market_payload(self.QUOTES))
+        tick = LiveTick.from_json(legacy)
+        assert tick.get("NICA").previous_close == 800.0
+        assert tick.prices() == {"NABIL": 510.0, "NICA": 790.0}
+
+    def test_views_are_built_once(self):
+        tick = LiveTick(self.QUOTES)
+        assert tick.prices() is tick.prices()
+        assert tick.to_payload() is tick.to_payload()
+        assert tick.get("SCB") is None
+
+
+class TestSinks:
+    """Test publishing one fetch to several consumers."""
+
+    @pytest.mark.asyncio
+    async def test_failing_sink_does_not_stop_the_others(self):
+        class Broken(MarketSink):
+            name = "broken"
+
+            async def publish(self, data):
+                raise RuntimeError("down")
+
+        ok = AsyncMock(spec=MarketSink)
+        ok.name = "ok"
+        data = await fetch_market(FakeNepse())
+        assert await publish(data, [Broken(), ok]) == ["broken"]
+        ok.publish.assert_awaited_once_with(data)
+
+    @pytest.mark.asyncio
+    async def test_redis_sink_fills_both_market_caches(self):
+        import fakeredis.aioredis
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        with patch("app.cache.cache_service.get_redis", AsyncMock(return_value=redis)):
+            await RedisCacheSink().publish(await fetch_market(FakeNepse()))
+        assert json.loads(await redis.get("nepse:market_summary"))["summary"]["marketStatus"] == "Open"
+        assert LiveTick.from_json(await redis.get("nepse:live_market")).get("NABIL").previous_close == 500.0
+
+    @pytest.mark.asyncio
+    async def test_database_sink_upserts_companies(self, sqlite_sessions):
+        async with sqlite_sessions() as db:
+            db.add(Stock(symbol="NABIL", company_name="Old name"))
+            await db.commit()
+        with patch("app.database.session.AsyncSessionLocal", sqlite_sessions):
+            await DatabaseSink().publish(await fetch_market(FakeNepse(), companies=True))
+        async with sqlite_sessions() as db:
+            stock = (await db.execute(select(Stock))).scalar_one()
+        assert (stock.company_name, stock.sector) == ("Nabil Bank", "Commercial Banks")
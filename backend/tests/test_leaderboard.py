@@ -0,0 +1,80 @@
+"""
+ShareSathi — Leaderboard Tests
+===============================
+Tests for sparse-matrix valuation of every paper-trading account.
+Run with: pytest tests/ -v
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.api.leaderboard import get_leaderboard
+from app.config import settings
+from app.schemas.leaderboard_schema import LeaderboardEntry
+from app.services.leaderboard import LeaderboardBook, public_handle
+
+
+HOLDINGS = [
+    (1, Decimal("950000.00"), "NABIL", 100, Decimal("500.00")),
+    (2, Decimal("920000.00"), "NICA", 100, Decimal("800.00")),
+    (2, Decimal("920000.00"), "NABIL", 10, Decimal("490.00")),
+    (3, Decimal("1000000.00"), None, None, None),
+]
+
+
+class TestLeaderboardBook:
+    """Test valuation of the users × symbols position matrix."""
+
+    def test_values_every_account(self):
+        book = LeaderboardBook(starting_balance=1000000)
+        book.load(HOLDINGS)
+        nav, returns = book.value({"NABIL": 520.0, "NICA": 790.0})
+        assert list(book.user_ids) == [1, 2, 3]
+        assert nav == pytest.approx([1002000.0, 1004200.0, 1000000.0])
+        assert returns == pytest.approx([0.2, 0.42, 0.0])
+
+    def test_unpriced_symbol_uses_average_buy_price(self):
+        book = LeaderboardBook(starting_balance=1000000)
+        book.load(HOLDINGS)
+        nav, _ = book.value({"NABIL": 520.0})
+        assert nav[1] == pytest.approx(920000.0 + 100 * 800.0 + 10 * 520.0)
+
+    def test_reload_replaces_positions(self):
+        book = LeaderboardBook(starting_balance=1000000)
+        book.load(HOLDINGS)
+        book.load([(1, Decimal("1000000.00"), None, None, None)])
+        nav, returns = book.value({"NABIL": 520.0})
+        assert len(book) == 1
+        assert nav == pytest.approx([1000000.0])
+        assert returns == pytest.approx([0.0])
+
+    def test_empty_book(self):
+        book = LeaderboardBook()
+        nav, returns = book.value({"NABIL": 520.0})
+        assert len(nav) == 0 and len(returns) == 0
+
+
+class TestLeaderboardEndpoint:
+    """Test the public top-N listing."""
+
+    @pytest.mark.asyncio
+    async def test_lists_opaque_handles_only(self):
+        top = [
+            {"rank": 1, "user_id": 7, "nav": Decimal("1002000.00"), "return_pct": 0.2},
+            {"rank": 2, "user_id": 8, "nav": Decimal("1001000.00"), "return_pct": 0.1},
+        ]
+        with patch("app.api.leaderboard.get_top", AsyncMock(return_value=top)):
+            entries = await get_leaderboard(limit=50, offset=0)
+        body = [LeaderboardEntry.model_validate(e).model_dump() for e in entries]
+        assert all("user_id" not in entry for entry in entries + body)
+        names = [entry["name"] for entry in body]
+        assert names == [public_handle(7), public_handle(8)]
+        assert len(set(names)) == 2 and "Trader-7" not in names
+
+    def test_handle_is_keyed_by_the_server_secret(self):
+        handle = public_handle(7)
+        assert public_handle(7) == handle
+        with patch.object(settings, "SECRET_KEY", "another-secret-key-of-sufficient-length"):
+            assert public_handle(7) != handle
@@ -0,0 +1,42 @@
+"""
+ShareSathi — Market Snapshot Tests
+===================================
+Tests for the symbol-indexed live market snapshot.
+Run with: pytest tests/ -v
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.ingestion import LiveTick, StockQuote
+from app.services.market_snapshot import MarketSnapshot
+
+TICK = LiveTick([StockQuote("NABIL", 500.0, 495.0, 1.01, 100), StockQuote("NICA", 800.0, 800.0, 0.0, 50)])
+
+
+class TestMarketSnapshot:
+    """Test per-symbol lookups and staleness refresh."""
+
+    @pytest.mark.asyncio
+    async def test_prices_for_requested_symbols(self):
+        snapshot = MarketSnapshot()
+        await snapshot.update(TICK)
+        assert snapshot.prices(["NICA", "SCB"]) == {"NICA": 800.0, "SCB": 0.0}
+        assert snapshot.get("NABIL").ltp == 500.0
+
+    @pytest.mark.asyncio
+    async def test_empty_tick_keeps_last_snapshot(self):
+        snapshot = MarketSnapshot()
+        await snapshot.update(TICK)
+        await snapshot.update(LiveTick(is_stale=True))
+        assert len(snapshot) == 2
+
+    @pytest.mark.asyncio
+    async def test_refreshes_only_when_stale(self):
+        snapshot = MarketSnapshot(max_age=60)
+        with patch("app.services.market_snapshot.NepseService.get_live_tick", AsyncMock(return_value=TICK)) as fetch:
+            await snapshot.refresh_if_stale()
+            await snapshot.refresh_if_stale()
+        assert fetch.await_count == 1
+        assert len(snapshot) == 2
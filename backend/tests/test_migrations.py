@@ -0,0 +1,77 @@
+"""
+ShareSathi — Migration Tests
+=============================
+Tests for the Alembic revisions that upgrade databases created by an older release.
+Run with: pytest tests/ -v
+"""
+
+import os
+import sqlite3
+from unittest.mock import patch
+
+from alembic import command
+from alembic.config import Config
+
+from app.config import settings
+
+MIGRATIONS = os.path.join(os.path.dirname(__file__), "..", "app", "database", "migrations")
+
+
+def _upgrade(db_path, revision="head"):
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS)
+    with patch.object(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{db_path}"):
+        command.upgrade(config, revision)
+
+
+def _columns(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {row[1] for row in conn.execute("PRAGMA table_info(transactions)")}
+
+
+class TestTransactionColumns:
+    """Test adding fees / realized_pnl to a pre-existing transactions table."""
+
+    def test_adds_columns_to_an_old_table(self, tmp_path):
+        db_path = tmp_path / "old.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE transactions (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+                "symbol VARCHAR NOT NULL, transaction_type VARCHAR NOT NULL, quantity INTEGER NOT NULL, "
+                "price NUMERIC(10, 2) NOT NULL, timestamp DATETIME)"
+            )
+            conn.execute(
+                "INSERT INTO transactions (user_id, symbol, transaction_type, quantity, price) "
+                "VALUES (1, 'NABIL', 'BUY', 10, 500)"
+            )
+        _upgrade(db_path)
+        assert {"fees", "realized_pnl"} <= _columns(db_path)
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT fees, realized_pnl FROM transactions").fetchall() == [(0, None)]
+
+    def test_current_schema_is_left_alone(self, tmp_path):
+        db_path = tmp_path / "new.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE transactions (id INTEGER PRIMARY KEY, fees NUMERIC(12, 2) NOT NULL DEFAULT 0, "
+                "realized_pnl NUMERIC(14, 2))"
+            )
+        _upgrade(db_path)
+        assert _columns(db_path) == {"id", "fees", "realized_pnl"}
+
+
+class TestSnapshotIndex:
+    """Test dropping the duplicate (user_id, date) index from older databases."""
+
+    def test_drops_duplicate_index(self, tmp_path):
+        db_path = tmp_path / "old.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE portfolio_snapshots (id INTEGER PRIMARY KEY, user_id INTEGER, date DATE, "
+                "CONSTRAINT uq_portfolio_snapshot_user_date UNIQUE (user_id, date))"
+            )
+            conn.execute("CREATE INDEX ix_portfolio_snapshot_user_date ON portfolio_snapshots (user_id, date)")
+        _upgrade(db_path)
+        with sqlite3.connect(db_path) as conn:
+            names = {row[1] for row in conn.execute("PRAGMA index_list(portfolio_snapshots)")}
+        assert "ix_portfolio_snapshot_user_date" not in names
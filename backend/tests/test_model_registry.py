@@ -0,0 +1,61 @@
+"""
+ShareSathi — Model Registry Tests
+==================================
+Tests for versioned model storage, lazy loading and hot-swapping.
+Run with: pytest tests/ -v
+"""
+
+import os
+
+from app.ai.registry import ModelRegistry
+
+
+class TestModelRegistry:
+    """Test the on-disk model registry."""
+
+    def test_missing_model_returns_none(self, tmp_path):
+        registry = ModelRegistry(str(tmp_path))
+        assert registry.get("NABIL", "arima") is None
+        assert registry.get_metadata("NABIL", "arima") is None
+
+    def test_publish_and_load(self, tmp_path):
+        registry = ModelRegistry(str(tmp_path))
+        meta = registry.publish(
+            "nabil", "arima", {"coef": [1, 2]},
+            training_window=("2025-01-01", "2025-06-30"), metrics={"aic": 12.5},
+        )
+        assert meta.symbol == "NABIL"
+        assert meta.version == 1
+        assert meta.tag == "v0001"
+
+        # A fresh registry (another worker) loads lazily from disk
+        other = ModelRegistry(str(tmp_path))
+        assert other._loaded == {}
+        model, loaded_meta = other.get("NABIL", "arima")
+        assert model == {"coef": [1, 2]}
+        assert loaded_meta.trained_to == "2025-06-30"
+        assert loaded_meta.metrics == {"aic": 12.5}
+
+    def test_new_version_hot_swaps(self, tmp_path):
+        reader = ModelRegistry(str(tmp_path))
+        writer = ModelRegistry(str(tmp_path))
+        writer.publish("NABIL", "arima", "old")
+        assert reader.get("NABIL", "arima")[0] == "old"
+
+        writer.publish("NABIL", "arima", "new")
+        model, meta = reader.get("NABIL", "arima")
+        assert model == "new"
+        assert meta.version == 2
+        assert [m.version for m in reader.list_versions("NABIL", "arima")] == [1, 2]
+        # No temp files are left behind after publishing
+        leftovers = [n for n in os.listdir(tmp_path / "NABIL" / "arima") if n.startswith(".")]
+        assert leftovers == []
+
+    def test_lru_is_bounded(self, tmp_path):
+        registry = ModelRegistry(str(tmp_path), max_loaded=2)
+        for symbol in ("A", "B", "C"):
+            registry.publish(symbol, "arima", symbol)
+        assert list(registry._loaded) == [("B", "arima"), ("C", "arima")]
+        # Evicted models are transparently reloaded from disk
+        assert registry.get("A", "arima")[0] == "A"
+        assert list(registry._loaded) == [("C", "arima"), ("A", "arima")]
@@ -0,0 +1,102 @@
+"""
+ShareSathi — News Archive Tests
+================================
+Tests for deduplicated ingestion, the symbol index and keyset-paged search.
+Run with: pytest tests/ -v
+"""
+
+import pytest
+
+from app.database.base import Base
+from app.repositories.news_repo import NewsRepository, extract_symbols, title_hash
+
+KNOWN = {"NABIL", "NICA", "UPPER"}
+
+
+def _item(title, url=None, category="Market", content=None):
+    return {
+        "id": 0, "title": title, "category": category, "source": "Test",
+        "published_at": "2026-01-05 11:00", "url": url, "content": content or title,
+    }
+
+
+async def _ingest(sessions, items):
+    async with sessions() as db:
+        archived = await NewsRepository(db).ingest(items, KNOWN)
+        await db.commit()
+    return archived
+
+
+class TestExtraction:
+    """Test dedup keys and symbol mentions."""
+
+    def test_title_hash_ignores_case_and_spacing(self):
+        assert title_hash("NABIL  Bank Dividend ") == title_hash("nabil bank dividend")
+
+    def test_only_known_upper_case_symbols(self):
+        assert extract_symbols("NABIL and Nica beat UPPER; NEPSE flat", KNOWN) == {"NABIL", "UPPER"}
+
+
+class TestIngest:
+    """Test stable ids and URL/title deduplication."""
+
+    @pytest.mark.asyncio
+    async def test_ids_are_stable_across_refreshes(self, sqlite_sessions):
+        first = await _ingest(sqlite_sessions, [_item("NABIL announces dividend"), _item("NICA rights share")])
+        second = await _ingest(sqlite_sessions, [_item("New IPO opens"), _item("nabil  announces DIVIDEND")])
+        assert second[1]["id"] == first[0]["id"]
+        assert second[1]["published_at"] == first[0]["published_at"]
+        assert second[0]["id"] > first[1]["id"]
+
+    @pytest.mark.asyncio
+    async def test_same_url_is_the_same_article(self, sqlite_sessions):
+        first = await _ingest(sqlite_sessions, [_item("Old headline", url="https://x/1")])
+        second = await _ingest(sqlite_sessions, [_item("Edited headline", url="https://x/1")])
+        assert second[0]["id"] == first[0]["id"]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_within_one_scrape(self, sqlite_sessions):
+        archived = await _ingest(sqlite_sessions, [_item("Same story"), _item("Same Story", category="Analysis")])
+        assert archived[0]["id"] == archived[1]["id"]
+
+
+class TestSearch:
+    """Test full-text and symbol search with keyset paging."""
+
+    @pytest.mark.asyncio
+    async def test_full_text_prefix_and_symbol(self, sqlite_sessions):
+        await _ingest(sqlite_sessions, [
+            _item("NABIL announces cash dividend"),
+            _item("NICA posts quarterly profit"),
+            _item("Hydropower stocks rally", content="UPPER leads hydropower gains"),
+        ])
+        async with sqlite_sessions() as db:
+            repo = NewsRepository(db)
+            assert [a.title for a in await repo.search(q="divid")] == ["NABIL announces cash dividend"]
+            assert [a.title for a in await repo.search(symbol="UPPER")] == ["Hydropower stocks rally"]
+            assert await repo.search(q="dividend", symbol="NICA") == []
+            assert await repo.search(q='"; DROP TABLE news_articles; --') == []
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_everything_once(self, sqlite_sessions):
+        await _ingest(sqlite_sessions, [_item(f"NABIL market update number {i}") for i in range(7)])
+        async with sqlite_sessions() as db:
+            repo = NewsRepository(db)
+            seen, before = [], None
+            while True:
+                page = await repo.search(symbol="NABIL", before=before, limit=3)
+                if not page:
+                    break
+                seen += [a.id for a in page]
+                before = page[-1].id
+        assert seen == sorted(seen, reverse=True)
+        assert len(seen) == len(set(seen)) == 7
+
+    @pytest.mark.asyncio
+    async def test_recreating_tables_drops_the_fts_index(self, sqlite_sessions):
+        await _ingest(sqlite_sessions, [_item("NABIL announces cash dividend")])
+        async with sqlite_sessions() as db:
+            conn = await db.connection()
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            assert await NewsRepository(db).search(q="dividend") == []
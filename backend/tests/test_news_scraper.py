@@ -0,0 +1,119 @@
+"""
+ShareSathi — News Scraper Tests
+================================
+Tests for concurrent fetching, conditional requests and the parsed-page cache.
+Run with: pytest tests/ -v
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.services import news_service
+from app.services.news_service import NEWS_SOURCES, NewsService, parse_news_page
+
+PAGE = b"""<html><body>
+<h4><a href="/newsdetail/nabil-dividend">NABIL Bank announces 15% cash dividend</a></h4>
+<h4><a href="/newsdetail/nabil-dividend">NABIL Bank announces 15% cash dividend</a></h4>
+<h4><a href="/newsdetail/short">Short</a></h4>
+<h3><a href="https://example.com/ipo">Upper Tamakoshi IPO result published today</a></h3>
+</body></html>"""
+
+
+@pytest.fixture(autouse=True)
+def reset_pages():
+    NewsService._pages = {}
+    yield
+    NewsService._pages = {}
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestParseNewsPage:
+    """Test link extraction with lxml."""
+
+    def test_extracts_unique_long_titles(self):
+        items = parse_news_page(PAGE, NEWS_SOURCES[0], "2026-01-05 11:00")
+        assert [i["title"] for i in items] == [
+            "NABIL Bank announces 15% cash dividend",
+            "Upper Tamakoshi IPO result published today",
+        ]
+        assert items[0]["url"] == "https://www.sharesansar.com/newsdetail/nabil-dividend"
+        assert items[1]["url"] == "https://example.com/ipo"
+
+
+class TestScrapeNews:
+    """Test that refreshes only re-parse pages that changed."""
+
+    @pytest.mark.asyncio
+    async def test_sources_fetched_concurrently(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return httpx.Response(200, content=PAGE)
+
+        async with _client(handler) as client:
+            news = await NewsService.scrape_news(client)
+        assert peak == len(NEWS_SOURCES)
+        # Same stories on every page are merged into one list with fresh ids
+        assert [n["id"] for n in news] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_conditional_headers_and_not_modified(self):
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=PAGE, headers={"ETag": '"v1"'})
+
+        async with _client(handler) as client:
+            first = await NewsService.scrape_news(client)
+            with patch.object(news_service, "parse_news_page") as parse:
+                second = await NewsService.scrape_news(client)
+        assert seen_headers[len(NEWS_SOURCES):] == ['"v1"'] * len(NEWS_SOURCES)
+        parse.assert_not_called()
+        assert second == first
+
+    @pytest.mark.asyncio
+    async def test_unchanged_body_is_not_reparsed(self):
+        async with _client(lambda request: httpx.Response(200, content=PAGE)) as client:
+            await NewsService.scrape_news(client)
+            with patch.object(news_service, "parse_news_page") as parse:
+                await NewsService.scrape_news(client)
+        parse.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_parse_failure_refetches_in_full(self):
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v2"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=PAGE, headers={"ETag": '"v2"'})
+
+        async with _client(handler) as client:
+            with patch.object(news_service, "parse_news_page", side_effect=ValueError("bad markup")):
+                assert await NewsService.scrape_news(client) == []
+            items = await NewsService.scrape_news(client)
+        assert seen_headers[len(NEWS_SOURCES):] == [None] * len(NEWS_SOURCES)
+        assert items
+
+    @pytest.mark.asyncio
+    async def test_failed_source_keeps_last_items(self):
+        async with _client(lambda request: httpx.Response(200, content=PAGE)) as client:
+            first = await NewsService.scrape_news(client)
+        async with _client(lambda request: httpx.Response(503)) as client:
+            assert await NewsService.scrape_news(client) == first
@@ -0,0 +1,213 @@
+"""
+ShareSathi — Notification Pipeline Tests
+=========================================
+Tests for per-channel batching, retries with backoff, and backpressure.
+Run with: pytest tests/ -v
+"""
+
+import asyncio
+import smtplib
+from email.message import EmailMessage
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from app.models.notification_delivery import NotificationDelivery
+from app.services.notification_channels import (
+    DELIVERED, DROPPED, FAILED, RETRY, SKIPPED, Channel, EmailChannel, WebSocketChannel,
+)
+from app.services.notification_service import Notification, NotificationPipeline
+
+
+class RecordingChannel(Channel):
+    name = "recording"
+    batch_size = 10
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches = []
+
+    async def send_batch(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("channel down")
+        self.batches.append([n.message for n in batch])
+        return [(DELIVERED, None)] * len(batch)
+
+
+class RecordingPipeline(NotificationPipeline):
+    def __init__(self, channel, **kwargs):
+        super().__init__(channels=[channel], persist=False, batch_window=0.05, backoff_base=0.01, **kwargs)
+        self.recorded = []
+
+    async def _record(self, channel_name, batch, outcomes, attempts):
+        self.recorded.extend((n.message, status, tries) for n, (status, _), tries in zip(batch, outcomes, attempts))
+
+
+def _note(i):
+    return Notification(user_id=1, kind="PRICE_ALERT", title="NABIL price alert", message=f"m{i}", symbol="NABIL")
+
+
+async def _drain(pipeline, expected, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if len(pipeline.recorded) >= expected:
+            break
+        await asyncio.sleep(0.01)
+
+
+class TestNotificationPipeline:
+    """Test delivery through a fake channel."""
+
+    @pytest.mark.asyncio
+    async def test_batches_per_channel(self):
+        channel = RecordingChannel()
+        pipeline = RecordingPipeline(channel)
+        pipeline.start()
+        for i in range(25):
+            pipeline.submit(_note(i))
+        await _drain(pipeline, 25)
+        await pipeline.stop()
+        assert [len(b) for b in channel.batches] == [10, 10, 5]
+        assert all(status == DELIVERED for _, status, _ in pipeline.recorded)
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff(self):
+        channel = RecordingChannel(failures=2)
+        pipeline = RecordingPipeline(channel)
+        pipeline.start()
+        pipeline.submit(_note(0))
+        await _drain(pipeline, 1)
+        await pipeline.stop()
+        assert pipeline.recorded == [("m0", DELIVERED, 3)]
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        channel = RecordingChannel(failures=10)
+        pipeline = RecordingPipeline(channel, max_attempts=3)
+        pipeline.start()
+        pipeline.submit(_note(0))
+        await _drain(pipeline, 1)
+        await pipeline.stop()
+        assert pipeline.recorded == [("m0", FAILED, 3)]
+
+    def test_full_intake_queue_drops(self):
+        pipeline = RecordingPipeline(RecordingChannel(), queue_size=2)
+        assert pipeline.submit(_note(0))
+        assert pipeline.submit(_note(1))
+        assert not pipeline.submit(_note(2))
+        assert pipeline.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_resends_only_transient_failures(self):
+        class PartialChannel(RecordingChannel):
+            async def send_batch(self, batch):
+                self.batches.append([n.message for n in batch])
+                if len(self.batches) == 1:
+                    return [(DELIVERED, None), (RETRY, "connection lost"), (RETRY, "connection lost")]
+                return [(DELIVERED, None)] * len(batch)
+
+        channel = PartialChannel()
+        pipeline = RecordingPipeline(channel)
+        pipeline.start()
+        for i in range(3):
+            pipeline.submit(_note(i))
+        await _drain(pipeline, 3)
+        await pipeline.stop()
+        assert channel.batches == [["m0", "m1", "m2"], ["m1", "m2"]]
+        assert pipeline.recorded == [("m0", DELIVERED, 1), ("m1", DELIVERED, 2), ("m2", DELIVERED, 2)]
+
+    @pytest.mark.asyncio
+    async def test_drops_are_recorded(self):
+        pipeline = RecordingPipeline(RecordingChannel(), queue_size=1)
+        pipeline.submit(_note(0))
+        pipeline.submit(_note(1))
+        pipeline.start()
+        await _drain(pipeline, 2)
+        await pipeline.stop()
+        assert sorted(pipeline.recorded) == [("m0", DELIVERED, 1), ("m1", DROPPED, 0)]
+
+    @pytest.mark.asyncio
+    async def test_drops_are_persisted(self, sqlite_sessions):
+        pipeline = NotificationPipeline(channels=[RecordingChannel()], queue_size=1)
+        pipeline.submit(_note(0))
+        pipeline.submit(_note(1))
+        with patch("app.services.notification_service.AsyncSessionLocal", sqlite_sessions):
+            await pipeline._record_drops()
+        async with sqlite_sessions() as db:
+            rows = (await db.execute(select(NotificationDelivery))).scalars().all()
+        assert [(r.channel, r.message, r.status, r.attempts) for r in rows] == [("recording", "m1", DROPPED, 0)]
+
+
+class FlakySMTP:
+    """SMTP connection that drops after ``sent_before_drop`` messages."""
+
+    def __init__(self, sent_before_drop):
+        self.sent_before_drop = sent_before_drop
+        self.sent = []
+
+    def __call__(self, host, port, timeout=None):
+        return self
+
+    def send_message(self, message):
+        if len(self.sent) == self.sent_before_drop:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(message["To"])
+
+    def quit(self):
+        raise smtplib.SMTPServerDisconnected("already closed")
+
+    def close(self):
+        pass
+
+
+class TestEmailChannel:
+    """Test that a connection lost mid-batch never re-sends delivered mail."""
+
+    def _message(self, to):
+        message = EmailMessage()
+        message["To"] = to
+        message.set_content("NABIL crossed 500")
+        return message
+
+    def test_lost_connection_retries_only_the_rest(self):
+        smtp = FlakySMTP(sent_before_drop=1)
+        messages = [self._message("a@example.com"), None, self._message("b@example.com"), self._message("c@example.com")]
+        with patch("smtplib.SMTP", smtp):
+            outcomes = EmailChannel("localhost", 25, "alerts@example.com")._send(messages)
+        assert smtp.sent == ["a@example.com"]
+        assert [status for status, _ in outcomes] == [DELIVERED, SKIPPED, RETRY, RETRY]
+
+
+class TestWebSocketChannel:
+    """Test that a stalled socket only delays its own user."""
+
+    @pytest.mark.asyncio
+    async def test_users_are_sent_to_in_parallel(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        sent = []
+
+        async def send_to_user(user_id, message):
+            if user_id == 1:
+                await asyncio.sleep(0.3)  # stalled client
+            sent.append((user_id, message["notification"]["message"], loop.time() - started))
+            return 0 if user_id == 3 else 1
+
+        batch = [
+            Notification(user_id=uid, kind="PRICE_ALERT", title="t", message=f"u{uid}-{i}")
+            for i in range(2) for uid in (1, 2, 3)
+        ]
+        with patch("app.services.notification_channels.manager.send_to_user", send_to_user):
+            outcomes = await WebSocketChannel().send_batch(batch)
+        # Users 2 and 3 are not held up behind user 1's stalled socket
+        assert all(at < 0.2 for uid, _, at in sent if uid != 1)
+        assert [m for uid, m, _ in sent if uid == 1] == ["u1-0", "u1-1"]
+        assert [status for status, _ in outcomes] == [DELIVERED, DELIVERED, SKIPPED] * 2
+
+    def test_channel_requires_send_batch(self):
+        class Incomplete(Channel):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
@@ -0,0 +1,93 @@
+"""
+ShareSathi — Order Book Tests
+==============================
+Tests for limit/stop order triggering and price-time priority.
+Run with: pytest tests/ -v
+"""
+
+from decimal import Decimal
+
+from app.services.order_book import OrderBook, RestingOrder
+
+
+def _order(order_id, side, order_type, price, symbol="NABIL"):
+    return RestingOrder(
+        id=order_id, user_id=1, symbol=symbol, side=side,
+        order_type=order_type, quantity=10, price=Decimal(str(price)),
+    )
+
+
+class TestOrderBook:
+    """Test the in-memory matching book."""
+
+    def test_buy_limit_fills_at_or_below_price(self):
+        book = OrderBook()
+        book.add(_order(1, "BUY", "LIMIT", 500))
+        assert book.match({"NABIL": 501}) == []
+        fills = book.match({"NABIL": 500})
+        assert [(o.id, p) for o, p in fills] == [(1, 500)]
+        assert len(book) == 0
+
+    def test_sell_limit_fills_at_or_above_price(self):
+        book = OrderBook()
+        book.add(_order(1, "SELL", "LIMIT", 600))
+        assert book.match({"NABIL": 599}) == []
+        assert [o.id for o, _ in book.match({"NABIL": 650})] == [1]
+
+    def test_stop_orders_trigger_on_breakout(self):
+        book = OrderBook()
+        book.add(_order(1, "BUY", "STOP", 600))
+        book.add(_order(2, "SELL", "STOP", 400))
+        assert book.match({"NABIL": 500}) == []
+        assert [o.id for o, _ in book.match({"NABIL": 610})] == [1]
+        assert [o.id for o, _ in book.match({"NABIL": 390})] == [2]
+
+    def test_only_crossed_orders_are_touched(self):
+        book = OrderBook()
+        for i, price in enumerate([480, 490, 500, 510, 520], start=1):
+            book.add(_order(i, "BUY", "LIMIT", price))
+        fills = book.match({"NABIL": 505})
+        # Highest bids first, then arrival order
+        assert [o.id for o, _ in fills] == [5, 4]
+        assert len(book) == 3
+
+    def test_price_time_priority(self):
+        book = OrderBook()
+        book.add(_order(3, "SELL", "LIMIT", 600))
+        book.add(_order(1, "SELL", "LIMIT", 610))
+        book.add(_order(2, "SELL", "LIMIT", 600))
+        assert [o.id for o, _ in book.match({"NABIL": 620})] == [2, 3, 1]
+
+    def test_cancelled_orders_never_fill(self):
+        book = OrderBook()
+        book.add(_order(1, "BUY", "LIMIT", 500))
+        book.add(_order(2, "BUY", "LIMIT", 500))
+        book.remove(1)
+        assert [o.id for o, _ in book.match({"NABIL": 450})] == [2]
+
+    def test_cancellations_do_not_accumulate(self):
+        book = OrderBook()
+        book.add(_order(1, "BUY", "LIMIT", 100))  # never crossed, stays resting
+        for i in range(2, 1002):
+            book.add(_order(i, "BUY", "LIMIT", 50 + i % 40))
+            book.remove(i)
+        assert len(book) == 1
+        assert book.heap_size() <= 2
+        assert [o.id for o, _ in book.match({"NABIL": 90})] == [1]
+        assert book.heap_size() == 0
+
+    def test_cancelling_the_top_unblocks_the_next(self):
+        book = OrderBook()
+        book.add(_order(1, "SELL", "LIMIT", 600))
+        book.add(_order(2, "SELL", "LIMIT", 610))
+        book.add(_order(3, "SELL", "LIMIT", 620))
+        book.remove(1)
+        assert book.heap_size() == 2
+        assert [o.id for o, _ in book.match({"NABIL": 615})] == [2]
+
+    def test_symbols_are_independent(self):
+        book = OrderBook()
+        book.add(_order(1, "BUY", "LIMIT", 500, symbol="NABIL"))
+        book.add(_order(2, "BUY", "LIMIT", 500, symbol="NICA"))
+        assert [o.id for o, _ in book.match({"NICA": 450})] == [2]
+        assert 1 in book
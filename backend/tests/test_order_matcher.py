@@ -0,0 +1,97 @@
+"""
+ShareSathi — Order Matcher Tests
+=================================
+Tests for filling triggered limit/stop orders against the database.
+Run with: pytest tests/ -v
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.background import order_matcher
+from app.ingestion import LiveTick, StockQuote
+from app.models.order import Order
+from app.models.stock import Stock
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.services.order_book import order_book
+from app.services.order_sequencer import UserOrderSequencer
+from app.services.trading_service import TradingService, resting_order
+
+
+@pytest.fixture
+def matcher(sqlite_sessions):
+    """Run the matcher on the test database with a process-local sequencer."""
+    sequencer = UserOrderSequencer(distributed=False)
+    order_book.clear()
+    with patch.object(order_matcher, "AsyncSessionLocal", sqlite_sessions), \
+            patch.object(order_matcher, "order_sequencer", sequencer):
+        yield sequencer
+    order_book.clear()
+
+
+async def _rest(sessions, side="BUY", price="500", balance=1000000):
+    async with sessions() as db:
+        db.add(User(id=1, email="trader@example.com", password_hash="x"))
+        db.add(Wallet(user_id=1, balance=Decimal(balance)))
+        db.add(Stock(symbol="NABIL", company_name="Nabil Bank"))
+        order = Order(
+            user_id=1, symbol="NABIL", side=side, order_type="LIMIT",
+            quantity=10, price=Decimal(price), status="OPEN",
+        )
+        db.add(order)
+        await db.commit()
+        await db.refresh(order)
+    order_book.add(resting_order(order))
+    return order.id
+
+
+async def _order(sessions, order_id):
+    async with sessions() as db:
+        return (await db.execute(select(Order).where(Order.id == order_id))).scalar_one()
+
+
+TICK = LiveTick([StockQuote("NABIL", 495.0, 500.0, -1.0, 100)])
+
+
+class TestMatchOrders:
+    """Test that every triggered order ends filled, rejected or back in the book."""
+
+    @pytest.mark.asyncio
+    async def test_crossed_order_is_filled(self, sqlite_sessions, matcher):
+        order_id = await _rest(sqlite_sessions)
+        await order_matcher.match_orders(TICK)
+        order = await _order(sqlite_sessions, order_id)
+        assert (order.status, order.filled_price) == ("FILLED", Decimal("495.00"))
+        assert order_id not in order_book
+
+    @pytest.mark.asyncio
+    async def test_unaffordable_order_is_rejected(self, sqlite_sessions, matcher):
+        order_id = await _rest(sqlite_sessions, balance=100)
+        await order_matcher.match_orders(TICK)
+        order = await _order(sqlite_sessions, order_id)
+        assert order.status == "REJECTED"
+        assert order.status_reason.startswith("Insufficient balance")
+        assert order_id not in order_book
+
+    @pytest.mark.asyncio
+    async def test_failed_fill_stays_in_the_book(self, sqlite_sessions, matcher):
+        order_id = await _rest(sqlite_sessions)
+        with patch.object(TradingService, "fill_order", AsyncMock(side_effect=RuntimeError("db down"))):
+            await order_matcher.match_orders(TICK)
+        assert order_id in order_book
+        assert (await _order(sqlite_sessions, order_id)).status == "OPEN"
+
+        await order_matcher.match_orders(TICK)
+        assert (await _order(sqlite_sessions, order_id)).status == "FILLED"
+
+    @pytest.mark.asyncio
+    async def test_busy_user_is_retried_next_tick(self, sqlite_sessions, matcher):
+        order_id = await _rest(sqlite_sessions)
+        async with matcher.serialize(1):
+            await order_matcher.match_orders(TICK)
+        assert order_id in order_book
+        assert (await _order(sqlite_sessions, order_id)).status == "OPEN"
@@ -0,0 +1,144 @@
+"""
+ShareSathi — Order Sequencer Tests
+===================================
+Tests for per-user order serialization.
+Run with: pytest tests/ -v
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from redis.exceptions import LockNotOwnedError
+
+from app.config import settings
+from app.services.order_sequencer import UserOrderSequencer
+
+
+class TestUserOrderSequencer:
+    """Test the keyed per-user lock map."""
+
+    @pytest.mark.asyncio
+    async def test_same_user_runs_in_sequence(self):
+        sequencer = UserOrderSequencer(distributed=False)
+        events = []
+
+        async def order(name):
+            async with sequencer.serialize(1):
+                events.append(f"{name}-start")
+                await asyncio.sleep(0.01)
+                events.append(f"{name}-end")
+
+        await asyncio.gather(order("a"), order("b"), order("c"))
+        assert events == ["a-start", "a-end", "b-start", "b-end", "c-start", "c-end"]
+
+    @pytest.mark.asyncio
+    async def test_different_users_run_in_parallel(self):
+        sequencer = UserOrderSequencer(distributed=False)
+        inside = 0
+        peak = 0
+
+        async def order(user_id):
+            nonlocal inside, peak
+            async with sequencer.serialize(user_id):
+                inside += 1
+                peak = max(peak, inside)
+                await asyncio.sleep(0.01)
+                inside -= 1
+
+        await asyncio.gather(*(order(uid) for uid in range(5)))
+        assert peak == 5
+
+    @pytest.mark.asyncio
+    async def test_idle_locks_are_evicted(self):
+        sequencer = UserOrderSequencer(distributed=False)
+        async with sequencer.serialize(1):
+            async with sequencer.serialize(2):
+                assert len(sequencer) == 2
+        assert len(sequencer) == 0
+
+    @pytest.mark.asyncio
+    async def test_lock_released_on_error(self):
+        sequencer = UserOrderSequencer(distributed=False)
+        with pytest.raises(ValueError):
+            async with sequencer.serialize(1):
+                raise ValueError("boom")
+        assert len(sequencer) == 0
+        async with sequencer.serialize(1):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_bounded_wait_refuses_busy_user(self):
+        sequencer = UserOrderSequencer(distributed=False)
+        async with sequencer.serialize(1):
+            with pytest.raises(HTTPException) as exc:
+                async with sequencer.serialize(1, wait=0.01):
+                    pass
+            assert exc.value.status_code == 429
+            async with sequencer.serialize(2, wait=0.01):
+                pass
+        assert len(sequencer) == 0
+
+
+class ExpiringLocks:
+    """In-memory stand-in for Redis locks with a TTL, shared by "workers"."""
+
+    def __init__(self):
+        self.holders = {}  # name -> (token, expires_at)
+
+    def lock(self, name, timeout, blocking_timeout):
+        return _ExpiringLock(self, name, timeout, blocking_timeout)
+
+
+class _ExpiringLock:
+    def __init__(self, store, name, timeout, blocking_timeout):
+        self.store, self.name, self.timeout, self.blocking_timeout = store, name, timeout, blocking_timeout
+        self.token = object()
+
+    def _now(self):
+        return asyncio.get_running_loop().time()
+
+    async def acquire(self):
+        deadline = self._now() + self.blocking_timeout
+        while True:
+            holder = self.store.holders.get(self.name)
+            if holder is None or holder[1] <= self._now():
+                self.store.holders[self.name] = (self.token, self._now() + self.timeout)
+                return True
+            if self._now() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+
+    async def reacquire(self):
+        holder = self.store.holders.get(self.name)
+        if holder is None or holder[0] is not self.token or holder[1] <= self._now():
+            raise LockNotOwnedError("lock expired")
+        self.store.holders[self.name] = (self.token, self._now() + self.timeout)
+
+    async def release(self):
+        holder = self.store.holders.get(self.name)
+        if holder is None or holder[0] is not self.token:
+            raise LockNotOwnedError("lock expired")
+        del self.store.holders[self.name]
+
+
+class TestDistributedLock:
+    """Test the cross-worker lock outliving its TTL while the order runs."""
+
+    @pytest.mark.asyncio
+    async def test_slow_order_keeps_the_lock_past_its_ttl(self):
+        locks = ExpiringLocks()
+        worker_a, worker_b = UserOrderSequencer(), UserOrderSequencer()
+        with patch("app.services.order_sequencer.get_redis", AsyncMock(return_value=locks)), \
+                patch("app.services.order_sequencer.using_fakeredis", return_value=False), \
+                patch.object(settings, "ORDER_LOCK_TIMEOUT_SECONDS", 0.15):
+            async with worker_a.serialize(1):
+                await asyncio.sleep(0.4)  # well past the TTL
+                with pytest.raises(HTTPException) as exc:
+                    async with worker_b.serialize(1, wait=0.05):
+                        pass
+                assert exc.value.status_code == 429
+            async with worker_b.serialize(1, wait=0.05):
+                pass
+        assert locks.holders == {}
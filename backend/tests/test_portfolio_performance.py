@@ -0,0 +1,77 @@
+"""
+ShareSathi — Portfolio Performance Tests
+=========================================
+Tests for EOD NAV valuation and TWR/MWR calculation.
+Run with: pytest tests/ -v
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.api.portfolio import get_my_performance
+from app.background.portfolio_snapshots import value_portfolios
+from app.services.performance_service import modified_dietz, time_weighted_returns
+from app.services.trading_service import NPT_OFFSET
+
+
+class TestValuePortfolios:
+    """Test vectorized valuation of the joined wallet/position rows."""
+
+    def test_sums_positions_per_user(self):
+        holdings = [
+            (1, Decimal("1000.00"), "NABIL", 10, Decimal("480.00")),
+            (1, Decimal("1000.00"), "NICA", 20, Decimal("790.00")),
+            (2, Decimal("500.50"), "NABIL", 30, Decimal("510.00")),
+        ]
+        values = value_portfolios(holdings, {"NABIL": 500.1, "NICA": 800.0})
+        assert values[1] == (Decimal("1000.00"), Decimal("21001.00"))
+        assert values[2] == (Decimal("500.50"), Decimal("15003.00"))
+
+    def test_cash_only_user(self):
+        values = value_portfolios([(3, Decimal("1000000.00"), None, None, None)], {})
+        assert values == {3: (Decimal("1000000.00"), Decimal("0.00"))}
+
+    def test_missing_close_falls_back_to_average_price(self):
+        values = value_portfolios([(1, Decimal("0"), "SCB", 10, Decimal("420.55"))], {"NABIL": 500})
+        assert values[1][1] == Decimal("4205.50")
+
+
+class TestReturns:
+    """Test time- and money-weighted returns over a snapshot series."""
+
+    def test_twr_without_flows_is_nav_ratio(self):
+        twr = time_weighted_returns([100.0, 110.0, 99.0], [0.0, 0.0, 0.0])
+        assert twr == pytest.approx([0.0, 0.10, -0.01])
+
+    def test_twr_ignores_deposits(self):
+        # +10% on day 1, then a 1000 deposit with no market move
+        twr = time_weighted_returns([1000.0, 1100.0, 2100.0], [0.0, 0.0, 1000.0])
+        assert twr[-1] == pytest.approx(0.10)
+
+    def test_modified_dietz_without_flows(self):
+        assert modified_dietz([100.0, 120.0], [0.0, 0.0], [0, 10]) == pytest.approx(0.20)
+
+    def test_modified_dietz_weights_flows_by_time(self):
+        # 1000 deposited halfway through a 10-day period; 100 gained overall
+        mwr = modified_dietz([1000.0, 1500.0, 2100.0], [0.0, 1000.0, 0.0], [0, 5, 10])
+        assert mwr == pytest.approx(100 / 1500)
+
+    def test_single_snapshot_has_no_return(self):
+        assert modified_dietz([100.0], [0.0], [0]) is None
+
+
+class TestPerformanceEndpoint:
+    """Test the default date range."""
+
+    @pytest.mark.asyncio
+    async def test_defaults_to_the_npt_trading_day(self):
+        # 20:00 UTC on Jan 4 is already 01:45 on Jan 5 in Nepal
+        npt = datetime(2026, 1, 4, 20, 0, tzinfo=timezone.utc) + NPT_OFFSET
+        with patch("app.api.portfolio.npt_now", return_value=npt), \
+                patch("app.api.portfolio.PerformanceService") as service:
+            service.return_value.get_performance = AsyncMock(return_value={})
+            await get_my_performance(user_id=1, db=None, start=None, end=None)
+        service.return_value.get_performance.assert_awaited_once_with(1, date(2025, 1, 5), date(2026, 1, 5))
@@ -0,0 +1,84 @@
+"""
+ShareSathi — Principal Cache Tests
+===================================
+Tests for the cached authenticated-user principal and the claims-only dependency.
+Run with: pytest tests/ -v
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import fakeredis.aioredis
+import pytest
+from fastapi import HTTPException
+
+from app.core.jwt_handler import create_access_token, create_refresh_token
+from app.core.principal_cache import PrincipalCache, UserPrincipal
+from app.dependencies import get_current_user_id
+
+PRINCIPAL = UserPrincipal(
+    id=7, email="trader@example.com", full_name="Test Trader",
+    is_active=True, created_at=datetime(2026, 1, 5, 10, 30),
+)
+
+
+class TestUserPrincipal:
+    """Test the cached snapshot of a user row."""
+
+    def test_json_round_trip(self):
+        assert UserPrincipal.from_json(PRINCIPAL.to_json()) == PRINCIPAL
+
+    def test_json_never_contains_password_hash(self):
+        assert "password" not in PRINCIPAL.to_json()
+
+
+@pytest.fixture
+def fake_redis():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    with patch("app.core.principal_cache.get_redis", AsyncMock(return_value=redis)):
+        yield redis
+
+
+@pytest.mark.usefixtures("fake_redis")
+class TestPrincipalCache:
+    """Test local hits, Redis fallback and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_set_then_get(self):
+        cache = PrincipalCache(ttl=30)
+        await cache.set(PRINCIPAL)
+        assert await cache.get(PRINCIPAL.id) == PRINCIPAL
+
+    @pytest.mark.asyncio
+    async def test_redis_copy_survives_local_eviction(self):
+        cache = PrincipalCache(ttl=30)
+        await cache.set(PRINCIPAL)
+        cache._local.clear()
+        assert await cache.get(PRINCIPAL.id) == PRINCIPAL
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        cache = PrincipalCache(ttl=30)
+        await cache.set(PRINCIPAL)
+        await cache.invalidate(PRINCIPAL.id)
+        assert await cache.get(PRINCIPAL.id) is None
+
+
+class TestCurrentUserId:
+    """Test the lookup-free user id dependency."""
+
+    @pytest.mark.asyncio
+    async def test_access_token(self):
+        token = create_access_token(7, expires_delta=timedelta(minutes=5))
+        assert await get_current_user_id(token) == 7
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_rejected(self):
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user_id(create_refresh_token(7))
+        assert exc.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_garbage_token_rejected(self):
+        with pytest.raises(HTTPException):
+            await get_current_user_id("not-a-jwt")
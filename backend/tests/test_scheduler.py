@@ -0,0 +1,32 @@
+"""
+ShareSathi — Scheduler Tests
+=============================
+Tests that every background job builds and is registered at startup.
+Run with: pytest tests/ -v
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from app.background import scheduler as scheduler_module
+
+
+class TestStartScheduler:
+    """Test job registration with the trading-day cron triggers."""
+
+    def test_registers_every_job(self):
+        fake = MagicMock()
+        with patch.object(scheduler_module, "scheduler", fake):
+            scheduler_module.start_scheduler()
+        ids = [call.kwargs["id"] for call in fake.add_job.call_args_list]
+        assert ids == ["sync_eod", "snapshot_portfolios", "sync_historical", "refresh_news"]
+        fake.start.assert_called_once()
+
+    def test_eod_jobs_run_sunday_to_thursday(self):
+        fake = MagicMock()
+        with patch.object(scheduler_module, "scheduler", fake):
+            scheduler_module.start_scheduler()
+        trigger = fake.add_job.call_args_list[1].args[1]
+        # Thu 2026-01-01 15:30 -> next run Sun 2026-01-04 15:20
+        after = datetime(2026, 1, 1, 15, 30, tzinfo=trigger.timezone)
+        assert trigger.get_next_fire_time(None, after).strftime("%a %H:%M") == "Sun 15:20"
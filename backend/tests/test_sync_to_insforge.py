@@ -0,0 +1,452 @@
+"""
+ShareSathi — InsForge Sync Tests
+=================================
+Tests for the standalone sync script: local state and incremental fetching.
+Run with: pytest tests/ -v
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+# The script refuses to import without its InsForge credentials
+os.environ.setdefault("INSFORGE_BASE_URL", "http://insforge.test")
+os.environ.setdefault("INSFORGE_ANON_KEY", "test-key")
+
+import sync_to_insforge as sync  # noqa: E402
+
+LISTING = b"""<html><body>
+<h4><a href="/newsdetail/nabil-dividend">NABIL Bank announces 15% cash dividend</a></h4>
+<h4><a href="/newsdetail/upper-ipo">Upper Tamakoshi IPO result published today</a></h4>
+</body></html>"""
+
+DETAIL = b"""<html><head><meta property="og:image" content="https://img.test/a.jpg"></head>
+<body><div class="news-content">Full article text that is longer than the headline.</div></body></html>"""
+
+
+@pytest.fixture(autouse=True)
+def state_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "sync_state.db")
+    monkeypatch.setattr(sync, "SYNC_STATE_PATH", path)
+    monkeypatch.setattr(sync, "RPC_RETRY_BACKOFF", 0.01)
+    return path
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestBoundedMap:
+    """Test the sliding-window worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_order_and_bounds_concurrency(self):
+        in_flight = 0
+        peak = 0
+
+        async def work(i):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (i % 3))
+            in_flight -= 1
+            return i * 2
+
+        assert await sync.bounded_map(work, range(10), 3) == [i * 2 for i in range(10)]
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_slow_item_does_not_hold_back_the_rest(self):
+        started = []
+
+        async def work(i):
+            started.append(i)
+            await asyncio.sleep(0.2 if i == 0 else 0.01)
+
+        task = asyncio.ensure_future(sync.bounded_map(work, range(6), 2))
+        await asyncio.sleep(0.1)
+        # Batches of two would still be waiting on item 0
+        assert started == [0, 1, 2, 3, 4, 5]
+        await task
+
+
+class TestArticleDetailCache:
+    """Test that article pages are fetched once across runs."""
+
+    def test_failed_fetch_is_retried_later(self, monkeypatch):
+        state = sync.SyncState()
+        state.save_article_details({
+            "https://x/ok": {"image_url": "i", "content": "c", "status": "ok"},
+            "https://x/gone": {"image_url": None, "content": None, "status": "gone"},
+            "https://x/error": {"image_url": None, "content": None, "status": "error"},
+        })
+        assert set(state.get_article_details(["https://x/ok", "https://x/gone", "https://x/error"])) == {
+            "https://x/ok", "https://x/gone", "https://x/error",
+        }
+        monkeypatch.setattr(sync, "DETAIL_RETRY_AFTER", -1)
+        assert set(state.get_article_details(["https://x/ok", "https://x/gone", "https://x/error"])) == {
+            "https://x/ok", "https://x/gone",
+        }
+        state.close()
+
+    @pytest.mark.asyncio
+    async def test_second_run_fetches_only_new_urls(self):
+        detail_requests = []
+        pushed = []
+
+        def handler(request):
+            if request.method == "POST":
+                pushed.append(json.loads(request.content)["data"])
+                return httpx.Response(200, json={"ok": True})
+            if "/newsdetail/" in request.url.path:
+                detail_requests.append(request.url.path)
+                return httpx.Response(200, content=DETAIL)
+            return httpx.Response(200, content=LISTING)
+
+        async with _client(handler) as client:
+            await sync.fetch_and_sync_news(client)
+            first = len(detail_requests)
+            await sync.fetch_and_sync_news(client)
+
+        assert sorted(set(detail_requests)) == ["/newsdetail/nabil-dividend", "/newsdetail/upper-ipo"]
+        assert len(detail_requests) == first
+        # Cached details are still applied on the second run
+        for article in pushed[1]:
+            assert article["image_url"] == "https://img.test/a.jpg"
+            assert article["content"].startswith("Full article text")
+
+
+class FakeNepse:
+    """History endpoint returning three business days per symbol."""
+
+    def __init__(self, fail=()):
+        self.days = ["2026-01-04", "2026-01-05", "2026-01-06"]
+        self.fail = set(fail)
+        self.calls = []
+
+    async def getCompanyPriceVolumeHistory(self, symbol, start_date=None):
+        self.calls.append((symbol, start_date))
+        await asyncio.sleep(0)
+        if symbol in self.fail:
+            raise httpx.ConnectError("rate limited")
+        days = [d for d in self.days if start_date is None or d >= start_date.isoformat()]
+        return [{"businessDate": d, "closePrice": 100, "totalTradedQuantity": 10} for d in days]
+
+
+def _rpc_recorder(uploaded):
+    def handler(request):
+        uploaded.extend(json.loads(request.content)["data"])
+        return httpx.Response(200, json={"ok": True})
+    return handler
+
+
+class TestAdaptiveLimiter:
+    """Test AIMD growth and back-off."""
+
+    @pytest.mark.asyncio
+    async def test_grows_on_fast_success_and_halves_on_slow_or_failed_calls(self):
+        limiter = sync.AdaptiveLimiter(max_limit=8, target_latency=1.0, initial=4)
+        for _ in range(8):
+            await limiter.acquire()
+            await limiter.release(0.1, ok=True)
+        assert 5 < limiter.limit <= 6
+        await limiter.acquire()
+        await limiter.release(2.0, ok=True)
+        assert 2.5 < limiter.limit <= 3
+        await limiter.acquire()
+        await limiter.release(0.1, ok=False)
+        assert 1 <= limiter.limit <= 1.5
+
+    @pytest.mark.asyncio
+    async def test_never_exceeds_max(self):
+        limiter = sync.AdaptiveLimiter(max_limit=3, target_latency=1.0)
+        for _ in range(50):
+            await limiter.acquire()
+            await limiter.release(0.0, ok=True)
+        assert limiter.limit == 3
+
+
+class TestHistoryBackfill:
+    """Test high-water marks, incremental uploads and resuming."""
+
+    @pytest.mark.asyncio
+    async def test_second_run_uploads_only_new_days(self, monkeypatch):
+        uploaded = []
+        nepse = FakeNepse()
+        async with _client(_rpc_recorder(uploaded)) as client:
+            await sync.fetch_and_sync_history(client, ["NABIL", "NICA"], nepse=nepse)
+            assert len(uploaded) == 6
+
+            nepse.days.append("2026-01-07")
+            monkeypatch.setattr(sync, "HISTORY_RECHECK_AFTER", -1)
+            uploaded.clear()
+            nepse.calls.clear()
+            await sync.fetch_and_sync_history(client, ["NABIL", "NICA"], nepse=nepse)
+
+        assert sorted(nepse.calls) == [("NABIL", sync.date(2026, 1, 7)), ("NICA", sync.date(2026, 1, 7))]
+        assert [(r["symbol"], r["date"]) for r in sorted(uploaded, key=lambda r: r["symbol"])] == [
+            ("NABIL", "2026-01-07"), ("NICA", "2026-01-07"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_run_resumes_with_unfinished_symbols(self):
+        uploaded = []
+        async with _client(_rpc_recorder(uploaded)) as client:
+            await sync.fetch_and_sync_history(client, ["NABIL"], nepse=FakeNepse())
+            nepse = FakeNepse()
+            await sync.fetch_and_sync_history(client, ["NABIL", "NICA", "UPPER"], nepse=nepse)
+        assert sorted(s for s, _ in nepse.calls) == ["NICA", "UPPER"]
+
+    @pytest.mark.asyncio
+    async def test_failing_symbol_is_retried_and_keeps_no_mark(self, monkeypatch):
+        monkeypatch.setattr(sync.AdaptiveLimiter, "release", _release_without_cooldown)
+        nepse = FakeNepse(fail={"NICA"})
+        async with _client(_rpc_recorder([])) as client:
+            await sync.fetch_and_sync_history(client, ["NABIL", "NICA"], nepse=nepse)
+        assert [s for s, _ in nepse.calls].count("NICA") == sync.HISTORY_MAX_ATTEMPTS
+        state = sync.SyncState()
+        assert set(state.get_history_marks()) == {"NABIL"}
+        state.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_upload_keeps_the_old_mark(self):
+        async with _client(lambda request: httpx.Response(500, text="boom")) as client:
+            await sync.fetch_and_sync_history(client, ["NABIL"], nepse=FakeNepse())
+        state = sync.SyncState()
+        assert state.get_history_marks() == {}
+        state.close()
+
+
+_original_release = sync.AdaptiveLimiter.release
+
+
+async def _release_without_cooldown(self, latency, ok):
+    await _original_release(self, latency, ok)
+    self._resume_at = 0.0
+
+
+class FakeMarketNepse:
+    """Live market endpoints with editable prices."""
+
+    def __init__(self):
+        self.ltp = {"NABIL": 500.0, "NICA": 400.0}
+
+    async def getSummary(self):
+        return [{"detail": "Total Turnover Rs:", "value": "1,000"}]
+
+    async def getNepseIndex(self):
+        return [{"index": "NEPSE Index", "currentValue": 2100, "change": 5, "perChange": 0.2}]
+
+    async def getNepseSubIndices(self):
+        return [{"index": "Banking SubIndex", "currentValue": 1500, "change": 1, "percentChange": 0.1}]
+
+    async def getTopGainers(self):
+        return []
+
+    getTopLosers = getTopTenTurnoverScrips = getTopGainers
+
+    async def isNepseOpen(self):
+        return False
+
+    async def getLiveMarket(self):
+        return [{"symbol": s, "lastTradedPrice": p, "previousClose": 490} for s, p in self.ltp.items()]
+
+    async def getCompanyList(self):
+        return []
+
+
+class TestChangeDataCapture:
+    """Test that market cycles push only rows that changed."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_rows_are_not_pushed_again(self):
+        calls = []
+
+        def handler(request):
+            calls.append((request.url.path.rsplit("/", 1)[-1], json.loads(request.content)))
+            return httpx.Response(200, json={"ok": True})
+
+        nepse = FakeMarketNepse()
+        async with _client(handler) as client:
+            await sync.fetch_and_sync_market(client, nepse=nepse)
+            assert [name for name, _ in calls] == ["sync_stocks", "sync_market_summary", "sync_sub_indices"]
+            calls.clear()
+
+            await sync.fetch_and_sync_market(client, nepse=nepse)
+            assert calls == []
+
+            nepse.ltp["NICA"] = 410.0
+            await sync.fetch_and_sync_market(client, nepse=nepse)
+            assert [(name, [s["symbol"] for s in body["stock_data"]]) for name, body in calls] == [
+                ("sync_stocks", ["NICA"]),
+            ]
+            calls.clear()
+
+            await sync.fetch_and_sync_market(client, only_changed=False, nepse=nepse)
+            assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_push_is_sent_again(self):
+        rows = {"NABIL": {"symbol": "NABIL", "ltp": 500.0}}
+        sent = []
+
+        async def failing(batch):
+            sent.append(batch)
+            return {"error": "503"}
+
+        async def ok(batch):
+            sent.append(batch)
+            return {"ok": True}
+
+        await sync.push_changed("stocks", rows, failing)
+        await sync.push_changed("stocks", rows, ok)
+        await sync.push_changed("stocks", rows, ok)
+        assert len(sent) == 2
+
+
+class TestDaemonScheduling:
+    """Test that each source runs on its own interval and timeout."""
+
+    @pytest.mark.asyncio
+    async def test_slow_task_times_out_without_blocking_others(self):
+        runs = {"fast": 0, "slow": 0}
+
+        async def fast(client):
+            runs["fast"] += 1
+
+        async def slow(client):
+            runs["slow"] += 1
+            await asyncio.sleep(10)
+
+        tasks = [
+            sync.SyncTask("fast", fast, lambda: 0.02, timeout=1),
+            sync.SyncTask("slow", slow, lambda: 0.02, timeout=0.05),
+        ]
+        loops = asyncio.gather(*(sync.run_task_forever(t, None) for t in tasks))
+        await asyncio.sleep(0.2)
+        loops.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await loops
+        assert runs["fast"] >= 5
+        assert 2 <= runs["slow"] <= 4
+
+    @pytest.mark.asyncio
+    async def test_failing_run_does_not_stop_the_schedule(self):
+        runs = 0
+
+        async def flaky(client):
+            nonlocal runs
+            runs += 1
+            raise RuntimeError("NEPSE down")
+
+        loop = asyncio.ensure_future(sync.run_task_forever(sync.SyncTask("flaky", flaky, lambda: 0.01, 1), None))
+        await asyncio.sleep(0.1)
+        loop.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await loop
+        assert runs >= 3
+
+
+class StandInInsForge(BaseHTTPRequestHandler):
+    """RPC endpoint on a local port; ``server.plan`` decides each response."""
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with server.lock:
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+            attempt = server.attempts[body] = server.attempts.get(body, 0) + 1
+        try:
+            status, delay = server.plan(attempt)
+            time.sleep(delay)
+            if status == 200:
+                with server.lock:
+                    server.received.append(json.loads(body))
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"ok":true}' if status == 200 else b'{"message":"unavailable"}')
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out and hung up
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def insforge(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInInsForge)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.in_flight = server.peak = 0
+    server.attempts, server.received = {}, []
+    server.plan = lambda attempt: (200, 0.0)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    monkeypatch.setattr(sync, "RPC_URL", f"http://127.0.0.1:{server.server_address[1]}/api/database/rpc")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+ROWS = [{"symbol": f"S{i:03d}", "date": "2026-01-05", "close": 100.5 + i} for i in range(200)]
+
+
+class TestChunkedUpload:
+    """Test byte-sized chunks, the in-flight window and retries against a local server."""
+
+    def test_chunks_respect_the_byte_limit(self):
+        chunks = list(sync.chunk_rows(ROWS, 1024))
+        assert len(chunks) > 1
+        assert all(sum(len(r) + 1 for r in chunk) <= 1024 for chunk in chunks)
+        assert [json.loads(r) for chunk in chunks for r in chunk] == ROWS
+        assert [len(c) for c in sync.chunk_rows([{"x": "y" * 5000}, {"x": 1}], 1024)] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_all_rows_arrive_once_within_the_window(self, insforge, monkeypatch):
+        monkeypatch.setattr(sync, "RPC_CHUNK_BYTES", 1024)
+        insforge.plan = lambda attempt: (200, 0.05)
+        async with httpx.AsyncClient() as client:
+            result = await sync.upload_rows(client, "sync_stocks", ROWS, key="stock_data")
+        assert "error" not in result
+        assert result["chunks"] == len(insforge.received) > sync.RPC_MAX_IN_FLIGHT
+        assert sorted(r["symbol"] for body in insforge.received for r in body["stock_data"]) == [
+            r["symbol"] for r in ROWS
+        ]
+        assert 1 < insforge.peak <= sync.RPC_MAX_IN_FLIGHT
+
+    @pytest.mark.asyncio
+    async def test_5xx_and_timeouts_are_retried(self, insforge, monkeypatch):
+        monkeypatch.setattr(sync, "RPC_CHUNK_BYTES", 2048)
+        monkeypatch.setattr(sync, "RPC_TIMEOUT", 0.2)
+        insforge.plan = lambda attempt: {1: (503, 0.0), 2: (200, 0.5)}.get(attempt, (200, 0.0))
+        async with httpx.AsyncClient() as client:
+            result = await sync.upload_rows(client, "sync_historical_prices", ROWS)
+        assert "error" not in result
+        assert set(insforge.attempts.values()) == {3}
+        assert len({r["symbol"] for body in insforge.received for r in body["data"]}) == len(ROWS)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, insforge):
+        insforge.plan = lambda attempt: (500, 0.0)
+        async with httpx.AsyncClient() as client:
+            result = await sync.upload_rows(client, "sync_news", ROWS[:3])
+        assert result["error"] == "1 of 1 chunks failed"
+        assert list(insforge.attempts.values()) == [sync.RPC_MAX_ATTEMPTS]
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, insforge):
+        insforge.plan = lambda attempt: (400, 0.0)
+        async with httpx.AsyncClient() as client:
+            assert "error" in await sync.call_rpc(client, "sync_ipo", {"data": []})
+        assert list(insforge.attempts.values()) == [1]
@@ -0,0 +1,120 @@
+"""
+ShareSathi — Token Verification & Revocation Tests
+===================================================
+Tests for the JWT backends, the verified-token cache and the revocation list.
+Run with: pytest tests/ -v
+"""
+
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import fakeredis.aioredis
+import pytest
+
+from app.core import jwt_handler
+from app.core.jwt_handler import (
+    JoseBackend,
+    PyJWTBackend,
+    TokenError,
+    create_access_token,
+    create_refresh_token,
+    decode_access_token,
+    decode_refresh_token,
+)
+from app.core.token_revocation import TokenRevocationList
+
+
+@pytest.fixture
+def fake_redis():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    with patch("app.core.token_revocation.get_redis", AsyncMock(return_value=redis)):
+        yield redis
+
+
+class TestJWTBackends:
+    """Test that both backends agree on the token format."""
+
+    @pytest.mark.parametrize("encoder,decoder", [
+        (PyJWTBackend, JoseBackend), (JoseBackend, PyJWTBackend), (PyJWTBackend, PyJWTBackend),
+    ])
+    def test_cross_backend_round_trip(self, encoder, decoder):
+        claims = {"sub": "7", "exp": int(time.time()) + 60, "type": "access"}
+        assert decoder().decode(encoder().encode(claims)) == claims
+
+    @pytest.mark.parametrize("backend", [PyJWTBackend, JoseBackend])
+    def test_bad_tokens_raise_token_error(self, backend):
+        expired = backend().encode({"sub": "7", "exp": int(time.time()) - 60})
+        for token in ("not-a-jwt", expired, backend().encode({"sub": "7"})):
+            with pytest.raises(TokenError):
+                backend().decode(token)
+
+    def test_tokens_carry_jti_and_iat(self):
+        payload = decode_access_token(create_access_token(7))
+        assert payload["sub"] == "7" and payload["type"] == "access"
+        assert payload["jti"] and payload["iat"] <= payload["exp"]
+        assert payload["jti"] != decode_access_token(create_access_token(7))["jti"]
+
+
+class TestVerifiedTokenCache:
+    """Test that repeat tokens skip signature verification."""
+
+    def test_second_decode_is_cached(self):
+        token = create_access_token(7, expires_delta=timedelta(minutes=5))
+        with patch.object(jwt_handler.backend, "decode", wraps=jwt_handler.backend.decode) as decode:
+            first = decode_access_token(token)
+            second = decode_access_token(token)
+        assert first == second
+        assert decode.call_count == 1
+
+    def test_invalid_tokens_are_not_cached(self):
+        with pytest.raises(TokenError):
+            decode_access_token("not-a-jwt")
+        with pytest.raises(TokenError):
+            decode_access_token("not-a-jwt")
+
+    def test_refresh_token_decoder_rejects_access_tokens(self):
+        assert decode_refresh_token(create_access_token(7)) is None
+        assert decode_refresh_token(create_refresh_token(7))["type"] == "refresh"
+
+
+@pytest.mark.usefixtures("fake_redis")
+class TestTokenRevocationList:
+    """Test per-token and per-user revocation and cross-worker sync."""
+
+    @pytest.mark.asyncio
+    async def test_revoke_single_token(self):
+        revocation = TokenRevocationList(sync_interval=0, max_token_age=3600)
+        kept = decode_access_token(create_access_token(7))
+        revoked = decode_access_token(create_access_token(7))
+        await revocation.revoke(revoked)
+        assert await revocation.is_revoked(revoked)
+        assert not await revocation.is_revoked(kept)
+
+    @pytest.mark.asyncio
+    async def test_revoke_user_rejects_older_tokens_only(self):
+        revocation = TokenRevocationList(sync_interval=0, max_token_age=3600)
+        old = dict(decode_access_token(create_access_token(7)), iat=int(time.time()) - 10)
+        other_user = dict(old, sub="8")
+        await revocation.revoke_user(7)
+        assert await revocation.is_revoked(old)
+        assert not await revocation.is_revoked(other_user)
+        assert not await revocation.is_revoked(decode_access_token(create_access_token(7)))
+
+    @pytest.mark.asyncio
+    async def test_other_workers_pick_up_revocations(self):
+        worker_a = TokenRevocationList(sync_interval=0, max_token_age=3600)
+        worker_b = TokenRevocationList(sync_interval=0, max_token_age=3600)
+        claims = decode_access_token(create_access_token(7))
+        assert not await worker_b.is_revoked(claims)
+        await worker_a.revoke(claims)
+        assert await worker_b.is_revoked(claims)
+
+    @pytest.mark.asyncio
+    async def test_sync_is_rate_limited(self):
+        worker_a = TokenRevocationList(sync_interval=0, max_token_age=3600)
+        worker_b = TokenRevocationList(sync_interval=60, max_token_age=3600)
+        claims = decode_access_token(create_access_token(7))
+        assert not await worker_b.is_revoked(claims)
+        await worker_a.revoke(claims)
+        assert not await worker_b.is_revoked(claims)  # not synced yet